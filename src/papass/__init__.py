@@ -9,8 +9,9 @@ Usage
 Passphrase generation
 ---------------------
 
-First we create two word lists:
+First we import everything and create two word lists:
 
+>>> from papass import *
 >>> wordlist_1 = WordList(["bear", "dog", "duck"])
 >>> wordlist_2 = WordList(["duck", "cat"])
 
@@ -50,9 +51,22 @@ Consider for example the wordlist ``foo bar foobar barfoo`` with ``num_words=5``
 ``foobarfoo`` can come from ``foobar, foo`` or from ``foo, barfoo``.
 
 If ``entropy_is_guaranteed=False`` this doesn't necessarily mean that the entropy is lower
-(and even `if`, it is probably not much lower). The check relies on a simple heuristic
-which has the property that ``True`` is always correct and ``False`` basically means
-`don't know`.
+(and even `if`, it is probably not much lower). The check only proves that *some*
+passphrases (maybe longer ones) are ambiguous. Hence ``True`` is always correct and
+``False`` basically means `don't know`. Pass ``exact_entropy=True`` to the generator to
+count the possible phrases exactly in that case. Here two of the 16 word sequences give the
+same passphrase, hence the entropy is lower (and still not guaranteed, since ``foobarfoo``
+is more likely than the other passphrases):
+
+>>> ppg = PassphraseGenerator(
+...     wordlist=WordList(["foo", "bar", "foobar", "barfoo"]),
+...     rng=rng,
+...     delimiter="",
+...     exact_entropy=True,
+... )
+>>> result = ppg.generate(2)
+>>> round(result.entropy, 3), result.entropy_is_guaranteed
+(3.807, False)
 
 Password generation
 -------------------
@@ -70,18 +84,73 @@ PasswordResult(password=..., entropy=20.0)
 The actual ``password`` is random of course. It could be any sequence of characters from
 the ``alphabet`` like e.g ``'3002212230'``. The ``entropy`` is ``20.0`` because there are
 ``2**20.0`` possible passwords of length 10 over this alphabet.
+
+Asynchronous generation
+-----------------------
+
+Within ``asyncio`` code use ``AsyncPassphraseGenerator`` and ``AsyncPasswordGenerator``.
+They take an ``AsyncRngBase``. Wrap an ordinary rng into an ``AsyncRngWrapper`` so that it
+does not block the event loop:
+
+>>> import asyncio
+>>> apwg = AsyncPasswordGenerator(alphabet="0123", rng=AsyncRngWrapper(SystemRng()))
+>>> asyncio.run(apwg.generate(10))
+PasswordResult(password=..., entropy=20.0)
+
+Their ``generate_many`` returns an async iterator. The results are generated in batches
+(on demand) and decoded in an executor.
 """
 
-from .passphrase_generator import PassphraseGenerator, PassphraseResult
-from .password_generator import PasswordGenerator, PasswordResult
-from .random_source import DiceRng, QueryForDice, RngBase, SystemRng
-from .utils import QueryUserForDice
-from .wordlist import WordList
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .async_generators import AsyncPassphraseGenerator, AsyncPasswordGenerator
+    from .parallel import ParallelPassphraseGenerator, ParallelPasswordGenerator
+    from .passphrase_generator import PassphraseGenerator, PassphraseResult
+    from .password_generator import PasswordGenerator, PasswordResult
+    from .random_source import BufferedSystemRng, DiceRng, QueryForDice, RngBase, SystemRng
+    from .random_source.async_rng import AsyncRngBase, AsyncRngWrapper
+    from .utils import FileDiceSource, QueryUserForDice
+    from .wordlist import WordList
+    from .wordlist_cache import WordListCache
 
 __version__ = "0.1.0"
 
+# The public names are imported lazily on first access (PEP 562). This keeps ``import
+# papass`` (and hence the startup of the command line tool) fast.
+_lazy_imports = {
+    "AsyncPassphraseGenerator": ".async_generators",
+    "AsyncPasswordGenerator": ".async_generators",
+    "AsyncRngBase": ".random_source.async_rng",
+    "AsyncRngWrapper": ".random_source.async_rng",
+    "BufferedSystemRng": ".random_source",
+    "DiceRng": ".random_source",
+    "FileDiceSource": ".utils",
+    "ParallelPassphraseGenerator": ".parallel",
+    "ParallelPasswordGenerator": ".parallel",
+    "PassphraseGenerator": ".passphrase_generator",
+    "PassphraseResult": ".passphrase_generator",
+    "PasswordGenerator": ".password_generator",
+    "PasswordResult": ".password_generator",
+    "QueryForDice": ".random_source",
+    "QueryUserForDice": ".utils",
+    "RngBase": ".random_source",
+    "SystemRng": ".random_source",
+    "WordList": ".wordlist",
+    "WordListCache": ".wordlist_cache",
+}
+
 __all__ = [
+    "AsyncPassphraseGenerator",
+    "AsyncPasswordGenerator",
+    "AsyncRngBase",
+    "AsyncRngWrapper",
+    "BufferedSystemRng",
     "DiceRng",
+    "FileDiceSource",
+    "ParallelPassphraseGenerator",
+    "ParallelPasswordGenerator",
     "PassphraseGenerator",
     "PassphraseResult",
     "PasswordGenerator",
@@ -91,4 +160,18 @@ __all__ = [
     "RngBase",
     "SystemRng",
     "WordList",
+    "WordListCache",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _lazy_imports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_lazy_imports[name], __name__), name)
+    globals()[name] = value  # Subsequent accesses do not end up here.
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
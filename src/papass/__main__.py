@@ -1,6 +1,6 @@
 import click
 
-from papass.commands import pp, pw
+from papass.commands import pp, pw, serve, wordlist_group
 
 
 @click.group()
@@ -12,6 +12,8 @@ def cli() -> None:
 
 cli.add_command(pp, "pp")
 cli.add_command(pw, "pw")
+cli.add_command(serve, "serve")
+cli.add_command(wordlist_group, "wordlist")
 
 if __name__ == "__main__":
     cli()
@@ -65,6 +65,34 @@ def alphabet_from_preset(preset: Iterable[str]) -> str:
     return "".join(sorted(set(raw_result)))
 
 
+def alphabet_from_options(
+    *, include: str | None = None, preset: str | None = None, exclude: str | None = None
+) -> str:
+    """Create an alphabet from the ``--alpha-*`` options of ``papass pw``.
+
+    :param include: Characters to include.
+    :param preset: Comma separated preset names (see ``alphabet_from_preset``).
+    :param exclude: Characters to exclude (from both of the above).
+    :return: The alphabet. It is never empty.
+
+    Example:
+    -------
+    >>> alphabet_from_options(include="#@", preset="digits", exclude="13579")
+    '#@02468'
+
+    """
+    alpha = include or ""
+
+    if preset:
+        alpha += alphabet_from_preset(preset.split(","))
+
+    if exclude:
+        alpha = "".join(c for c in alpha if c not in exclude)
+
+    assert alpha, "No alphabet given. Did you forget --alphabet or alphabet-names?"
+    return alpha
+
+
 def _preset_base_join() -> str:
     return ",".join(_preset_base)
 
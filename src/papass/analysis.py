@@ -0,0 +1,300 @@
+"""Exact analysis of the passphrases a word list can produce.
+
+If the delimiter is empty (or occurs within words) different word sequences can result in
+the same passphrase. Consider the words ``foo``, ``bar``, ``foobar`` and ``barfoo`` with an
+empty delimiter: ``foobarfoo`` is either ``foobar, foo`` or ``foo, barfoo``. The functions
+here decide whether this can happen at all (``is_uniquely_decodable``) and determine
+exactly how many *distinct* passphrases there are (``count_passphrases``).
+
+We count the strings of the regular language ``(W + d)^length`` where ``W`` are the words
+and ``d`` is the delimiter (appending ``d`` to every passphrase is a bijection). This is
+done via a deterministic automaton obtained by subset construction from an (implicit) trie
+of the words. Its states are sets of trie positions (one per possible segmentation) and
+the number of accepted strings is computed by dynamic programming over the states.
+
+Most states never have to be constructed: If a trie node has no word below it which is a
+proper prefix of another word, the remaining part of the current word is uniquely
+determined by the passphrase. Hence the strings starting at such a node can be counted in
+closed form.
+
+Still, the automaton can get huge for large word lists with many words being prefixes of
+other words. Pass ``max_states`` to ``count_passphrases`` to give up early in that case.
+"""
+
+import bisect
+import itertools
+import sys
+from collections.abc import Iterable, Sequence
+
+from .wordlist import WordList
+
+# A position in the (implicit) trie of the sorted words together with the number of words
+# which are not finished yet (including the current one). The trie node is the range
+# ``words[lo:hi]`` of all words sharing the prefix of length ``depth``.
+_Element = tuple[int, int, int, int]  # (lo, hi, depth, remaining)
+
+# A state of the deterministic automaton: The set of elements (one per possible
+# segmentation of the string read so far) and whether the string read so far is accepted.
+_State = tuple[frozenset[_Element], bool]
+
+MAX_STATES = 100_000
+"""Default budget of automaton states for counting passphrases (a few seconds)."""
+
+
+def count_passphrases(
+    wordlist: WordList, length: int, delimiter: str = "", *, max_states: int | None = None
+) -> int | None:
+    """Return the number of distinct passphrases of ``length`` words.
+
+    This is ``len(wordlist) ** length`` iff each passphrase can be split into words in
+    only one way.
+
+    :param wordlist: The words.
+    :param length: The number of words in each passphrase.
+    :param delimiter: The string put between the words.
+    :param max_states: Give up (and return ``None``) if counting needs more states of the
+        automaton (see module docstring). ``None`` means no limit.
+
+    Example
+    -------
+    >>> wordlist = WordList(["foo", "bar", "foobar", "barfoo"])
+    >>> len(wordlist) ** 2, count_passphrases(wordlist, 2)
+    (16, 14)
+    >>> count_passphrases(wordlist, 2, delimiter="-")
+    16
+    >>> count_passphrases(wordlist, 2, max_states=1) is None
+    True
+
+    """
+    assert length >= 0, "length must not be negative."
+
+    if length == 0:
+        return 1
+    elif len(wordlist) == 0:
+        return 0
+    elif wordlist.is_uniquely_decodable(delimiter):
+        num_passphrases: int = len(wordlist) ** length
+        return num_passphrases
+
+    counter = _PassphraseCounter(sorted(w + delimiter for w in wordlist), max_states)
+    try:
+        return counter.count(length)
+    except _TooManyStates:
+        return None
+
+
+def is_uniquely_decodable(words: Iterable[str], delimiter: str = "") -> bool:
+    """Return ``True`` iff no two different word sequences result in the same passphrase.
+
+    This holds for passphrases of all lengths, i.e. a word sequence can be recovered from
+    its passphrase. Uses the Sardinas-Patterson algorithm.
+
+    :param words: The words.
+    :param delimiter: The string put between the words.
+
+    Example
+    -------
+    >>> is_uniquely_decodable(["foo", "bar", "foobar", "barfoo"])
+    False
+    >>> is_uniquely_decodable(["foo", "bar", "foobaz"])
+    True
+
+    """
+    # Appending the delimiter to every passphrase is a bijection (see module docstring).
+    codewords = sorted({w + delimiter for w in words})
+    if "" in codewords:
+        return False
+
+    codeword_set = set(codewords)
+
+    def dangling_suffixes(text: str) -> Iterable[str]:
+        """Return the rests of ``text`` after a codeword and of codewords after ``text``."""
+        for i in range(1, len(text)):
+            if text[:i] in codeword_set:
+                yield text[i:]
+
+        for i in range(bisect.bisect_right(codewords, text), len(codewords)):
+            if not codewords[i].startswith(text):
+                break
+            yield codewords[i][len(text) :]
+
+    # Start with the dangling suffixes of codewords which are prefixes of other codewords. In
+    # sorted order a codeword is a prefix of another one iff it is a prefix of the next one.
+    pending = [
+        suffix
+        for a, b in itertools.pairwise(codewords)
+        if b.startswith(a)
+        for suffix in dangling_suffixes(a)
+    ]
+    seen = set(pending)
+
+    # There are only finitely many dangling suffixes (all are suffixes of codewords). The
+    # code is ambiguous iff one of them is a codeword.
+    while pending:
+        suffix = pending.pop()
+        if suffix in codeword_set:
+            return False
+
+        for dangling in dangling_suffixes(suffix):
+            if dangling not in seen:
+                seen.add(dangling)
+                pending.append(dangling)
+
+    return True
+
+
+class _TooManyStates(Exception):
+    """Raised by ``_PassphraseCounter`` if it exceeds its budget of states."""
+
+
+class _PassphraseCounter:
+    """Counts the strings of ``words^length`` for sorted, unique and non-empty words."""
+
+    def __init__(self, words: Sequence[str], max_states: int | None = None):
+        self._words = words
+        self._max_states = max_states
+
+        # In sorted order a word is a prefix of another word iff it is a prefix of the
+        # next word. Count those words cumulatively to check ranges in constant time.
+        is_prefix = (a != b and b.startswith(a) for a, b in itertools.pairwise(words))
+        self._num_prefixes = [0, *itertools.accumulate(is_prefix)]
+
+        self._counts: dict[_State, int] = {}
+        self._children: dict[tuple[int, int], dict[str, tuple[int, int]]] = {}
+
+    def count(self, length: int) -> int:
+        return self._count(self._closure([self._root(length)]))
+
+    def _count(self, start: _State) -> int:
+        """Return the number of strings accepted from ``start`` on."""
+        # Depth first search without recursion (the automaton is acyclic, since the
+        # language is finite).
+        stack: list[tuple[_State, list[tuple[_State, int]] | None]] = [(start, None)]
+
+        while stack:
+            state, terms = stack.pop()
+            if state in self._counts:
+                continue
+
+            elements, accepting = state
+            shortcut = self._count_shortcut(elements)
+            if shortcut is not None:
+                self._counts[state] = int(accepting) + shortcut
+                continue
+
+            if terms is None:
+                if self._max_states is not None and len(self._counts) >= self._max_states:
+                    raise _TooManyStates
+                terms = self._terms(elements)
+                stack.append((state, terms))
+                stack.extend((s, None) for s, _ in terms if s not in self._counts)
+            else:
+                counts = self._counts
+                self._counts[state] = int(accepting) + sum(sign * counts[s] for s, sign in terms)
+
+        return self._counts[start]
+
+    def _count_shortcut(self, elements: frozenset[_Element]) -> int | None:
+        """Count the strings of a single clean element in closed form (``None`` otherwise).
+
+        An element is *clean* if no word below its node is a proper prefix of another word.
+        Then the completions of the current word are a prefix-free set. Hence each of them
+        can be followed by any string from the root (with one word less) and all these
+        concatenations are distinct.
+        """
+        if len(elements) != 1:
+            return None
+
+        ((lo, hi, _, remaining),) = elements
+        if self._num_prefixes[hi - 1] - self._num_prefixes[lo] > 0:
+            return None
+
+        if remaining == 1:
+            return hi - lo
+        return (hi - lo) * self._count(self._closure([self._root(remaining - 1)]))
+
+    def _terms(self, elements: frozenset[_Element]) -> list[tuple[_State, int]]:
+        """Return states with signs whose signed counts sum up to the count of ``elements``.
+
+        Only non-empty strings are counted (i.e. without the accepting flag).
+
+        For a single element these are its successors. For several elements the count is
+        the sum of the counts of the single elements, corrected by the successors of the
+        characters which continue more than one element. Typically there are only few such
+        characters, hence this is much cheaper than constructing all successors.
+        """
+        if len(elements) == 1:
+            ((lo, hi, depth, remaining),) = elements
+            return [
+                (self._closure([(child_lo, child_hi, depth + 1, remaining)]), 1)
+                for child_lo, child_hi in self._node_children(lo, hi, depth).values()
+            ]
+
+        terms: list[tuple[_State, int]] = [((frozenset([e]), False), 1) for e in elements]
+
+        # A character continuing several elements is a character of one of the elements
+        # except the one with the most children.
+        children = sorted(
+            ((e, self._node_children(*e[:3])) for e in elements), key=lambda ec: len(ec[1])
+        )
+        shared_chars = {
+            char
+            for i, (_, chars) in enumerate(children[:-1])
+            for char in chars
+            if any(char in other for _, other in children[i + 1 :])
+        }
+
+        for char in shared_chars:
+            continued = [
+                (*chars[char], depth + 1, remaining)
+                for (_, _, depth, remaining), chars in children
+                if char in chars
+            ]
+            terms.extend((self._closure([child]), -1) for child in continued)
+            terms.append((self._closure(continued), 1))
+
+        return terms
+
+    def _node_children(self, lo: int, hi: int, depth: int) -> dict[str, tuple[int, int]]:
+        """Return the ranges of the children of a trie node (by their character)."""
+        key = (lo, depth)
+        if key in self._children:
+            return self._children[key]
+
+        words = self._words
+        if len(words[lo]) == depth:
+            lo += 1  # The word ending here has no children.
+
+        children = {}
+        while lo < hi:
+            char = words[lo][depth]
+            if ord(char) == sys.maxunicode:
+                end = hi
+            else:
+                end = bisect.bisect_left(words, words[lo][:depth] + chr(ord(char) + 1), lo, hi)
+            children[char] = (lo, end)
+            lo = end
+
+        self._children[key] = children
+        return children
+
+    def _closure(self, elements: list[_Element]) -> _State:
+        """Start the next word where a word ends. Drop elements without children."""
+        accepting = False
+        closure = set()
+
+        for element in elements:
+            lo, hi, depth, remaining = element
+            if len(self._words[lo]) == depth:
+                if remaining == 1:
+                    accepting = True
+                else:
+                    closure.add(self._root(remaining - 1))
+                if hi - lo == 1:
+                    continue
+            closure.add(element)
+
+        return frozenset(closure), accepting
+
+    def _root(self, remaining: int) -> _Element:
+        return (0, len(self._words), 0, remaining)
@@ -0,0 +1,158 @@
+"""Asynchronous counterparts of ``PassphraseGenerator`` and ``PasswordGenerator``.
+
+They never block the event loop: The randomness is awaited from an ``AsyncRngBase`` (use
+``AsyncRngWrapper`` for the usual rngs) and the decoding of the random integers into
+passphrases (or passwords) runs in an executor. Preparing the decoding (which might count
+the passphrases, see ``exact_entropy``) runs in a worker thread.
+
+Passphrases are decoded in a thread pool only. The decoder holds the whole word list, which
+would be sent to a process pool again for every batch (and a memory-mapped binary word list
+cannot be sent at all). Use ``ParallelPassphraseGenerator`` to decode in several processes.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Callable, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import TypeVar
+
+from .passphrase_generator import BATCH_SIZE, PassphraseResult, _PassphraseGeneratorBase
+from .password_generator import PasswordResult, _PasswordGeneratorBase
+from .random_source.async_rng import AsyncRngBase
+from .wordlist import WordList
+
+R = TypeVar("R")
+
+
+class AsyncPassphraseGenerator(_PassphraseGeneratorBase):
+    """Like ``PassphraseGenerator`` but ``async``.
+
+    Example
+    -------
+    >>> from papass import AsyncRngWrapper, SystemRng
+    >>> ppg = AsyncPassphraseGenerator(
+    ...     wordlist=WordList(["foo", "bar"]), rng=AsyncRngWrapper(SystemRng())
+    ... )
+    >>> asyncio.run(ppg.generate(3))
+    PassphraseResult(passphrase=..., entropy=3.0, entropy_is_guaranteed=True)
+
+    """
+
+    def __init__(
+        self,
+        *,
+        wordlist: WordList,
+        rng: AsyncRngBase,
+        delimiter: str = " ",
+        exact_entropy: bool = False,
+        executor: Executor | None = None,
+    ):
+        """Create an asynchronous passphrase generator.
+
+        :param wordlist: The words to draw from.
+        :param rng: The randomness source to be used to draw words.
+        :param delimiter: At most a single character to be put between the generated words.
+        :param exact_entropy: Count the distinct passphrases exactly if necessary (see
+            ``PassphraseGenerator``).
+        :param executor: A thread pool to decode the passphrases in (see module
+            docstring). ``None`` means the default executor of the event loop.
+        """
+        assert not isinstance(
+            executor, ProcessPoolExecutor
+        ), "Passphrases cannot be decoded in a process pool. Use a thread pool."
+
+        super().__init__(wordlist=wordlist, delimiter=delimiter, exact_entropy=exact_entropy)
+        self._rng = rng
+        self._executor = executor
+
+    async def generate(self, length: int) -> PassphraseResult:
+        """Generate a random passphrase (see ``PassphraseGenerator.generate``)."""
+        async for result in self.generate_many(length, 1):
+            return result
+        raise AssertionError("Unreachable")
+
+    def generate_many(
+        self, length: int, count: int, *, batch_size: int = BATCH_SIZE
+    ) -> AsyncIterator[PassphraseResult]:
+        """Generate ``count`` random passphrases (see ``PassphraseGenerator.generate_many``).
+
+        The passphrases are generated in batches. The next batch is only generated when the
+        consumer has taken all results of the previous one (backpressure).
+
+        :param length: The number of words in each passphrase.
+        :param count: The number of passphrases to generate.
+        :param batch_size: Number of passphrases decoded at once in the executor.
+        :return: An async iterator over result objects containing the passphrases.
+        """
+        assert count >= 0, "--count must not be negative."
+        assert batch_size > 0, "batch_size must be positive."
+
+        return _generate_many(self._rng, self._executor, self._decoder, length, count, batch_size)
+
+
+class AsyncPasswordGenerator(_PasswordGeneratorBase):
+    """Like ``PasswordGenerator`` but ``async``."""
+
+    def __init__(
+        self,
+        *,
+        alphabet: Sequence[str],
+        rng: AsyncRngBase,
+        executor: Executor | None = None,
+    ):
+        """Create an asynchronous password generator.
+
+        :param alphabet: A sequence of characters to be used in password creation.
+        :param rng: The randomness source to be used to draw characters.
+        :param executor: Where to decode the passwords. A thread or a process pool. ``None``
+            means the default executor of the event loop.
+        """
+        super().__init__(alphabet=alphabet)
+        self._rng = rng
+        self._executor = executor
+
+    async def generate(self, length: int) -> PasswordResult:
+        """Generate a random password (see ``PasswordGenerator.generate``)."""
+        async for result in self.generate_many(length, 1):
+            return result
+        raise AssertionError("Unreachable")
+
+    def generate_many(
+        self, length: int, count: int, *, batch_size: int = BATCH_SIZE
+    ) -> AsyncIterator[PasswordResult]:
+        """Generate ``count`` random passwords (see ``AsyncPassphraseGenerator.generate_many``).
+
+        :param length: The length of each password.
+        :param count: The number of passwords to generate.
+        :param batch_size: Number of passwords decoded at once in the executor.
+        :return: An async iterator over result objects containing the passwords.
+        """
+        assert count >= 0, "--count must not be negative."
+        assert batch_size > 0, "batch_size must be positive."
+
+        return _generate_many(self._rng, self._executor, self._decoder, length, count, batch_size)
+
+
+async def _generate_many(
+    rng: AsyncRngBase,
+    executor: Executor | None,
+    decoder: Callable[[int], tuple[int, Callable[[list[int]], list[R]]]],
+    length: int,
+    count: int,
+    batch_size: int,
+) -> AsyncIterator[R]:
+    loop = asyncio.get_running_loop()
+
+    # Not in ``executor``, it might be a process pool (the generator cannot be sent there).
+    size, decode = await asyncio.to_thread(decoder, length)
+
+    batch: list[int] = []
+    async for index in rng.randbelow_many(size, count):
+        batch.append(index)
+        if len(batch) == batch_size:
+            for result in await loop.run_in_executor(executor, decode, batch):
+                yield result
+            batch = []
+
+    if batch:
+        for result in await loop.run_in_executor(executor, decode, batch):
+            yield result
@@ -0,0 +1,156 @@
+"""A compact binary file format for word lists which can be memory-mapped.
+
+Layout of a file (all integers are little-endian)::
+
+    HEADER   magic (4 bytes), version (u32), count (u64), min_word_size (u32),
+             max_word_size (u32), charset_size (u64), uniquely_decodable (u32)
+    OFFSETS  count + 1 times u64, the byte offsets of the words relative to BLOB
+    BLOB     the UTF-8 encoded words, concatenated
+    CHARSET  all characters occurring in the words (sorted, UTF-8 encoded, charset_size
+             bytes)
+
+The words are sorted and unique (exactly as in a ``WordList``). Hence a word list can be
+opened without parsing, sorting or deduplicating anything. The CHARSET makes it possible to
+check whether a character occurs in any word without scanning all words. The flag
+``uniquely_decodable`` tells whether passphrases without delimiter can be split into words
+uniquely (0: unknown, 1: no, 2: yes), which is expensive to compute for large word lists.
+
+Files of version 1 (without charset) and 2 (without flag) can still be read.
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Any, overload
+
+MAGIC = b"PPWL"
+VERSION = 3
+
+_HEADER = struct.Struct("<4sIQIIQI")
+_HEADER_V2 = struct.Struct("<4sIQIIQ")
+_HEADER_V1 = struct.Struct("<4sIQII")
+_HEADERS = {1: _HEADER_V1, 2: _HEADER_V2, VERSION: _HEADER}
+_UNKNOWN, _NOT_UNIQUELY_DECODABLE, _UNIQUELY_DECODABLE = range(3)
+_OFFSET = struct.Struct("<Q")
+
+
+def is_binary_wordlist_file(file_path: Path | str) -> bool:
+    """Return ``True`` if the file starts like a binary word list."""
+    with open(file_path, "rb") as fin:
+        return fin.read(len(MAGIC)) == MAGIC
+
+
+def write_binary_wordlist(
+    words: Sequence[str],
+    file_path: Path | str,
+    *,
+    characters: Iterable[str] | None = None,
+    uniquely_decodable: bool | None = None,
+) -> None:
+    """Write words to a binary word list file (overwrites if the file exists).
+
+    :param words: Sorted and unique words (e.g. a ``WordList``).
+    :param characters: All characters occurring in the words. ``None`` means *compute
+        them*.
+    :param uniquely_decodable: Whether the words are uniquely decodable without delimiter
+        (see ``WordList.is_uniquely_decodable``). ``None`` means *unknown*.
+    """
+    if characters is None:
+        characters = set().union(*words)
+    charset = "".join(sorted(characters)).encode()
+
+    encoded = [w.encode() for w in words]
+
+    offsets = array("Q", [0])
+    for word in encoded:
+        offsets.append(offsets[-1] + len(word))
+    if sys.byteorder != "little":
+        offsets.byteswap()
+
+    sizes = [len(w) for w in words]
+    flag = {None: _UNKNOWN, False: _NOT_UNIQUELY_DECODABLE, True: _UNIQUELY_DECODABLE}
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        len(words),
+        min(sizes, default=0),
+        max(sizes, default=0),
+        len(charset),
+        flag[uniquely_decodable],
+    )
+
+    with open(file_path, "wb") as fout:
+        fout.write(header)
+        fout.write(offsets.tobytes())
+        fout.writelines(encoded)
+        fout.write(charset)
+
+
+class MappedWords(Sequence[str]):
+    """A read-only sequence of words backed by a memory-mapped binary word list file.
+
+    Nothing but the header is read when opening the file. Words are decoded on access.
+    """
+
+    def __init__(self, file_path: Path | str):
+        """Open a binary word list file."""
+        with open(file_path, "rb") as fin:
+            self._mmap = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+
+        assert len(self._mmap) >= _HEADER_V1.size, f"Not a binary wordlist: {file_path}"
+        magic, version, count, min_word_size, max_word_size = _HEADER_V1.unpack_from(self._mmap)
+        assert magic == MAGIC, f"Not a binary wordlist: {file_path}"
+        assert version in _HEADERS, f"Unsupported binary wordlist version {version}: {file_path}"
+
+        header = _HEADERS[version].unpack_from(self._mmap)
+        self._count: int = count
+        self._offsets_start = _HEADERS[version].size
+        self._blob_start = self._offsets_start + (count + 1) * _OFFSET.size
+
+        self.min_word_size: int = min_word_size
+        """Length of the shortest word (0 if there are no words)."""
+
+        self.max_word_size: int = max_word_size
+        """Length of the longest word (0 if there are no words)."""
+
+        self.characters: frozenset[str] | None = None
+        """All characters occurring in the words (``None`` for files of version 1)."""
+
+        self.uniquely_decodable: bool | None = None
+        """Whether the words are uniquely decodable without delimiter (``None``: unknown)."""
+
+        if version >= 3 and header[6] != _UNKNOWN:
+            self.uniquely_decodable = header[6] == _UNIQUELY_DECODABLE
+
+        if version >= 2:
+            charset_size = header[5]
+            (blob_size,) = _OFFSET.unpack_from(self._mmap, self._blob_start - _OFFSET.size)
+            charset_start = self._blob_start + blob_size
+            charset = self._mmap[charset_start : charset_start + charset_size]
+            self.characters = frozenset(charset.decode())
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+    @overload
+    def __getitem__(self, index: slice) -> list[str]: ...
+
+    def __getitem__(self, index: Any) -> Any:
+        """Get a word at an index or a list of words from a slice."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Index out of range")
+
+        position = self._offsets_start + index * _OFFSET.size
+        start, end = struct.unpack_from("<QQ", self._mmap, position)
+        return self._mmap[self._blob_start + start : self._blob_start + end].decode()
+
+    def __len__(self) -> int:
+        """Return the number of words."""
+        return self._count
@@ -1,26 +1,51 @@
+import math
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import click
 
-from papass import (
-    PassphraseGenerator,
-    PasswordGenerator,
-    WordList,
-)
 from papass.alphabet import (
-    alphabet_from_preset,
+    alphabet_from_options,
     alphabet_preset_base,
     alphabet_preset_shortcuts,
 )
-from papass.random_source import (
+from papass.random_source.registry import (
     available_randomness_sources_str,
     default_randomness_source,
-    get_rng,
 )
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from typing import TextIO
+
+    from papass import FileDiceSource, PassphraseResult, PasswordResult
+
+# NOTE: Most of the library is imported within the commands. This keeps the startup of the
+# command line tool fast (e.g. for --help).
+
 RESULT_BG_COLOR = (0, 44, 77)
 
 
+class RandomnessSourceOption(click.Option):
+    """The --randomness-source option.
+
+    Default and help text are determined lazily (only if needed), since this requires to
+    look into the registry of random sources.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        """Create the option (the default is set automatically)."""
+        super().__init__(*args, default=default_randomness_source, **kwargs)
+
+    def get_help_record(self, ctx: click.Context) -> tuple[str, str] | None:
+        """Return the help record (including the available random sources)."""
+        self.help = (
+            f"Source of randomness (default: '{default_randomness_source()}',"
+            f" available: {available_randomness_sources_str()})."
+        )
+        return super().get_help_record(ctx)
+
+
 @click.command()
 @click.help_option("--help", "-h")
 @click.option(
@@ -31,11 +56,40 @@ RESULT_BG_COLOR = (0, 44, 77)
     help="Number of words to generate.",
 )
 @click.option(
-    "--randomness-source",
-    "-r",
-    default=f"{default_randomness_source()}",
-    help=f"Source of randomness (default: '{default_randomness_source()}',"
-    f" available: {available_randomness_sources_str()}).",
+    "--count",
+    "-c",
+    type=int,
+    default=1,
+    help="Number of passphrases to generate (default: 1). If greater than 1 the passphrases"
+    " are printed one per line.",
+)
+@click.option(
+    "--workers",
+    type=int,
+    default=1,
+    help="Number of processes generating the passphrases (default: 1). Only used together with"
+    " --count.",
+)
+@click.option(
+    "--format",
+    "-f",
+    "output_format",
+    help="Output format of many passphrases: 'plain' (one per line, default), 'jsonl', 'csv'"
+    " (both including the entropy) or 'nul' (NUL-terminated).",
+)
+@click.option(
+    "--output",
+    "-o",
+    "output_file",
+    help="Write the passphrases to this file instead of stdout.",
+)
+@click.option("--randomness-source", "-r", cls=RandomnessSourceOption)
+@click.option(
+    "--rng-option",
+    "rng_option",
+    multiple=True,
+    metavar="KEY=VALUE",
+    help="An option for a random source plugin (can be repeated).",
 )
 @click.option(
     "--wordlist-file",
@@ -49,6 +103,12 @@ RESULT_BG_COLOR = (0, 44, 77)
     default=" ",
     help="Separator between the words (default: ' ').",
 )
+@click.option(
+    "--exact-entropy",
+    is_flag=True,
+    help="Count the distinct passphrases exactly if the delimiter does not separate the words"
+    " unambiguously (gives up after a few seconds for large wordlists).",
+)
 @click.option(
     "--min-word-size",
     "--minw",
@@ -69,21 +129,54 @@ RESULT_BG_COLOR = (0, 44, 77)
     default=6,
     help="Number of sides of dice (default: 6).",
 )
+@click.option(
+    "--recycle-entropy",
+    is_flag=True,
+    help="Keep the randomness of rejected and surplus dice rolls for later (only for -r dice)."
+    " Requires fewer rolls.",
+)
+@click.option(
+    "--dice-bag",
+    help="Comma-separated numbers of sides of the dice at hand, like 6,8,10,12,20 (only for"
+    " -r dice). The dice to roll are chosen to minimize the number of rolls. Overrides"
+    " --dice-sides.",
+)
+@click.option(
+    "--dice-file",
+    type=click.File("r"),
+    help="Read the dice rolls from this file instead of asking for them (only for -r dice)."
+    " Use - for stdin.",
+)
 @click.option(
     "--remove-leading-digits",
     "--rld",
     is_flag=True,
     help="If wordlist contains entries like `123 foo` normalizes it to `foo`.",
 )
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Do not use the cache of processed wordlists (in $XDG_CACHE_HOME/papass).",
+)
 def pp(
     length: int,
+    count: int,
+    workers: int,
+    output_format: str | None,
+    output_file: str | None,
     randomness_source: str,
+    rng_option: tuple[str, ...],
     wordlist_file: str,
     delimiter: str,
+    exact_entropy: bool,
     min_word_size: int,
     max_word_size: int,
     dice_sides: int,
+    recycle_entropy: bool,
+    dice_bag: str | None,
+    dice_file: "TextIO | None",
     remove_leading_digits: bool,
+    no_cache: bool,
 ) -> None:
     """Create a passphrase.
 
@@ -93,19 +186,67 @@ def pp(
     $ papass pp -l 4 -w wordlist.txt
     Passphrase: gents backed marvelous mounting
     Entropy: 51.6993
+
+    Use --count to generate many passphrases at once (one per line), --format and
+    --output to control how they are written, and --workers to spread the work over
+    several processes.
     """  # noqa: D301
+    from papass import (
+        ParallelPassphraseGenerator,
+        PassphraseGenerator,
+        WordList,
+        WordListCache,
+    )
+    from papass.random_source import get_rng
+
     try:
-        rng = get_rng(randomness_source, dice_sides=dice_sides)
+        assert workers > 0, "--workers must be positive."
+        dice_source = _dice_file_source(dice_file, randomness_source)
+        rng = get_rng(
+            randomness_source,
+            dice_sides=dice_sides,
+            recycle_entropy=recycle_entropy,
+            dice_bag=_parse_dice_bag(dice_bag),
+            query_for_dice=dice_source,
+            rng_options=_parse_rng_options(rng_option),
+        )
 
-        wordlist = WordList.from_file(
+        load_wordlist = WordList.from_file if no_cache else WordListCache().from_file
+        wordlist = load_wordlist(
             Path(wordlist_file),
             min_word_size=min_word_size,
             max_word_size=max_word_size,
             remove_leading_digits=remove_leading_digits,
         )
 
-        passphrase_generator = PassphraseGenerator(wordlist=wordlist, rng=rng, delimiter=delimiter)
+        passphrase_generator = PassphraseGenerator(
+            wordlist=wordlist, rng=rng, delimiter=delimiter, exact_entropy=exact_entropy
+        )
+
+        if count != 1 or output_format is not None or output_file is not None:
+            many_generator = (
+                ParallelPassphraseGenerator(
+                    wordlist=wordlist,
+                    workers=workers,
+                    random_source=randomness_source,
+                    delimiter=delimiter,
+                    exact_entropy=exact_entropy,
+                    dice_sides=dice_sides,
+                    rng_options=_parse_rng_options(rng_option),
+                )
+                if workers > 1
+                else passphrase_generator
+            )
+            _write_many(
+                many_generator.generate_many(length, count),
+                output_format=output_format,
+                output_file=output_file,
+            )
+            _check_dice_file_consumed(dice_file, dice_source)
+            return
+
         result = passphrase_generator.generate(length)
+        _check_dice_file_consumed(dice_file, dice_source)
     except AssertionError as error:
         click.secho(f"ERROR: {error}", fg="red")
         click.echo("Try again!")
@@ -117,13 +258,106 @@ def pp(
     click.echo(f"Entropy: {result.entropy:.6}")
 
     if not result.entropy_is_guaranteed:
+        _echo_entropy_warning()
+
+
+def _dice_file_source(
+    dice_file: "TextIO | None", randomness_source: str
+) -> "FileDiceSource | None":
+    """Create the source of dice rolls for --dice-file."""
+    from papass import FileDiceSource
+
+    if dice_file is None:
+        return None
+
+    assert randomness_source == "dice", "--dice-file requires -r dice."
+    return FileDiceSource(dice_file)
+
+
+def _check_dice_file_consumed(
+    dice_file: "TextIO | None", dice_source: "FileDiceSource | None"
+) -> None:
+    """Warn if --dice-file contains more rolls than were needed.
+
+    Nothing is checked for a terminal (reading the rest would wait for the user).
+    """
+    if dice_file is None or dice_source is None or dice_file.isatty():
+        return
+
+    num_unused = dice_source.count_unused()
+    if num_unused:
         click.secho(
-            "WARNING: Entropy might be slightly lower than estimated. "
-            "See https://papass.readthedocs.io/en/stable/usage_cli.html#entropy-guarantee.",
-            fg="yellow",
+            f"WARNING: {num_unused} dice rolls of --dice-file were not used.", fg="yellow", err=True
         )
 
 
+def _parse_rng_options(rng_option: tuple[str, ...]) -> dict[str, str]:
+    """Parse the values of --rng-option (like ``device=/dev/hwrng``)."""
+    rng_options = {}
+    for option in rng_option:
+        key, sep, value = option.partition("=")
+        assert sep and key, f"--rng-option must look like KEY=VALUE, got `{option}`."
+        rng_options[key] = value
+    return rng_options
+
+
+def _parse_wordlists(wordlist: tuple[str, ...]) -> dict[str, str]:
+    """Parse the values of --wordlist of ``serve`` (like ``eff=wordlist.txt``)."""
+    wordlists = {}
+    for option in wordlist:
+        name, sep, path = option.partition("=")
+        assert sep and name and path, f"--wordlist must look like NAME=PATH, got `{option}`."
+        assert name not in wordlists, f"Wordlist `{name}` is given more than once."
+        wordlists[name] = path
+    return wordlists
+
+
+def _parse_dice_bag(dice_bag: str | None) -> list[int] | None:
+    """Parse the value of --dice-bag (like ``6,8,20``)."""
+    if dice_bag is None:
+        return None
+
+    sides = [s.strip() for s in dice_bag.split(",")]
+    assert all(
+        s.isdecimal() for s in sides
+    ), f"--dice-bag must be a comma-separated list of integers, got `{dice_bag}`."
+    return [int(s) for s in sides]
+
+
+def _write_many(
+    results: "Iterator[PassphraseResult] | Iterator[PasswordResult]",
+    *,
+    output_format: str | None,
+    output_file: str | None,
+) -> None:
+    """Write the results unstyled (see ``papass.output``) so that they can be piped.
+
+    The entropy (and possibly a warning) is printed once to stderr.
+    """
+    from papass import PassphraseResult
+    from papass.output import get_output_writer_class, open_output
+
+    # Check the format before the output file is truncated:
+    writer_class = get_output_writer_class(output_format or "plain")
+    with open_output(output_file) as stream:
+        result = writer_class(stream).write_all(results)
+
+    if result is not None:
+        click.echo(f"Entropy: {result.entropy:.6}", err=True)
+
+        if isinstance(result, PassphraseResult) and not result.entropy_is_guaranteed:
+            _echo_entropy_warning(err=True)
+
+
+def _echo_entropy_warning(err: bool = False) -> None:
+    click.secho(
+        "WARNING: Entropy might be slightly lower than estimated. "
+        "See https://papass.readthedocs.io/en/stable/usage_cli.html#entropy-guarantee.",
+        fg="yellow",
+        err=err,
+    )
+
+
 @click.command()
 @click.help_option("--help", "-h")
 @click.option(
@@ -133,11 +367,40 @@ def pp(
     help="Number of characters the password should contain.",
 )
 @click.option(
-    "--randomness-source",
-    "-r",
-    default=f"{default_randomness_source()}",
-    help=f"Source of randomness (default: '{default_randomness_source()}',"
-    f" available: {available_randomness_sources_str()}).",
+    "--count",
+    "-c",
+    type=int,
+    default=1,
+    help="Number of passwords to generate (default: 1). If greater than 1 the passwords are"
+    " printed one per line.",
+)
+@click.option(
+    "--workers",
+    type=int,
+    default=1,
+    help="Number of processes generating the passwords (default: 1). Only used together with"
+    " --count.",
+)
+@click.option(
+    "--format",
+    "-f",
+    "output_format",
+    help="Output format of many passwords: 'plain' (one per line, default), 'jsonl', 'csv'"
+    " (both including the entropy) or 'nul' (NUL-terminated).",
+)
+@click.option(
+    "--output",
+    "-o",
+    "output_file",
+    help="Write the passwords to this file instead of stdout.",
+)
+@click.option("--randomness-source", "-r", cls=RandomnessSourceOption)
+@click.option(
+    "--rng-option",
+    "rng_option",
+    multiple=True,
+    metavar="KEY=VALUE",
+    help="An option for a random source plugin (can be repeated).",
 )
 @click.option(
     "--dice-sides",
@@ -146,6 +409,24 @@ def pp(
     default=6,
     help="Number of sides of dice (default: 6).",
 )
+@click.option(
+    "--recycle-entropy",
+    is_flag=True,
+    help="Keep the randomness of rejected and surplus dice rolls for later (only for -r dice)."
+    " Requires fewer rolls.",
+)
+@click.option(
+    "--dice-bag",
+    help="Comma-separated numbers of sides of the dice at hand, like 6,8,10,12,20 (only for"
+    " -r dice). The dice to roll are chosen to minimize the number of rolls. Overrides"
+    " --dice-sides.",
+)
+@click.option(
+    "--dice-file",
+    type=click.File("r"),
+    help="Read the dice rolls from this file instead of asking for them (only for -r dice)."
+    " Use - for stdin.",
+)
 @click.option("--alpha-include", "-i", help="Include these characters for password generation.")
 @click.option(
     "--alpha-preset",
@@ -160,8 +441,16 @@ def pp(
 )
 def pw(
     length: int,
+    count: int,
+    workers: int,
+    output_format: str | None,
+    output_file: str | None,
     randomness_source: str,
+    rng_option: tuple[str, ...],
     dice_sides: int,
+    recycle_entropy: bool,
+    dice_bag: str | None,
+    dice_file: "TextIO | None",
     alpha_include: str,
     alpha_preset: str,
     alpha_exclude: str,
@@ -177,26 +466,58 @@ def pw(
     Entropy: 119.084
 
     NOTE: You can use all --alpha-* options simultaneously.
+
+    Use --count to generate many passwords at once (one per line), --format and --output
+    to control how they are written, and --workers to spread the work over several
+    processes.
     """  # noqa: D301
+    from papass import ParallelPasswordGenerator, PasswordGenerator
+    from papass.random_source import get_rng
+
     if help_alpha_preset:
         _print_alpha_preset()
         return
 
     try:
         assert length is not None, "Missing option --length."
-        alpha: str = alpha_include or ""
-
-        if alpha_preset:
-            alpha += alphabet_from_preset(alpha_preset.split(","))
+        assert workers > 0, "--workers must be positive."
+        alpha = alphabet_from_options(
+            include=alpha_include, preset=alpha_preset, exclude=alpha_exclude
+        )
 
-        if alpha_exclude:
-            alpha = "".join(c for c in alpha if c not in alpha_exclude)
+        dice_source = _dice_file_source(dice_file, randomness_source)
+        rng = get_rng(
+            randomness_source,
+            dice_sides=dice_sides,
+            recycle_entropy=recycle_entropy,
+            dice_bag=_parse_dice_bag(dice_bag),
+            query_for_dice=dice_source,
+            rng_options=_parse_rng_options(rng_option),
+        )
+        password_generator = PasswordGenerator(rng=rng, alphabet=alpha)
 
-        assert alpha, "No alphabet given. Did you forget --alphabet or alphabet-names?"
+        if count != 1 or output_format is not None or output_file is not None:
+            many_generator = (
+                ParallelPasswordGenerator(
+                    alphabet=alpha,
+                    workers=workers,
+                    random_source=randomness_source,
+                    dice_sides=dice_sides,
+                    rng_options=_parse_rng_options(rng_option),
+                )
+                if workers > 1
+                else password_generator
+            )
+            _write_many(
+                many_generator.generate_many(length, count),
+                output_format=output_format,
+                output_file=output_file,
+            )
+            _check_dice_file_consumed(dice_file, dice_source)
+            return
 
-        rng = get_rng(randomness_source, dice_sides=dice_sides)
-        password_generator = PasswordGenerator(rng=rng, alphabet=alpha)
         result = password_generator.generate(length)
+        _check_dice_file_consumed(dice_file, dice_source)
     except AssertionError as error:
         click.secho(f"ERROR: {error}", fg="red")
         click.echo("Try again!")
@@ -208,6 +529,224 @@ def pw(
     click.echo(f"Entropy: {result.entropy:.6}")
 
 
+@click.command()
+@click.help_option("--help", "-h")
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False),
+    help="Listen on this Unix domain socket.",
+)
+@click.option("--port", type=int, help="Listen on this TCP port (localhost only).")
+@click.option(
+    "--wordlist",
+    "-w",
+    "wordlist",
+    multiple=True,
+    metavar="NAME=PATH",
+    help="A wordlist file clients can use by its name (can be repeated).",
+)
+@click.option("--randomness-source", "-r", cls=RandomnessSourceOption)
+@click.option(
+    "--rng-option",
+    "rng_option",
+    multiple=True,
+    metavar="KEY=VALUE",
+    help="An option for a random source plugin (can be repeated).",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Do not use the cache of processed wordlists (in $XDG_CACHE_HOME/papass).",
+)
+def serve(
+    socket_path: str | None,
+    port: int | None,
+    wordlist: tuple[str, ...],
+    randomness_source: str,
+    rng_option: tuple[str, ...],
+    no_cache: bool,
+) -> None:
+    """Serve passphrase and password requests (JSON lines) until interrupted.
+
+    Saves process startup and wordlist loading if many passphrases or passwords are
+    requested one after the other. Each request is a line with a JSON object. Clients can
+    only use the wordlists given by --wordlist (by their names):
+
+    \b
+    Example:
+    \b
+    $ papass serve --socket /tmp/papass.sock -w eff=wordlist.txt &
+    $ echo '{"command": "pp", "length": 4, "wordlist": "eff"}' \\
+        | nc -U /tmp/papass.sock
+    {"results": [{"passphrase": "...", "entropy": 51.6993, "entropy_is_guaranteed": true}]}
+
+    See https://papass.readthedocs.io/en/stable/usage_cli.html#server for details.
+    """  # noqa: D301
+    import asyncio
+    import contextlib
+
+    from papass import WordListCache
+    from papass.server import PapassServer
+
+    try:
+        assert (socket_path is None) != (port is None), "Use exactly one of --socket and --port."
+        server = PapassServer(
+            wordlists=_parse_wordlists(wordlist),
+            random_source=randomness_source,
+            wordlist_cache=None if no_cache else WordListCache(),
+            rng_options=_parse_rng_options(rng_option),
+        )
+    except (AssertionError, OSError) as error:
+        click.secho(f"ERROR: {error}", fg="red")
+        return
+
+    serving = server.serve_unix(socket_path) if socket_path else server.serve_tcp(port or 0)
+    click.echo(f"Serving on {socket_path or f'127.0.0.1:{port}'} (stop with Ctrl-C).", err=True)
+
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serving)
+
+
+@click.group()
+@click.help_option("--help", "-h")
+def wordlist_group() -> None:
+    """Work with wordlist files."""
+
+
+@wordlist_group.command("compile")
+@click.help_option("--help", "-h")
+@click.argument("input_file", type=click.Path(exists=True, dir_okay=False))
+@click.argument("output_file", type=click.Path(dir_okay=False))
+@click.option(
+    "--min-word-size",
+    "--minw",
+    type=int,
+    default=1,
+    help="Filter out words which are shorter than this (default: 1).",
+)
+@click.option(
+    "--max-word-size",
+    "--maxw",
+    type=int,
+    help="Filter out words which are longer than this (default: no limit).",
+)
+@click.option(
+    "--remove-leading-digits",
+    "--rld",
+    is_flag=True,
+    help="If wordlist contains entries like `123 foo` normalizes it to `foo`.",
+)
+def wordlist_compile(
+    input_file: str,
+    output_file: str,
+    min_word_size: int,
+    max_word_size: int,
+    remove_leading_digits: bool,
+) -> None:
+    """Compile a wordlist file into the binary format.
+
+    The binary format is sorted and deduplicated already. It can be used with pp -w and
+    is loaded much faster than a text file (it is memory-mapped instead of parsed).
+
+    \b
+    Example:
+    \b
+    $ papass wordlist compile wordlist.txt wordlist.ppwl
+    Wrote 7776 words to wordlist.ppwl.
+    $ papass pp -l 4 -w wordlist.ppwl
+    """  # noqa: D301
+    from papass import WordList
+
+    try:
+        wordlist = WordList.from_file(
+            Path(input_file),
+            min_word_size=min_word_size,
+            max_word_size=max_word_size,
+            remove_leading_digits=remove_leading_digits,
+        )
+        wordlist.to_binary_file(Path(output_file))
+    except AssertionError as error:
+        click.secho(f"ERROR: {error}", fg="red")
+        return
+
+    click.echo(f"Wrote {len(wordlist)} words to {output_file}.")
+
+
+@wordlist_group.command("make-prefix-free")
+@click.help_option("--help", "-h")
+@click.argument("input_file", type=click.Path(exists=True, dir_okay=False))
+@click.argument("output_file", type=click.Path(dir_okay=False))
+@click.option(
+    "--min-word-size",
+    "--minw",
+    type=int,
+    default=1,
+    help="Filter out words which are shorter than this (default: 1).",
+)
+@click.option(
+    "--max-word-size",
+    "--maxw",
+    type=int,
+    help="Filter out words which are longer than this (default: no limit).",
+)
+@click.option(
+    "--remove-leading-digits",
+    "--rld",
+    is_flag=True,
+    help="If wordlist contains entries like `123 foo` normalizes it to `foo`.",
+)
+@click.option(
+    "--text",
+    is_flag=True,
+    help="Write a text file (one word per line) instead of the binary format.",
+)
+def wordlist_make_prefix_free(
+    input_file: str,
+    output_file: str,
+    min_word_size: int,
+    max_word_size: int,
+    remove_leading_digits: bool,
+    text: bool,
+) -> None:
+    """Remove the fewest words such that no word is a prefix of another word.
+
+    Passphrases from such a wordlist can be split into words uniquely, hence it can be
+    used with -d "" without losing entropy.
+
+    \b
+    Example:
+    \b
+    $ papass wordlist make-prefix-free wordlist.txt wordlist.ppwl
+    Removed 125 of 7776 words. Entropy per word: 12.9248 -> 12.9014.
+    $ papass pp -l 4 -w wordlist.ppwl -d ""
+    """  # noqa: D301
+    from papass import WordList
+
+    try:
+        wordlist = WordList.from_file(
+            Path(input_file),
+            min_word_size=min_word_size,
+            max_word_size=max_word_size,
+            remove_leading_digits=remove_leading_digits,
+        )
+        assert len(wordlist) > 0, "The wordlist is empty."
+
+        prefix_free = wordlist.prefix_free()
+        if text:
+            prefix_free.to_file(Path(output_file))
+        else:
+            prefix_free.to_binary_file(Path(output_file))
+    except AssertionError as error:
+        click.secho(f"ERROR: {error}", fg="red")
+        return
+
+    click.echo(
+        f"Removed {len(wordlist) - len(prefix_free)} of {len(wordlist)} words."
+        f" Entropy per word: {math.log2(len(wordlist)):.6} -> {math.log2(len(prefix_free)):.6}."
+    )
+
+
 def _print_alpha_preset() -> None:
     base = {k: click.style(v, bg=RESULT_BG_COLOR) for k, v in alphabet_preset_base().items()}
     shortcuts = {k: ",".join(v) for k, v in alphabet_preset_shortcuts().items()}
@@ -0,0 +1,110 @@
+"""A compact in-memory representation of sorted word lists (front coding).
+
+Sorted words tend to share long prefixes with their predecessor. Hence each word is stored
+as the length of the prefix it shares with the previous word plus the rest. To keep random
+access cheap, the words are split into blocks of ``BLOCK_SIZE`` words and the first word of
+each block is stored in full. A block is stored as a single string, which saves the
+per-object overhead of Python strings.
+"""
+
+import itertools
+import os
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any, overload
+
+from .utils import batched
+
+BLOCK_SIZE = 16
+"""Number of words per block. Accessing a word decodes at most this many words."""
+
+
+class FrontCodedWords(Sequence[str]):
+    """A read-only sequence of sorted words stored with front coding.
+
+    Example
+    -------
+    >>> words = FrontCodedWords(["house", "houseboat", "household", "mouse"])
+    >>> words[2], len(words)
+    ('household', 4)
+    >>> list(words) == ["house", "houseboat", "household", "mouse"]
+    True
+
+    """
+
+    def __init__(self, words: Iterable[str], *, block_size: int = BLOCK_SIZE):
+        """Encode words.
+
+        :param words: Sorted words (not required for correctness but for compactness).
+        :param block_size: Number of words per block.
+        """
+        assert block_size > 0, "block_size must be positive."
+
+        self._block_size = block_size
+        self._heads: list[str] = []
+        self._tails: list[str] = []
+        self._count = 0
+
+        for block in batched(words, block_size):
+            self._heads.append(block[0])
+            self._tails.append(_encode_tail(block))
+            self._count += len(block)
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+    @overload
+    def __getitem__(self, index: slice) -> list[str]: ...
+
+    def __getitem__(self, index: Any) -> Any:
+        """Get a word at an index or a list of words from a slice."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Index out of range")
+
+        block, position = divmod(index, self._block_size)
+        if position == 0:
+            return self._heads[block]
+
+        for i, word in enumerate(_decode_block(self._heads[block], self._tails[block]), 1):
+            if i == position:
+                return word
+        raise AssertionError("Unreachable")
+
+    def __len__(self) -> int:
+        """Return the number of words."""
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over all words (decoding each block once)."""
+        for head, tail in zip(self._heads, self._tails, strict=True):
+            yield head
+            yield from _decode_block(head, tail)
+
+
+def _encode_tail(block: Sequence[str]) -> str:
+    """Encode all words of a block but the first into a single string.
+
+    Each word is encoded as ``chr(shared) + chr(len(rest)) + rest`` where ``shared`` is the
+    length of the prefix shared with the previous word.
+    """
+    parts = []
+    for previous, word in itertools.pairwise(block):
+        shared = len(os.path.commonprefix([previous, word]))
+        rest = word[shared:]
+        parts.append(f"{chr(shared)}{chr(len(rest))}{rest}")
+    return "".join(parts)
+
+
+def _decode_block(head: str, tail: str) -> Iterator[str]:
+    """Yield the words encoded in ``tail`` (see ``_encode_tail``)."""
+    word = head
+    position = 0
+    while position < len(tail):
+        shared, size = ord(tail[position]), ord(tail[position + 1])
+        position += 2
+        word = word[:shared] + tail[position : position + size]
+        position += size
+        yield word
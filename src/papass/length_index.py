@@ -0,0 +1,140 @@
+"""Filtering word lists by word length without copying them.
+
+A ``LengthIndex`` groups the words of a (sorted) sequence by their length. With it, the
+number of words in a range of lengths is known in logarithmic time and the words
+themselves can be accessed via a ``LengthFilteredWords`` view. Such a view only stores the
+positions of its words in the base sequence. All views of one base sequence share the
+base sequence and its index.
+"""
+
+import bisect
+import itertools
+from array import array
+from collections import Counter
+from collections.abc import Iterator, Sequence
+from typing import Any, overload
+
+
+class LengthIndex:
+    """Groups the words of a sequence by their length.
+
+    Only a histogram of the lengths is computed eagerly. The positions of the words of
+    each length are computed on first use.
+
+    Example
+    -------
+    >>> index = LengthIndex(["a", "ab", "abc", "b", "bc"])
+    >>> index.count(2, None), index.count(1, 1)
+    (3, 2)
+
+    """
+
+    def __init__(self, words: Sequence[str]):
+        """Index words (one pass over the words)."""
+        assert len(words) < 2**32, "Too many words."
+
+        self._words = words
+        histogram = Counter(map(len, words))
+
+        self.lengths: list[int] = sorted(histogram)
+        """All lengths of words (ascending)."""
+
+        self._cumulative_counts = [0, *itertools.accumulate(histogram[n] for n in self.lengths)]
+        self._buckets: dict[int, array[int]] | None = None
+
+    def count(self, min_size: int, max_size: int | None) -> int:
+        """Return the number of words of length in ``[min_size, max_size]``.
+
+        :param max_size: ``None`` means no upper bound.
+        """
+        lo, hi = self._length_range(min_size, max_size)
+        return self._cumulative_counts[hi] - self._cumulative_counts[lo]
+
+    def positions(self, min_size: int, max_size: int | None) -> Sequence[int]:
+        """Return the (ascending) positions of the words of length in ``[min_size, max_size]``."""
+        if self._buckets is None:
+            self._buckets = {n: array("I") for n in self.lengths}
+            for position, size in enumerate(map(len, self._words)):
+                self._buckets[size].append(position)
+
+        lo, hi = self._length_range(min_size, max_size)
+        selected = [self._buckets[n] for n in self.lengths[lo:hi]]
+        if len(selected) == 1:
+            return selected[0]
+
+        # Merge the sorted buckets (sorting detects and merges the runs).
+        return array("I", sorted(itertools.chain.from_iterable(selected)))
+
+    def _length_range(self, min_size: int, max_size: int | None) -> tuple[int, int]:
+        """Return ``lo, hi`` such that ``lengths[lo:hi]`` are the lengths in the range."""
+        lo = bisect.bisect_left(self.lengths, min_size)
+        if max_size is None:
+            return lo, len(self.lengths)
+        return lo, max(lo, bisect.bisect_right(self.lengths, max_size))
+
+
+class LengthFilteredWords(Sequence[str]):
+    """A read-only view of the words of a sequence with length in ``[min_size, max_size]``.
+
+    Example
+    -------
+    >>> words = ["a", "ab", "abc", "b", "bc"]
+    >>> view = LengthFilteredWords(words, LengthIndex(words), 2, None)
+    >>> len(view), list(view), view[1]
+    (3, ['ab', 'abc', 'bc'], 'abc')
+
+    """
+
+    def __init__(
+        self, words: Sequence[str], index: LengthIndex, min_size: int, max_size: int | None
+    ):
+        """Create a view (in logarithmic time).
+
+        :param words: The base sequence.
+        :param index: The length index of ``words``.
+        :param max_size: ``None`` means no upper bound.
+        """
+        self._words = words
+        self._index = index
+        self._min_size = min_size
+        self._max_size = max_size
+        self._count = index.count(min_size, max_size)
+        self._positions: Sequence[int] | None = None
+
+    def filtered(self, min_size: int, max_size: int | None) -> "LengthFilteredWords":
+        """Return a view of the words of this view with length in ``[min_size, max_size]``.
+
+        The new view shares the base sequence and its index with this one.
+        """
+        if self._max_size is not None:
+            max_size = self._max_size if max_size is None else min(max_size, self._max_size)
+        return LengthFilteredWords(
+            self._words, self._index, max(min_size, self._min_size), max_size
+        )
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+    @overload
+    def __getitem__(self, index: slice) -> list[str]: ...
+
+    def __getitem__(self, index: Any) -> Any:
+        """Get a word at an index or a list of words from a slice."""
+        if self._positions is None:
+            self._positions = self._index.positions(self._min_size, self._max_size)
+
+        if isinstance(index, slice):
+            return [self._words[i] for i in self._positions[index]]
+        return self._words[self._positions[index]]
+
+    def __len__(self) -> int:
+        """Return the number of words."""
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over all words."""
+        if self._positions is not None:
+            return (self._words[i] for i in self._positions)
+
+        min_size = self._min_size
+        max_size = self._max_size if self._max_size is not None else float("inf")
+        return (w for w in self._words if min_size <= len(w) <= max_size)
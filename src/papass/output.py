@@ -0,0 +1,139 @@
+"""Streaming output of many results (e.g. for ``papass pp --count``).
+
+Writers format the results in chunks and write each chunk at once to a (buffered) text
+stream. Nothing is styled and nothing is flushed per line, hence the throughput is not
+dominated by terminal I/O.
+"""
+
+import contextlib
+import csv
+import io
+import json
+import sys
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict
+from pathlib import Path
+from typing import TextIO
+
+from .passphrase_generator import PassphraseResult
+from .password_generator import PasswordResult
+from .utils import batched
+
+Result = PassphraseResult | PasswordResult
+
+CHUNK_SIZE = 4096
+"""Number of results formatted and written at once."""
+
+BUFFER_SIZE = 2**20
+"""Buffer size (in bytes) of output files."""
+
+
+class OutputWriter(ABC):
+    """Base class of all writers."""
+
+    def __init__(self, stream: TextIO):
+        """Create a writer.
+
+        :param stream: Where to write to. The stream is not closed by the writer.
+        """
+        self._stream = stream
+
+    def write_all(self, results: Iterable[Result]) -> Result | None:
+        """Write all results and return the last one (``None`` if there were no results)."""
+        last = None
+        for chunk in batched(results, CHUNK_SIZE):
+            self._stream.write(self._format_chunk(chunk))
+            last = chunk[-1]
+        self._stream.flush()
+        return last
+
+    @abstractmethod
+    def _format_chunk(self, chunk: list[Result]) -> str:
+        """Return the records of all results in the chunk as a single string."""
+
+
+class PlainWriter(OutputWriter):
+    """One passphrase (or password) per line."""
+
+    def _format_chunk(self, chunk: list[Result]) -> str:
+        return "".join(f"{_text(result)}\n" for result in chunk)
+
+
+class NulWriter(OutputWriter):
+    """Passphrases (or passwords) terminated by NUL characters (like ``find -print0``)."""
+
+    def _format_chunk(self, chunk: list[Result]) -> str:
+        return "".join(f"{_text(result)}\0" for result in chunk)
+
+
+class JsonLinesWriter(OutputWriter):
+    """One JSON object per line containing all fields of the result (e.g. the entropy)."""
+
+    def _format_chunk(self, chunk: list[Result]) -> str:
+        return "".join(json.dumps(asdict(result)) + "\n" for result in chunk)
+
+
+class CsvWriter(OutputWriter):
+    """CSV with a header row. The columns are the fields of the result (e.g. the entropy)."""
+
+    def __init__(self, stream: TextIO):
+        """Create a writer (see ``OutputWriter``)."""
+        super().__init__(stream)
+        self._header_written = False
+
+    def _format_chunk(self, chunk: list[Result]) -> str:
+        rows = [asdict(result) for result in chunk]
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=list(rows[0]), lineterminator="\n")
+
+        if not self._header_written:
+            writer.writeheader()
+            self._header_written = True
+        writer.writerows(rows)
+
+        return buffer.getvalue()
+
+
+_output_writers: dict[str, type[OutputWriter]] = {
+    # The first one is the default.
+    "plain": PlainWriter,
+    "jsonl": JsonLinesWriter,
+    "csv": CsvWriter,
+    "nul": NulWriter,
+}
+
+
+def available_output_formats() -> list[str]:
+    """Get a list of all valid values for --format."""
+    return list(_output_writers.keys())
+
+
+def get_output_writer(output_format: str, stream: TextIO) -> OutputWriter:
+    """Get a writer for the given format writing to ``stream``."""
+    return get_output_writer_class(output_format)(stream)
+
+
+def get_output_writer_class(output_format: str) -> type[OutputWriter]:
+    """Get the writer class of the given format (to check the format before writing)."""
+    assert output_format in _output_writers, (
+        f"Unknown output format `{output_format}`. Use one of "
+        + ", ".join(f"'{f}'" for f in available_output_formats())
+        + "."
+    )
+    return _output_writers[output_format]
+
+
+@contextlib.contextmanager
+def open_output(file_path: Path | str | None) -> Iterator[TextIO]:
+    """Open a file for writing with a large buffer. ``None`` or ``"-"`` means stdout."""
+    if file_path is None or str(file_path) == "-":
+        yield sys.stdout
+        return
+
+    with open(file_path, "w", encoding="utf-8", newline="", buffering=BUFFER_SIZE) as fout:
+        yield fout
+
+
+def _text(result: Result) -> str:
+    return result.passphrase if isinstance(result, PassphraseResult) else result.password
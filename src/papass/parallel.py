@@ -0,0 +1,264 @@
+"""Bulk generation of passphrases and passwords in several processes.
+
+A job of ``count`` results is split into chunks which are generated by a pool of worker
+processes. Each worker creates its own random number generator (by name, like
+``--randomness-source``), hence every worker draws from its own stream of operating system
+randomness. Word lists are handed to the workers as memory-mapped binary files, they are
+never pickled.
+"""
+
+import os
+import tempfile
+from collections import deque
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any
+
+from .passphrase_generator import PassphraseGenerator, PassphraseResult
+from .password_generator import PasswordGenerator, PasswordResult
+from .random_source import get_rng
+from .random_source.registry import is_interactive_randomness_source
+from .wordlist import WordList
+
+DEFAULT_CHUNK_SIZE = 10_000
+"""Number of results a worker generates per task."""
+
+_worker_generator: Any = None
+"""The generator of a worker process (set by the worker initializer)."""
+
+
+class ParallelPassphraseGenerator:
+    """Like ``PassphraseGenerator.generate_many`` but spread over several processes.
+
+    Example
+    -------
+    >>> ppg = ParallelPassphraseGenerator(wordlist=WordList(["foo", "bar"]), workers=2)
+    >>> results = list(ppg.generate_many(3, 5))
+    >>> len(results), results[0].entropy
+    (5, 3.0)
+
+    """
+
+    def __init__(
+        self,
+        *,
+        wordlist: WordList,
+        workers: int | None = None,
+        random_source: str = "system",
+        delimiter: str = " ",
+        exact_entropy: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        **rng_options: Any,
+    ):
+        """Create a parallel passphrase generator.
+
+        :param wordlist: The words to draw from.
+        :param workers: Number of worker processes. ``None`` means one per CPU.
+        :param random_source: Name of the random source (like ``--randomness-source``).
+            Interactive sources like ``dice`` are not supported.
+        :param delimiter: At most a single character to be put between the generated words.
+        :param exact_entropy: Count the distinct passphrases exactly if necessary (see
+            ``PassphraseGenerator``). This is done once (not in every worker).
+        :param chunk_size: Number of passphrases a worker generates per task.
+        :param rng_options: Options for the random source (like ``get_rng``).
+        """
+        _check_options(random_source, workers, chunk_size)
+        # Fail early (and not in the workers) on invalid options. This generator also
+        # computes the entropy once for all workers.
+        self._generator = PassphraseGenerator(
+            wordlist=wordlist,
+            rng=get_rng(random_source, **rng_options),
+            delimiter=delimiter,
+            exact_entropy=exact_entropy,
+        )
+
+        self._wordlist = wordlist
+        self._workers = workers
+        self._random_source = random_source
+        self._rng_options = rng_options
+        self._delimiter = delimiter
+        self._chunk_size = chunk_size
+
+    def generate_many(
+        self, length: int, count: int, *, ordered: bool = True
+    ) -> Iterator[PassphraseResult]:
+        """Generate ``count`` random passphrases.
+
+        :param length: The number of words in each passphrase.
+        :param count: The number of passphrases to generate.
+        :param ordered: If ``False`` chunks are yielded as soon as they are ready. Since all
+            passphrases are independent this does not affect their distribution.
+        :return: An iterator over result objects containing the generated passphrases.
+        """
+        assert count >= 0, "--count must not be negative."
+        return self._generate_many(length, count, ordered=ordered)
+
+    def _generate_many(
+        self, length: int, count: int, *, ordered: bool
+    ) -> Iterator[PassphraseResult]:
+        # Counting the passphrases (for ``exact_entropy``) might be slow. Do it only once.
+        entropy = self._generator._entropy(length)
+
+        with tempfile.TemporaryDirectory(prefix="papass-") as directory:
+            wordlist_file = Path(directory) / "wordlist.ppwl"
+            self._wordlist.to_binary_file(wordlist_file)
+
+            yield from _generate_sharded(
+                initializer=_init_passphrase_worker,
+                initargs=(
+                    wordlist_file,
+                    self._random_source,
+                    self._rng_options,
+                    self._delimiter,
+                    {length: entropy},
+                ),
+                length=length,
+                count=count,
+                workers=self._workers,
+                chunk_size=self._chunk_size,
+                ordered=ordered,
+            )
+
+
+class ParallelPasswordGenerator:
+    """Like ``PasswordGenerator.generate_many`` but spread over several processes."""
+
+    def __init__(
+        self,
+        *,
+        alphabet: Sequence[str],
+        workers: int | None = None,
+        random_source: str = "system",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        **rng_options: Any,
+    ):
+        """Create a parallel password generator.
+
+        :param alphabet: A sequence of characters to be used in password creation.
+        :param workers: Number of worker processes. ``None`` means one per CPU.
+        :param random_source: Name of the random source (like ``--randomness-source``).
+            Interactive sources like ``dice`` are not supported.
+        :param chunk_size: Number of passwords a worker generates per task.
+        :param rng_options: Options for the random source (like ``get_rng``).
+        """
+        _check_options(random_source, workers, chunk_size)
+        # Fail early (and not in the workers) on invalid options:
+        PasswordGenerator(alphabet=alphabet, rng=get_rng(random_source, **rng_options))
+
+        self._alphabet = list(alphabet)
+        self._workers = workers
+        self._random_source = random_source
+        self._rng_options = rng_options
+        self._chunk_size = chunk_size
+
+    def generate_many(
+        self, length: int, count: int, *, ordered: bool = True
+    ) -> Iterator[PasswordResult]:
+        """Generate ``count`` random passwords.
+
+        :param length: The length of each password.
+        :param count: The number of passwords to generate.
+        :param ordered: If ``False`` chunks are yielded as soon as they are ready.
+        :return: An iterator over result objects containing the generated passwords.
+        """
+        assert count >= 0, "--count must not be negative."
+
+        return _generate_sharded(
+            initializer=_init_password_worker,
+            initargs=(self._alphabet, self._random_source, self._rng_options),
+            length=length,
+            count=count,
+            workers=self._workers,
+            chunk_size=self._chunk_size,
+            ordered=ordered,
+        )
+
+
+def _check_options(random_source: str, workers: int | None, chunk_size: int) -> None:
+    assert not is_interactive_randomness_source(
+        random_source
+    ), f"Random source `{random_source}` cannot be used by several processes."
+    assert workers is None or workers > 0, "--workers must be positive."
+    assert chunk_size > 0, "chunk_size must be positive."
+
+
+def _generate_sharded(
+    *,
+    initializer: Callable[..., None],
+    initargs: tuple[Any, ...],
+    length: int,
+    count: int,
+    workers: int | None,
+    chunk_size: int,
+    ordered: bool,
+) -> Iterator[Any]:
+    """Run ``_generate_chunk`` in a process pool until ``count`` results are yielded.
+
+    At most two chunks per worker are in flight. Hence memory usage does not grow with
+    ``count`` even if the consumer is slow.
+    """
+    if count == 0:
+        return
+
+    num_workers = workers or os.cpu_count() or 1
+    chunk_sizes = (min(chunk_size, count - start) for start in range(0, count, chunk_size))
+
+    executor = ProcessPoolExecutor(
+        max_workers=num_workers, initializer=initializer, initargs=initargs
+    )
+    try:
+        pending: deque[Future[list[Any]]] = deque()
+
+        def submit_next() -> None:
+            size = next(chunk_sizes, None)
+            if size is not None:
+                pending.append(executor.submit(_generate_chunk, length, size))
+
+        for _ in range(2 * num_workers):
+            submit_next()
+
+        while pending:
+            if ordered:
+                future = pending.popleft()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                future = done.pop()
+                pending.remove(future)
+
+            results = future.result()
+            submit_next()
+            yield from results
+    finally:
+        # Do not finish the remaining chunks if the consumer stops early.
+        executor.shutdown(cancel_futures=True)
+
+
+def _init_passphrase_worker(
+    wordlist_file: Path,
+    random_source: str,
+    rng_options: dict[str, Any],
+    delimiter: str,
+    entropies: dict[int, tuple[float, bool]],
+) -> None:
+    global _worker_generator
+    _worker_generator = PassphraseGenerator(
+        wordlist=WordList.from_binary_file(wordlist_file),
+        rng=get_rng(random_source, **rng_options),
+        delimiter=delimiter,
+    )
+    # The entropy was computed by the parent process already.
+    _worker_generator._entropies.update(entropies)
+
+
+def _init_password_worker(
+    alphabet: list[str], random_source: str, rng_options: dict[str, Any]
+) -> None:
+    global _worker_generator
+    _worker_generator = PasswordGenerator(
+        alphabet=alphabet, rng=get_rng(random_source, **rng_options)
+    )
+
+
+def _generate_chunk(length: int, count: int) -> list[Any]:
+    return list(_worker_generator.generate_many(length, count))
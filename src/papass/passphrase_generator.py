@@ -1,11 +1,16 @@
 import math
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass
-from functools import cached_property
+from functools import partial
 
+from .analysis import MAX_STATES, count_passphrases
 from .random_source.base import RngBase
-from .utils import PowerSequence
+from .utils import PowerSequence, batched
 from .wordlist import WordList
 
+BATCH_SIZE = 1024
+"""Number of passphrases decoded at once by ``PassphraseGenerator.generate_many``."""
+
 
 @dataclass
 class PassphraseResult:
@@ -19,14 +24,22 @@ class PassphraseResult:
 
     Ideally the number of passphrases which could have been generated with the same
     settings is ``2**entropy``. We use a simple formula to estimate the entropy, hence the
-    estimate might not be guaranteed to be exact.
+    estimate might not be guaranteed to be exact (see ``entropy_is_guaranteed``).
+
+    With ``exact_entropy=True`` this is the logarithm of the number of *distinct*
+    passphrases (unless counting them is too expensive). If some passphrases can be split
+    into words in several ways, they are more likely than others. Then this is only an upper
+    bound of the (Shannon) entropy. E.g. the words ``a`` and ``aa`` without delimiter give
+    4 distinct passphrases of 3 words (2.0 bits) but their entropy is about 1.81 bits.
     """
 
     entropy_is_guaranteed: bool
     """Whether we can guarantee that the entropy is correctly estimated.
 
     ``True`` means that the entropy estimate is exact. ``False`` means that our heuristic
-    could not prove that the estimate is exact (it might be exact though).
+    could not prove that the estimate is exact (it might be exact though). With
+    ``exact_entropy=True`` it also means that some passphrases are more likely than others
+    (if the passphrases could be counted, see ``entropy``).
 
     Note that even if the entropy estimate is not exact it probably does not overestimate
     it too much in most cases.
@@ -36,52 +49,60 @@ class PassphraseResult:
     """
 
 
-class PassphraseGenerator:
-    """Generate phrases from a wordlist using a random number generator."""
+class _PassphraseGeneratorBase:
+    """Everything of a passphrase generator except the random source.
 
-    _wordlist: WordList
-    _rng: RngBase
+    Shared by ``PassphraseGenerator`` and ``AsyncPassphraseGenerator``.
+    """
 
+    _wordlist: WordList
     _delimiter: str
+    _exact_entropy: bool
 
-    def __init__(
-        self,
-        *,
-        wordlist: WordList,
-        rng: RngBase,
-        delimiter: str = " ",
-    ):
-        """Create a passphrase generator.
-
-        :param wordlist: The words to draw from.
-        :param rng: The randomness source to be used to draw words.
-        :param delimiter: At most a single character to be put between the generated words.
-        """
+    def __init__(self, *, wordlist: WordList, delimiter: str, exact_entropy: bool = False):
         assert len(delimiter) <= 1, "--delimiter must be single character or empty."
 
         self._wordlist = wordlist
-        self._rng = rng
         self._delimiter = delimiter
+        self._exact_entropy = exact_entropy
+        self._entropies: dict[int, tuple[float, bool]] = {}
 
-    def generate(self, length: int) -> PassphraseResult:
-        """Generate a random passphrase.
+    def _decoder(self, length: int) -> tuple[int, Callable[[list[int]], list[PassphraseResult]]]:
+        """Return the number of possible passphrases and a function decoding indices.
 
-        The passphrase is *essentially* created by a single application of ``rng.choice`` to
-        the set of all possible passwords (lazy iterators make this possible even for
-        large passphrase spaces).
-
-        :param length: The number of words in the passphrase.
-        :return: A result object containing the generated passphrase.
+        The function turns a batch of indices (from ``[0, number_of_passphrases)``) into the
+        corresponding results. It holds the whole word list, hence it is meant to run in
+        the same process (e.g. in a thread pool).
         """
         power_wordlist = PowerSequence(self._wordlist, length)
-        index = self._rng.randbelow(power_wordlist.size)
-        words = power_wordlist[index]
+        entropy, entropy_is_guaranteed = self._entropy(length)
 
-        return PassphraseResult(
-            passphrase=self._delimiter.join(words),
-            entropy=length * self._entropy_per_word,
-            entropy_is_guaranteed=self._entropy_is_guaranteed(length),
+        decode = partial(
+            _decode_passphrases, power_wordlist, self._delimiter, entropy, entropy_is_guaranteed
         )
+        return power_wordlist.size, decode
+
+    def _entropy(self, length: int) -> tuple[float, bool]:
+        """Return the entropy of passphrases of ``length`` words and whether it is guaranteed.
+
+        The result is cached per length (counting the passphrases exactly can be slow).
+        """
+        if length not in self._entropies:
+            entropy = length * self._entropy_per_word
+            entropy_is_guaranteed = self._entropy_is_guaranteed(length)
+
+            if self._exact_entropy and not entropy_is_guaranteed:
+                num_passphrases = count_passphrases(
+                    self._wordlist, length, self._delimiter, max_states=MAX_STATES
+                )
+                if num_passphrases is not None:
+                    # Fewer distinct passphrases than word sequences make some passphrases
+                    # more likely than others. Then the count is only an upper bound.
+                    entropy = math.log2(num_passphrases)
+                    entropy_is_guaranteed = num_passphrases == len(self._wordlist) ** length
+
+            self._entropies[length] = entropy, entropy_is_guaranteed
+        return self._entropies[length]
 
     @property
     def _entropy_per_word(self) -> float:
@@ -90,18 +111,17 @@ class PassphraseGenerator:
     def _entropy_is_guaranteed(self, count: int) -> bool:
         """Return ``True`` if we can guarantee that the entropy estimate is exact.
 
-        We use a simple heuristic: If the delimiter does not occur in any of the words it
-        serves as marker forfor the word boundaries. In that case the number of possible
-        passphrases is indeed
+        If the delimiter does not occur in any of the words it serves as marker for the word
+        boundaries. In that case the number of possible passphrases is indeed
 
         number_of_words_in_wordlist ** number_of_words_in_passphrase
 
-        and the entropy estimate is correct.
+        and the entropy estimate is correct. Otherwise we check whether the passphrases can
+        still be split into words uniquely (this is computed once per word list).
 
-        If the heuristic is not satisfied it can in principle still be the case that the
-        number of possible passphrases is as desired. But it is hard to check this in
-        general so we just return False in that case (we could not prove that it is the
-        case).
+        If that is not the case the number of possible passphrases of this length can in
+        principle still be as desired. But we just return False then (see ``exact_entropy``
+        for an exact answer).
 
         But note that in general we entropy is "probably" not too far off.
         """
@@ -110,12 +130,86 @@ class PassphraseGenerator:
         if count <= 1:
             # In this case delimiter is not even used
             return True
-        elif self._delimiter == "" or self._delimiter in self._word_alphabet:
-            return False
+        elif self._delimiter == "" or self._delimiter in self._wordlist.characters:
+            return self._wordlist.is_uniquely_decodable(self._delimiter)
 
         return True
 
-    @cached_property
-    def _word_alphabet(self) -> set[str]:
-        """Set of letters occuring the words."""
-        return set().union(*self._wordlist)
+
+class PassphraseGenerator(_PassphraseGeneratorBase):
+    """Generate phrases from a wordlist using a random number generator."""
+
+    _rng: RngBase
+
+    def __init__(
+        self,
+        *,
+        wordlist: WordList,
+        rng: RngBase,
+        delimiter: str = " ",
+        exact_entropy: bool = False,
+    ):
+        """Create a passphrase generator.
+
+        :param wordlist: The words to draw from.
+        :param rng: The randomness source to be used to draw words.
+        :param delimiter: At most a single character to be put between the generated words.
+        :param exact_entropy: If the heuristic cannot guarantee the entropy estimate, count
+            the distinct passphrases exactly (see ``papass.analysis``). This takes a few
+            seconds at most, for larger automata the estimate is kept. Note that the result
+            is an upper bound of the entropy if some passphrases are ambiguous (see
+            ``PassphraseResult.entropy``).
+        """
+        super().__init__(wordlist=wordlist, delimiter=delimiter, exact_entropy=exact_entropy)
+        self._rng = rng
+
+    def generate(self, length: int) -> PassphraseResult:
+        """Generate a random passphrase.
+
+        The passphrase is *essentially* created by a single application of ``rng.choice`` to
+        the set of all possible passwords (lazy iterators make this possible even for
+        large passphrase spaces).
+
+        :param length: The number of words in the passphrase.
+        :return: A result object containing the generated passphrase.
+        """
+        return next(self.generate_many(length, 1))
+
+    def generate_many(self, length: int, count: int) -> Iterator[PassphraseResult]:
+        """Generate ``count`` random passphrases.
+
+        The output is the same as for ``count`` consecutive calls to ``generate``. But the
+        setup (which is the same for all passphrases) is done only once and the randomness
+        is drawn via ``rng.randbelow_many``, which allows the random source to draw it in
+        bulk.
+
+        The passphrases are generated lazily, hence this can be used to stream huge numbers
+        of passphrases.
+
+        :param length: The number of words in each passphrase.
+        :param count: The number of passphrases to generate.
+        :return: An iterator over result objects containing the generated passphrases.
+        """
+        assert count >= 0, "--count must not be negative."
+
+        size, decode = self._decoder(length)
+        indices = self._rng.randbelow_many(size, count)
+
+        return (result for batch in batched(indices, BATCH_SIZE) for result in decode(batch))
+
+
+def _decode_passphrases(
+    power_wordlist: PowerSequence[str],
+    delimiter: str,
+    entropy: float,
+    entropy_is_guaranteed: bool,
+    indices: list[int],
+) -> list[PassphraseResult]:
+    return [
+        PassphraseResult(
+            passphrase=delimiter.join(words),
+            entropy=entropy,
+            entropy_is_guaranteed=entropy_is_guaranteed,
+        )
+        for words in power_wordlist.get_many(indices)
+    ]
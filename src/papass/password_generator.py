@@ -1,9 +1,13 @@
 import math
-from collections.abc import Sequence
+from collections.abc import Callable, Iterator, Sequence
 from dataclasses import dataclass
+from functools import cached_property, partial
 
 from papass.random_source import RngBase
-from papass.utils import PowerSequence
+from papass.utils import PowerSequence, batched
+
+BATCH_SIZE = 1024
+"""Number of passwords decoded at once by ``PasswordGenerator.generate_many``."""
 
 
 @dataclass
@@ -21,7 +25,39 @@ class PasswordResult:
     """
 
 
-class PasswordGenerator:
+class _PasswordGeneratorBase:
+    """Everything of a password generator except the random source.
+
+    Shared by ``PasswordGenerator`` and ``AsyncPasswordGenerator``.
+    """
+
+    def __init__(self, *, alphabet: Sequence[str]):
+        assert len(alphabet) > 0, "Alphabet must not be empty."
+        assert all(
+            len(c) == 1 for c in alphabet
+        ), "Alphabet must be a list of characters (length 1)."
+
+        self._alphabet = list(sorted(set(alphabet)))
+
+    def _decoder(self, length: int) -> tuple[int, Callable[[list[int]], list[PasswordResult]]]:
+        """Return the number of possible passwords and a function decoding indices.
+
+        See ``_PassphraseGeneratorBase._decoder``.
+        """
+        power_alphabet = PowerSequence(self._alphabet, length)
+        decode = partial(_decode_passwords, power_alphabet, length * self._entropy_per_char)
+        return power_alphabet.size, decode
+
+    @property
+    def _base(self) -> int:
+        return len(self._alphabet)
+
+    @cached_property
+    def _entropy_per_char(self) -> float:
+        return math.log2(self._base)
+
+
+class PasswordGenerator(_PasswordGeneratorBase):
     """Generate passwords from a list of characters using a random number generator."""
 
     def __init__(self, *, alphabet: Sequence[str], rng: RngBase):
@@ -32,12 +68,7 @@ class PasswordGenerator:
 
         The the alphabet gets deduplicated internally.
         """
-        assert len(alphabet) > 0, "Alphabet must not be empty."
-        assert all(
-            len(c) == 1 for c in alphabet
-        ), "Alphabet must be a list of characters (length 1)."
-
-        self._alphabet = list(sorted(set(alphabet)))
+        super().__init__(alphabet=alphabet)
         self._rng = rng
 
     def generate(self, length: int) -> PasswordResult:
@@ -50,19 +81,31 @@ class PasswordGenerator:
         :param length: The length of the password.
         :return: A result object containing the generated password.
         """
-        power_alphabet = PowerSequence(self._alphabet, length)
-        index = self._rng.randbelow(power_alphabet.size)
-        characters = power_alphabet[index]
+        return next(self.generate_many(length, 1))
 
-        return PasswordResult(
-            password="".join(characters),
-            entropy=length * self._entropy_per_char,
-        )
+    def generate_many(self, length: int, count: int) -> Iterator[PasswordResult]:
+        """Generate ``count`` random passwords.
 
-    @property
-    def _base(self) -> int:
-        return len(self._alphabet)
+        The output is the same as for ``count`` consecutive calls to ``generate``. But the
+        setup is done only once and the randomness is drawn via ``rng.randbelow_many``
+        (e.g. in large chunks for ``SystemRng``).
 
-    @property
-    def _entropy_per_char(self) -> float:
-        return math.log2(self._base)
+        :param length: The length of each password.
+        :param count: The number of passwords to generate.
+        :return: A (lazy) iterator over result objects containing the generated passwords.
+        """
+        assert count >= 0, "--count must not be negative."
+
+        size, decode = self._decoder(length)
+        indices = self._rng.randbelow_many(size, count)
+
+        return (result for batch in batched(indices, BATCH_SIZE) for result in decode(batch))
+
+
+def _decode_passwords(
+    power_alphabet: PowerSequence[str], entropy: float, indices: list[int]
+) -> list[PasswordResult]:
+    return [
+        PasswordResult(password="".join(characters), entropy=entropy)
+        for characters in power_alphabet.get_many(indices)
+    ]
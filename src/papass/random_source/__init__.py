@@ -1,16 +1,36 @@
-from .base import RngBase
-from .dice import DiceRng, QueryForDice
-from .registry import (
-    available_random_sources,
-    available_randomness_sources_str,
-    default_randomness_source,
-    get_rng,
-)
-from .system import SystemRng
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .base import RngBase
+    from .dice import DiceRng, QueryForDice
+    from .registry import (
+        available_random_sources,
+        available_randomness_sources_str,
+        default_randomness_source,
+        get_rng,
+    )
+    from .system import BufferedSystemRng, SystemRng
+
+# The public names are imported lazily on first access (PEP 562, like in ``papass``). Hence
+# importing ``papass.random_source.registry`` (e.g. by the command line tool) does not import
+# all random sources.
+_lazy_imports = {
+    "available_random_sources": ".registry",
+    "available_randomness_sources_str": ".registry",
+    "BufferedSystemRng": ".system",
+    "default_randomness_source": ".registry",
+    "DiceRng": ".dice",
+    "get_rng": ".registry",
+    "QueryForDice": ".dice",
+    "RngBase": ".base",
+    "SystemRng": ".system",
+}
 
 __all__ = [
     "available_random_sources",
     "available_randomness_sources_str",
+    "BufferedSystemRng",
     "default_randomness_source",
     "DiceRng",
     "get_rng",
@@ -18,3 +38,16 @@ __all__ = [
     "RngBase",
     "SystemRng",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _lazy_imports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_lazy_imports[name], __name__), name)
+    globals()[name] = value  # Subsequent accesses do not end up here.
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
@@ -0,0 +1,103 @@
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Callable, Iterator, Sequence
+from concurrent.futures import Executor
+from itertools import islice
+from typing import Any, TypeVar, final
+
+from .base import RngBase
+
+T = TypeVar("T")
+
+_CHUNK_SIZE = 4096
+"""Maximal number of integers ``AsyncRngWrapper.randbelow_many`` draws per executor call."""
+
+
+class AsyncRngBase(ABC):
+    """Base for all random number generators used by the asynchronous generators.
+
+    This is the ``async`` counterpart of ``RngBase``, e.g. for sources which have to wait
+    for some device.
+    """
+
+    @abstractmethod
+    async def randbelow(self, upper: int) -> int:
+        """Return a random integer ``i`` with ``0 <= i < upper``."""
+
+    async def randbelow_many(self, upper: int, count: int) -> AsyncIterator[int]:
+        """Return an async iterator over ``count`` random integers ``i`` with ``0 <= i < upper``.
+
+        The default implementation just awaits ``randbelow`` ``count`` times (lazily).
+        Subclasses can override this to draw randomness in bulk. The integers must be
+        distributed as if drawn by consecutive calls to ``randbelow``.
+        """
+        for _ in range(count):
+            yield await self.randbelow(upper)
+
+    @final
+    async def choice(self, items: Sequence[T]) -> T:
+        """Return a random item from ``items`` (see ``RngBase.choice``)."""
+        assert items, "Items must not be empty."
+        index = await self.randbelow(len(items))
+        return items[index]
+
+
+class AsyncRngWrapper(AsyncRngBase):
+    """Use a (blocking) ``RngBase`` without blocking the event loop.
+
+    All calls to the wrapped rng are run in an executor.
+
+    Example
+    -------
+    >>> from papass.random_source import SystemRng
+    >>> rng = AsyncRngWrapper(SystemRng())
+    >>> 0 <= asyncio.run(rng.randbelow(10)) < 10
+    True
+
+    """
+
+    def __init__(self, rng: RngBase, *, executor: Executor | None = None):
+        """Wrap an rng.
+
+        :param rng: The rng to be wrapped. Concurrent calls are serialized (hence it
+            does not need to be thread-safe).
+        :param executor: A thread pool to run the calls to the rng in (the rng is not
+            copied to other processes). ``None`` means the default executor of the event
+            loop.
+        """
+        self._rng = rng
+        self._executor = executor
+        self._lock = threading.Lock()
+
+    async def randbelow(self, upper: int) -> int:
+        """Return a random integer ``i`` with ``0 <= i < upper`` (see the wrapped rng)."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._locked, self._rng.randbelow, upper)
+
+    async def randbelow_many(self, upper: int, count: int) -> AsyncIterator[int]:
+        """Return an async iterator over ``count`` random integers ``i`` with ``0 <= i < upper``.
+
+        The integers are drawn via ``randbelow_many`` of the wrapped rng in chunks. A chunk is
+        only drawn when the previous one is consumed.
+        """
+        loop = asyncio.get_running_loop()
+        integers = self._rng.randbelow_many(upper, count)
+
+        remaining = count
+        while remaining > 0:
+            chunk_size = min(remaining, _CHUNK_SIZE)
+            chunk = await loop.run_in_executor(
+                self._executor, self._locked, _take, integers, chunk_size
+            )
+            remaining -= chunk_size
+            for i in chunk:
+                yield i
+
+    def _locked(self, function: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            return function(*args)
+
+
+def _take(integers: Iterator[int], count: int) -> list[int]:
+    return list(islice(integers, count))
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
-from collections.abc import Sequence
-from typing import TypeVar, final
+from collections.abc import Iterator, Sequence
+from typing import ClassVar, TypeVar, final
 
 T = TypeVar("T")
 
@@ -8,10 +8,27 @@ T = TypeVar("T")
 class RngBase(ABC):
     """Base for all random number generators."""
 
+    cli_options: ClassVar[dict[str, str]] = {}
+    """Maps options of ``__init__`` to keys of --rng-option (only used for plugins).
+
+    The values are passed as strings, e.g. ``{"path": "device"}`` turns ``--rng-option
+    device=/dev/hwrng`` into ``path="/dev/hwrng"``. See ``papass.random_source.registry``.
+    """
+
     @abstractmethod
     def randbelow(self, upper: int) -> int:
         """Return a random integer ``i`` with ``0 <= i < upper``."""
 
+    def randbelow_many(self, upper: int, count: int) -> Iterator[int]:
+        """Return an iterator over ``count`` random integers ``i`` with ``0 <= i < upper``.
+
+        The default implementation just calls ``randbelow`` ``count`` times (lazily).
+        Subclasses can override this to draw randomness in bulk. The integers must be
+        distributed as if drawn by consecutive calls to ``randbelow``.
+        """
+        for _ in range(count):
+            yield self.randbelow(upper)
+
     @final
     def choice(self, items: Sequence[T]) -> T:
         """Return a random item from ``items``.
@@ -1,7 +1,10 @@
+import functools
+import math
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass
 from typing import Protocol
 
-from papass.utils import QueryUserForDice, rolls_to_value
+from papass.utils import QueryUserForDice, mixed_radix_to_value
 
 from .base import RngBase
 
@@ -26,7 +29,11 @@ class QueryForDice(Protocol):
         """
 
 
-@dataclass
+DICE_FRAME_CACHE_SIZE = 256
+"""Number of dice frames cached by ``compute_dice_frame``."""
+
+
+@dataclass(frozen=True)
 class DiceFrame:
     """Metadata required to convert dice rolls into integers.
 
@@ -41,8 +48,39 @@ class DiceFrame:
     required_num_rolls: int
 
 
+@dataclass(frozen=True)
+class DicePlan:
+    """Which dice to roll next (see ``plan_dice_rolls``)."""
+
+    rolls: tuple[tuple[int, int], ...]
+    """Pairs of the number of sides of a kind of dice and how many of them to roll."""
+
+    upper_dice: int
+    """The number of possible values after the rolls (including the pool)."""
+
+    @property
+    def num_rolls(self) -> int:
+        """The total number of dice to roll."""
+        return sum(count for _, count in self.rolls)
+
+    def expected_num_rolls(self, upper: int) -> float:
+        """Return the expected number of rolls until a value below ``upper`` is accepted.
+
+        This assumes that the same plan is used after each rejection (which is the case
+        unless entropy is recycled).
+        """
+        success_probability = (self.upper_dice // upper) * upper / self.upper_dice
+        return self.num_rolls / success_probability
+
+
 class DiceRng(RngBase):
-    """Random number generator relying on the user to throw physical dice."""
+    """Random number generator relying on the user to throw physical dice.
+
+    With ``recycle_entropy=True`` no randomness is thrown away: The part of rejected rolls
+    which was not used (and the surplus of accepted rolls) is kept in a pool and used by
+    subsequent calls. On average the number of rolls per call then approaches the minimum
+    ``log(upper) / log(num_sides)``.
+    """
 
     def __init__(
         self,
@@ -50,6 +88,8 @@ class DiceRng(RngBase):
         query_for_dice: QueryForDice | None = None,
         num_sides: int = 6,
         required_success_probability: float = 0.999,
+        recycle_entropy: bool = False,
+        dice_bag: Sequence[int] | None = None,
     ):
         """Create a `DiceRng`.
 
@@ -59,81 +99,270 @@ class DiceRng(RngBase):
             ``randbelow`` does not reject a roll. If ``upper`` is a power of ``num_sides``
             this probability is always 100%. But in general the number of required rolls
             increases with this probability.
+        :param recycle_entropy: Keep the randomness of rejected rolls and the surplus of
+            accepted rolls for later calls (see class docstring).
+        :param dice_bag: The numbers of sides of all kinds of dice at hand (like
+            ``[6, 8, 10, 12, 20]``). If given ``num_sides`` is ignored and the dice to be
+            rolled are chosen to minimize the expected number of rolls (see
+            ``plan_dice_rolls``).
         """
         assert num_sides > 1, f"num_sides must be at least 1, got {num_sides}"
+        assert dice_bag is None or (
+            len(dice_bag) > 0 and all(sides > 1 for sides in dice_bag)
+        ), f"dice_bag must not be empty and all dice must have at least 2 sides, got {dice_bag}"
         assert 0 <= required_success_probability < 1.0, (
             "required_success_probability must be >= 0 and < 1.0. "
             f"Got {required_success_probability}."
         )
 
-        self._query_for_dice = query_for_dice or QueryUserForDice()
+        self._query_for_dice = query_for_dice or QueryUserForDice(show_sides=dice_bag is not None)
         self._num_sides = num_sides
+        self._dice_bag = tuple(sorted(set(dice_bag))) if dice_bag is not None else None
         self._required_success_probability = required_success_probability
+        self._recycle_entropy = recycle_entropy
+
+        # The pool: ``_pool_value`` is uniformly distributed on ``[0, _pool_size)`` and
+        # independent of all previous outputs.
+        self._pool_value = 0
+        self._pool_size = 1
 
     def randbelow(self, upper: int) -> int:
         """Generate random integers ``i`` with ``0 <= i < upper``.
 
         If the dice are fair (all sides occur with the same probability) and the rolls are
         independent the distribution of ``i`` is uniform.
-        """
-        frame = self._compute_frame(upper)
-        required_num_rolls = frame.required_num_rolls
-        upper_multiple = frame.upper_multiple
 
-        result = None
+        Rolls are appended to a pool (a value uniformly distributed on ``[0, size)``) until
+        a value from the pool is accepted with the required probability. The rolls are the
+        digits of the value in a (mixed) radix system.
+
+        Without ``recycle_entropy`` the pool is emptied before each attempt. Otherwise, if
+        the value is rejected its offset from the rejected range is uniformly distributed on
+        that range, hence it stays in the pool. If it is accepted the quotient ``value //
+        upper`` is independent of the output ``value % upper`` and stays in the pool.
+        """
         num_rejections = 0
-        while result is None:
-            rolls = self._query_for_dice(
-                num_sides=self._num_sides, required_num_rolls=required_num_rolls
+        while True:
+            if not self._recycle_entropy:
+                self._pool_value, self._pool_size = 0, 1
+
+            for num_sides, num_rolls in self._plan(upper).rolls:
+                rolls = self._query_for_dice(num_sides=num_sides, required_num_rolls=num_rolls)
+                assert len(rolls) == num_rolls, f"Require {num_rolls} dice rolls, got {len(rolls)}."
+                value = mixed_radix_to_value([num_sides] * num_rolls, [r - 1 for r in rolls])
+                self._pool_value = self._pool_value * num_sides**num_rolls + value
+                self._pool_size *= num_sides**num_rolls
+
+            upper_multiple = (self._pool_size // upper) * upper
+            if self._pool_value < upper_multiple:
+                result = self._pool_value % upper
+                self._pool_value //= upper
+                self._pool_size //= upper
+                return result
+
+            self._pool_value -= upper_multiple
+            self._pool_size -= upper_multiple
+
+            # To avoid infinite loops (note that rejection probability should be low under
+            # "normal" conditions):
+            num_rejections += 1
+            assert num_rejections < 100, "Absurdly many rejections!"
+            self._query_for_dice.notify_rejection()
+
+    def _plan(self, upper: int) -> DicePlan:
+        """Return the dice to be rolled next (at least one if entropy is not recycled)."""
+        min_num_rolls = 0 if self._recycle_entropy else 1
+
+        if self._dice_bag is not None:
+            return plan_dice_rolls(
+                dice_bag=self._dice_bag,
+                upper=upper,
+                required_success_probability=self._required_success_probability,
+                pool_size=self._pool_size,
+                min_num_rolls=min_num_rolls,
             )
-            result = rolls_to_value(self._num_sides, rolls)
 
-            if result >= upper_multiple:
-                # To avoid infinite loops (note that rejection probability should be low
-                # under "normal" conditions):
-                num_rejections += 1
-                assert num_rejections < 100, "Absurdly many rejections!"
-
-                self._query_for_dice.notify_rejection()
-                result = None
-                continue
-
-            result = result % upper
-
-        return result
+        if not self._recycle_entropy:
+            # The pool is empty, hence the (cached) dice frame applies.
+            frame = compute_dice_frame(
+                num_sides=self._num_sides,
+                upper=upper,
+                required_success_probability=self._required_success_probability,
+            )
+            return DicePlan(
+                rolls=((self._num_sides, frame.required_num_rolls),),
+                upper_dice=self._num_sides**frame.required_num_rolls,
+            )
 
-    def _compute_frame(self, upper: int) -> DiceFrame:
-        return compute_dice_frame(
-            upper=upper,
+        num_rolls, upper_dice = _required_num_rolls(
             num_sides=self._num_sides,
+            upper=upper,
             required_success_probability=self._required_success_probability,
+            pool_size=self._pool_size,
+            min_num_rolls=min_num_rolls,
         )
-
-    def _next_rolls(self, required_num_rolls: int) -> list[int] | None:
-        """Get rolls from user."""
-        return self._query_for_dice(
-            num_sides=self._num_sides, required_num_rolls=required_num_rolls
-        )
+        rolls = ((self._num_sides, num_rolls),) if num_rolls > 0 else ()
+        return DicePlan(rolls=rolls, upper_dice=upper_dice)
 
 
+@functools.lru_cache(maxsize=DICE_FRAME_CACHE_SIZE)
 def compute_dice_frame(
     *, num_sides: int, upper: int, required_success_probability: float
 ) -> DiceFrame:
-    """Return the dice frame."""
-    required_num_rolls = 1
-    upper_dice = num_sides
-    upper_multiple = (upper_dice // upper) * upper
+    """Return the dice frame.
 
-    def success_probability_to_low() -> bool:
-        prob = upper_multiple / upper_dice
-        return prob < required_success_probability
+    The number of rolls is the smallest one such that the rolls can represent ``upper``
+    values and a roll is rejected with a probability of at most
+    ``1 - required_success_probability``. The results are cached.
 
-    while upper_dice < upper or success_probability_to_low():
-        required_num_rolls += 1
-        upper_dice *= num_sides
-        upper_multiple = (upper_dice // upper) * upper
+    Example
+    -------
+    >>> compute_dice_frame(num_sides=6, upper=7776, required_success_probability=0.99)
+    DiceFrame(upper_multiple=7776, required_num_rolls=5)
+    >>> compute_dice_frame(num_sides=6, upper=1000, required_success_probability=0.99)
+    DiceFrame(upper_multiple=279000, required_num_rolls=7)
 
+    """
+    required_num_rolls, upper_dice = _required_num_rolls(
+        num_sides=num_sides,
+        upper=upper,
+        required_success_probability=required_success_probability,
+        min_num_rolls=1,
+    )
     return DiceFrame(
-        upper_multiple=upper_multiple,
+        upper_multiple=(upper_dice // upper) * upper,
         required_num_rolls=required_num_rolls,
     )
+
+
+@functools.lru_cache(maxsize=DICE_FRAME_CACHE_SIZE)
+def plan_dice_rolls(
+    *,
+    dice_bag: tuple[int, ...],
+    upper: int,
+    required_success_probability: float,
+    pool_size: int = 1,
+    min_num_rolls: int = 0,
+) -> DicePlan:
+    """Return which dice to roll to obtain a value below ``upper`` with the fewest rolls.
+
+    Like ``compute_dice_frame`` but for several kinds of dice. The rolls are added to a pool
+    of ``pool_size`` values. Among all combinations of dice for which a value is rejected
+    with a probability of at most ``1 - required_success_probability`` the one with the
+    smallest expected number of rolls (see ``DicePlan.expected_num_rolls``) is chosen. The
+    results are cached.
+
+    The search only visits counts per kind of dice which are large enough for ``upper``.
+    This takes milliseconds for the usual bags (like ``6, 8, 10, 12, 20``) but grows
+    quickly for bags with many kinds of similar size.
+
+    :param dice_bag: The numbers of sides of the kinds of dice (each kind can be rolled
+        arbitrarily often).
+    :param min_num_rolls: Roll at least this many dice.
+
+    Example
+    -------
+    >>> plan = plan_dice_rolls(dice_bag=(6, 20), upper=100, required_success_probability=0.9)
+    >>> plan.rolls, plan.expected_num_rolls(100)
+    (((20, 2),), 2.0)
+    >>> plan_dice_rolls(dice_bag=(6, 20), upper=120, required_success_probability=0.9).rolls
+    ((20, 1), (6, 1))
+
+    """
+    sides = sorted(set(dice_bag), reverse=True)
+    log_sides = [math.log(s) for s in sides]
+    # A little tolerance for floating point errors (the check is exact anyway).
+    log_missing = math.log(upper) - math.log(pool_size) - 1e-9
+
+    best: DicePlan | None = None
+    best_expected_num_rolls = math.inf
+
+    # Since the success probability is at most 1, more rolls than the expected number of
+    # rolls of the best plan cannot be better.
+    num_rolls = max(min_num_rolls, math.ceil(log_missing / log_sides[0]))
+    while num_rolls <= best_expected_num_rolls:
+        for counts in _large_enough_counts(log_sides, num_rolls, log_missing):
+            upper_dice = pool_size * math.prod(s**c for s, c in zip(sides, counts, strict=True))
+            success_probability = (upper_dice // upper) * upper / upper_dice
+            if upper_dice < upper or success_probability < required_success_probability:
+                continue
+
+            expected_num_rolls = num_rolls / success_probability
+            if expected_num_rolls < best_expected_num_rolls:
+                rolls = tuple((s, c) for s, c in zip(sides, counts, strict=True) if c > 0)
+                best = DicePlan(rolls=rolls, upper_dice=upper_dice)
+                best_expected_num_rolls = expected_num_rolls
+
+        num_rolls += 1
+
+    assert best is not None
+    return best
+
+
+def _large_enough_counts(
+    log_sides: Sequence[float], num_rolls: int, log_missing: float
+) -> Iterator[list[int]]:
+    """Yield the counts per kind of dice of ``num_rolls`` rolls with a large enough size.
+
+    These are all counts with ``sum(c * l for c, l in zip(counts, log_sides)) >=
+    log_missing``. The ``log_sides`` must be descending. Branches which cannot reach
+    ``log_missing`` even with the largest remaining dice are pruned, hence only few counts
+    besides the yielded ones are visited (instead of all ``num_rolls ** (kinds - 1)``).
+    """
+    counts = [0] * len(log_sides)
+
+    def search(kind: int, remaining: int, log_size: float) -> Iterator[list[int]]:
+        if log_size + remaining * log_sides[kind] < log_missing:
+            return
+        if kind == len(log_sides) - 1:
+            counts[kind] = remaining
+            yield counts
+            return
+
+        for count in range(remaining, -1, -1):
+            counts[kind] = count
+            log_count_size = log_size + count * log_sides[kind]
+            # Fewer dice of this kind only decrease the size:
+            if log_count_size + (remaining - count) * log_sides[kind + 1] < log_missing:
+                break
+            yield from search(kind + 1, remaining - count, log_count_size)
+
+    return search(0, num_rolls, 0.0)
+
+
+def _required_num_rolls(
+    *,
+    num_sides: int,
+    upper: int,
+    required_success_probability: float,
+    pool_size: int = 1,
+    min_num_rolls: int = 0,
+) -> tuple[int, int]:
+    """Return the number of rolls to add to a pool and the resulting size of the pool.
+
+    This is the smallest number of rolls (but at least ``min_num_rolls``) such that the pool
+    can represent ``upper`` values and a value is rejected with a probability of at most
+    ``1 - required_success_probability``.
+    """
+    # Start with the smallest number of rolls which can represent ``upper`` values. The
+    # floating point estimate is off by at most one roll, which is corrected exactly.
+    num_rolls = min_num_rolls
+    if upper > pool_size:
+        estimate = (math.log(upper) - math.log(pool_size)) / math.log(num_sides)
+        num_rolls = max(min_num_rolls, int(estimate))
+
+    size = pool_size * num_sides**num_rolls
+    while num_rolls > min_num_rolls and size // num_sides >= upper:
+        num_rolls -= 1
+        size //= num_sides
+    while size < upper:
+        num_rolls += 1
+        size *= num_sides
+
+    # A value is rejected with probability ``(size % upper) / size < upper / size``. Hence
+    # only a few more rolls (about ``log(1 / (1 - probability))``) can be required.
+    while (size // upper) * upper / size < required_success_probability:
+        num_rolls += 1
+        size *= num_sides
+
+    return num_rolls, size
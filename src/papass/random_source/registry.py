@@ -1,16 +1,48 @@
+"""The registry of random sources (the values of --randomness-source).
+
+Besides the built-in random sources, other packages can provide random sources (plugins)
+via the entry point group ``papass.random_sources``. The name of an entry point is the name
+of the random source and its object is a subclass of ``RngBase``, e.g. in ``pyproject.toml``:
+
+.. code-block:: toml
+
+    [project.entry-points."papass.random_sources"]
+    trng = "my_package.trng:TrngRng"
+
+The entry points are only looked up if a random source is not built in (or all random
+sources are listed) and a plugin is only imported if it is used. The options of a plugin
+are given via ``--rng-option KEY=VALUE`` (as strings). The plugin declares them in
+``RngBase.cli_options``.
+"""
+
+import functools
+import importlib
 from typing import Any
 
 from .base import RngBase
-from .dice import DiceRng
-from .system import SystemRng
 
-_rng_registry: dict[str, tuple[type[RngBase], dict[str, str]]] = dict(
+_rng_registry: dict[str, tuple[type[RngBase] | str, dict[str, str]]] = {
     # This maps the random_source to two things:
-    # 1. A ctor for an rng.
+    # 1. A ctor for an rng. Either the class itself or `module:class` (imported lazily).
     # 2. A dict mapping the __init__ options of the rng to their corresponding command line options.
-    system=(SystemRng, {}),
-    dice=(DiceRng, {"num_sides": "dice_sides"}),
-)
+    "system": ("papass.random_source.system:SystemRng", {}),
+    "system-buffered": ("papass.random_source.system:BufferedSystemRng", {}),
+    "dice": (
+        "papass.random_source.dice:DiceRng",
+        {
+            "num_sides": "dice_sides",
+            "recycle_entropy": "recycle_entropy",
+            "dice_bag": "dice_bag",
+            "query_for_dice": "query_for_dice",
+        },
+    ),
+}
+
+ENTRY_POINT_GROUP = "papass.random_sources"
+"""The entry point group of random source plugins."""
+
+_interactive_random_sources = ["dice"]
+"""Random sources which require a user (they cannot be used by servers or workers)."""
 
 
 def default_randomness_source() -> str:
@@ -20,8 +52,8 @@ def default_randomness_source() -> str:
 
 
 def available_random_sources() -> list[str]:
-    """Get a list of all valid values for --random-source."""
-    return list(_rng_registry.keys())
+    """Get a list of all valid values for --random-source (including plugins)."""
+    return [*_rng_registry, *_plugin_registry()]
 
 
 def available_randomness_sources_str() -> str:
@@ -29,15 +61,81 @@ def available_randomness_sources_str() -> str:
     return ", ".join(f"'{s}'" for s in available_random_sources())
 
 
+def is_interactive_randomness_source(random_source: str) -> bool:
+    """Return ``True`` if the random source requires user interaction (like dice)."""
+    return random_source in _interactive_random_sources
+
+
 def get_rng(random_source: str, **possible_options: Any) -> RngBase:
     """Get a random number generator of the given source.
 
     The `possible_options` should contain all command line options which are relevant for
     the random_source. It is OK if it contains superfluous options which are not relevant
-    to the rng (those are ignored)
+    to the rng (those are ignored). Missing options take the default of the rng.
+
+    The option ``rng_options`` holds the values of --rng-option (a dict). Only plugins
+    take those (see ``RngBase.cli_options``).
     """
+    rng_options: dict[str, str] = possible_options.get("rng_options") or {}
+
+    if random_source in _rng_registry:
+        assert not rng_options, f"Random source `{random_source}` takes no --rng-option."
+
+        ctor, args = _rng_registry[random_source]
+        RngCls = _resolve(ctor)
+        return RngCls(
+            **{kw: possible_options[o] for kw, o in args.items() if o in possible_options}
+        )
+
+    plugins = _plugin_registry()
     assert (
-        random_source in _rng_registry
+        random_source in plugins
     ), f"Unknown random source `{random_source}`. Use one of {available_randomness_sources_str()}."
-    RngCls, args = _rng_registry[random_source]
-    return RngCls(**{kw: possible_options[o] for kw, o in args.items()})
+    RngCls = _load_plugin(random_source, plugins[random_source])
+
+    unknown = sorted(set(rng_options) - set(RngCls.cli_options.values()))
+    assert not unknown, (
+        f"Unknown --rng-option `{unknown[0]}` for random source `{random_source}`."
+        f" Available: {', '.join(RngCls.cli_options.values()) or 'none'}."
+    )
+    return RngCls(
+        **{kw: rng_options[o] for kw, o in RngCls.cli_options.items() if o in rng_options}
+    )
+
+
+def _resolve(ctor: type[RngBase] | str) -> type[RngBase]:
+    """Import the rng class if it is given as ``module:class``."""
+    if isinstance(ctor, str):
+        module_name, _, class_name = ctor.partition(":")
+        RngCls: type[RngBase] = getattr(importlib.import_module(module_name), class_name)
+        return RngCls
+    return ctor
+
+
+@functools.cache
+def _plugin_registry() -> dict[str, str]:
+    """Map the names of the random source plugins to their rng classes (as ``module:class``).
+
+    Only reads the metadata of the installed packages (the plugins are not imported). A
+    plugin cannot replace a built-in random source.
+    """
+    from importlib.metadata import entry_points
+
+    return {
+        ep.name: ep.value
+        for ep in entry_points(group=ENTRY_POINT_GROUP)
+        if ep.name not in _rng_registry
+    }
+
+
+def _load_plugin(random_source: str, ctor: str) -> type[RngBase]:
+    """Import the rng class of a plugin and check that it is an rng."""
+    try:
+        RngCls = _resolve(ctor)
+    except (ImportError, AttributeError) as error:
+        raise AssertionError(f"Cannot load random source `{random_source}`: {error}") from error
+
+    assert isinstance(RngCls, type) and issubclass(
+        RngCls, RngBase
+    ), f"Random source `{random_source}` (`{ctor}`) is not a subclass of RngBase."
+    return RngCls
@@ -1,7 +1,12 @@
+import os
 import secrets
+from collections.abc import Callable, Iterator
 
 from .base import RngBase
 
+_CHUNK_SIZE = 4096
+"""Maximal number of candidate values drawn from the operating system at once."""
+
 
 class SystemRng(RngBase):
     """Random number generator using the most secure rng of the operating system."""
@@ -12,3 +17,115 @@ class SystemRng(RngBase):
         ``i`` is uniformly distributed.
         """
         return secrets.randbelow(upper)
+
+    def randbelow_many(self, upper: int, count: int) -> Iterator[int]:
+        """Get ``count`` random integers ``i`` with ``0 <= i < upper``.
+
+        The integers are uniformly distributed and independent. In contrast to
+        ``randbelow`` the random bytes are requested from the operating system in large
+        chunks.
+        """
+        return _randbelow_many_from_bytes(
+            upper, count, token_bytes=secrets.token_bytes, max_chunk_size=_CHUNK_SIZE
+        )
+
+
+class BufferedSystemRng(RngBase):
+    """Like ``SystemRng`` but reads random bytes from the operating system in large blocks.
+
+    The bytes are kept in a buffer from which all calls to ``randbelow`` (and
+    ``randbelow_many``) are served. The buffer is refilled on demand. Consumed bytes are
+    overwritten with zeros immediately.
+
+    This reduces the number of system calls considerably if many random numbers are
+    needed (bulk generation).
+    """
+
+    def __init__(self, *, buffer_size: int = 65536):
+        """Create a buffered system rng.
+
+        :param buffer_size: Number of random bytes read from the operating system at once.
+        """
+        assert buffer_size > 0, f"buffer_size must be positive, got {buffer_size}."
+
+        self._buffer_size = buffer_size
+        self._buffer = bytearray()
+        self._position = 0
+        self._pid = os.getpid()
+
+    def randbelow(self, upper: int) -> int:
+        """Get a random integer ``i`` with ``0 <= i < upper``.
+
+        ``i`` is uniformly distributed.
+        """
+        return next(self.randbelow_many(upper, 1))
+
+    def randbelow_many(self, upper: int, count: int) -> Iterator[int]:
+        """Get ``count`` uniformly distributed and independent integers from ``[0, upper)``."""
+        num_bytes = ((upper - 1).bit_length() + 7) // 8 if upper > 0 else 1
+        return _randbelow_many_from_bytes(
+            upper,
+            count,
+            token_bytes=self._take,
+            max_chunk_size=max(1, self._buffer_size // max(1, num_bytes)),
+        )
+
+    def _take(self, num_bytes: int) -> bytes:
+        """Take ``num_bytes`` bytes from the buffer and wipe them in the buffer."""
+        if self._pid != os.getpid():
+            # We are in a forked child. Never reuse the bytes of the parent process.
+            self._wipe(0, len(self._buffer))
+            self._buffer = bytearray()
+            self._position = 0
+            self._pid = os.getpid()
+
+        if num_bytes > len(self._buffer) - self._position:
+            self._refill(num_bytes)
+
+        start, end = self._position, self._position + num_bytes
+        result = bytes(self._buffer[start:end])
+        self._wipe(start, end)
+        self._position = end
+
+        return result
+
+    def _refill(self, min_num_bytes: int) -> None:
+        self._wipe(0, len(self._buffer))
+        self._buffer = bytearray(os.urandom(max(self._buffer_size, min_num_bytes)))
+        self._position = 0
+
+    def _wipe(self, start: int, end: int) -> None:
+        self._buffer[start:end] = bytes(end - start)
+
+
+def _randbelow_many_from_bytes(
+    upper: int, count: int, *, token_bytes: Callable[[int], bytes], max_chunk_size: int
+) -> Iterator[int]:
+    """Get ``count`` random integers from ``[0, upper)`` via rejection sampling.
+
+    The randomness is taken from ``token_bytes(n)`` which must return ``n`` uniformly
+    random bytes. Each call requests bytes for at most ``max_chunk_size`` candidates.
+    """
+    if upper <= 0:
+        raise ValueError("Upper bound must be positive.")
+
+    num_bits = (upper - 1).bit_length()
+    if num_bits == 0:
+        # The only possible value is 0. No randomness required.
+        yield from (0 for _ in range(count))
+        return
+
+    num_bytes = (num_bits + 7) // 8
+    shift = 8 * num_bytes - num_bits
+
+    remaining = count
+    while remaining > 0:
+        # Each candidate is accepted with probability > 1/2.
+        num_candidates = min(remaining, max_chunk_size)
+        chunk = token_bytes(num_bytes * num_candidates)
+
+        for offset in range(0, len(chunk), num_bytes):
+            value = int.from_bytes(chunk[offset : offset + num_bytes], "big") >> shift
+            if value < upper:
+                yield value
+                remaining -= 1
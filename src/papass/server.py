@@ -0,0 +1,222 @@
+"""A long-running server answering passphrase and password requests.
+
+The protocol is line based: Each request is a single line containing a JSON object, each
+response is a single line containing a JSON object. Example (``pp``)::
+
+    {"command": "pp", "length": 4, "wordlist": "eff", "count": 2}
+    {"results": [{"passphrase": "...", "entropy": 51.69, "entropy_is_guaranteed": true}, ...]}
+
+And ``pw``::
+
+    {"command": "pw", "length": 20, "alpha_preset": "letters,digits"}
+    {"results": [{"password": "...", "entropy": 119.08}]}
+
+Clients cannot read arbitrary files: ``wordlist`` is the name of one of the word lists the
+server was configured with (see ``PapassServer``). The optional keys of ``pp`` are
+``delimiter``, ``min_word_size``, ``max_word_size``, ``remove_leading_digits`` and
+``count``. Those of ``pw`` are ``alpha_include``, ``alpha_preset``, ``alpha_exclude`` and
+``count``. They mean the same as the corresponding command line options. If a request
+fails the response is ``{"error": "..."}``.
+"""
+
+import asyncio
+import json
+import threading
+from collections.abc import Mapping
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+from .alphabet import alphabet_from_options
+from .passphrase_generator import PassphraseGenerator
+from .password_generator import PasswordGenerator
+from .random_source import RngBase, get_rng
+from .random_source.registry import is_interactive_randomness_source
+from .wordlist import WordList
+from .wordlist_cache import WordListCache
+
+DEFAULT_MAX_COUNT = 100_000
+"""Default for the maximal number of results per request."""
+
+DEFAULT_MAX_LENGTH = 1000
+"""Default for the maximal length of the results (words or characters)."""
+
+
+class PapassServer:
+    """Answers ``pp`` and ``pw`` requests from many clients.
+
+    Word lists and the random number generator are loaded only once (word lists are
+    reloaded if the file changes).
+    """
+
+    def __init__(
+        self,
+        *,
+        wordlists: Mapping[str, Path | str] | None = None,
+        random_source: str = "system",
+        max_count: int = DEFAULT_MAX_COUNT,
+        max_length: int = DEFAULT_MAX_LENGTH,
+        wordlist_cache: WordListCache | None = None,
+        **rng_options: Any,
+    ):
+        """Create a server.
+
+        :param wordlists: The word list files by name. Requests refer to them by name.
+        :param random_source: Name of the random source (like ``--randomness-source``).
+            Interactive sources like ``dice`` are not supported.
+        :param max_count: Maximal number of results per request.
+        :param max_length: Maximal length of the results (words or characters).
+        :param wordlist_cache: Persistent cache for word lists. ``None`` means *no cache*.
+        :param rng_options: Options for the random source (like ``get_rng``).
+        """
+        assert not is_interactive_randomness_source(
+            random_source
+        ), f"Random source `{random_source}` cannot be used by a server."
+        assert max_count > 0, "max_count must be positive."
+        assert max_length > 0, "max_length must be positive."
+
+        self._rng: RngBase = get_rng(random_source, **rng_options)
+        self._max_count = max_count
+        self._max_length = max_length
+        self._wordlist_cache = wordlist_cache
+        self._wordlist_files = {name: Path(path) for name, path in (wordlists or {}).items()}
+        self._wordlists: dict[tuple[Any, ...], WordList] = {}
+
+        # The rng might be stateful and requests are handled in worker threads:
+        self._lock = threading.Lock()
+
+        # Fail early if a word list cannot be loaded (with the defaults of ``pp`` requests):
+        for name, file_path in self._wordlist_files.items():
+            assert file_path.is_file(), f"Wordfile of `{name}` does not exist: {file_path}"
+            self._wordlist(name, min_word_size=1, max_word_size=None, remove_leading_digits=False)
+
+    def handle_request(self, request: Any) -> dict[str, Any]:
+        """Handle a single (decoded) request and return the (not yet encoded) response."""
+        try:
+            assert isinstance(request, dict), "Request must be a JSON object."
+            command = request.get("command")
+
+            if command == "pp":
+                return {"results": self._passphrases(**_without_command(request))}
+            elif command == "pw":
+                return {"results": self._passwords(**_without_command(request))}
+
+            raise AssertionError(f"Unknown command `{command}`. Use `pp` or `pw`.")
+        except (AssertionError, OSError, TypeError, ValueError) as error:
+            return {"error": str(error)}
+
+    def handle_line(self, line: bytes) -> bytes:
+        """Handle a single request line and return the response line."""
+        try:
+            request = json.loads(line)
+        except ValueError as error:
+            response: dict[str, Any] = {"error": f"Invalid JSON: {error}"}
+        else:
+            response = self.handle_request(request)
+
+        return json.dumps(response).encode() + b"\n"
+
+    async def serve_unix(self, path: Path | str) -> None:
+        """Serve on a Unix domain socket forever."""
+        server = await asyncio.start_unix_server(self._handle_connection, path=str(path))
+        async with server:
+            await server.serve_forever()
+
+    async def serve_tcp(self, port: int, host: str = "127.0.0.1") -> None:
+        """Serve on a TCP port forever (on localhost by default)."""
+        server = await asyncio.start_server(self._handle_connection, host=host, port=port)
+        async with server:
+            await server.serve_forever()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                # Large requests must not block the other clients:
+                response = await loop.run_in_executor(None, self.handle_line, line)
+                writer.write(response)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def _passphrases(
+        self,
+        *,
+        length: int,
+        wordlist: str,
+        delimiter: str = " ",
+        min_word_size: int = 1,
+        max_word_size: int | None = None,
+        remove_leading_digits: bool = False,
+        count: int = 1,
+    ) -> list[dict[str, Any]]:
+        self._check_length(length)
+        self._check_count(count)
+        words = self._wordlist(
+            wordlist,
+            min_word_size=min_word_size,
+            max_word_size=max_word_size,
+            remove_leading_digits=remove_leading_digits,
+        )
+        generator = PassphraseGenerator(wordlist=words, rng=self._rng, delimiter=delimiter)
+
+        with self._lock:
+            return [asdict(r) for r in generator.generate_many(length, count)]
+
+    def _passwords(
+        self,
+        *,
+        length: int,
+        alpha_include: str | None = None,
+        alpha_preset: str | None = None,
+        alpha_exclude: str | None = None,
+        count: int = 1,
+    ) -> list[dict[str, Any]]:
+        self._check_length(length)
+        self._check_count(count)
+        alphabet = alphabet_from_options(
+            include=alpha_include, preset=alpha_preset, exclude=alpha_exclude
+        )
+        generator = PasswordGenerator(alphabet=alphabet, rng=self._rng)
+
+        with self._lock:
+            return [asdict(r) for r in generator.generate_many(length, count)]
+
+    def _wordlist(self, name: str, **options: Any) -> WordList:
+        assert (
+            name in self._wordlist_files
+        ), f"Unknown wordlist `{name}`. Use one of: {', '.join(sorted(self._wordlist_files))}."
+        file_path = self._wordlist_files[name]
+
+        stat = file_path.stat()
+        key = (str(file_path.resolve()), stat.st_mtime_ns, stat.st_size, *options.items())
+
+        with self._lock:
+            if key not in self._wordlists:
+                load = (
+                    self._wordlist_cache.from_file if self._wordlist_cache else WordList.from_file
+                )
+                # Forget outdated versions of the file:
+                self._wordlists = {
+                    k: w for k, w in self._wordlists.items() if k[0] != key[0] or k[1:3] == key[1:3]
+                }
+                self._wordlists[key] = load(file_path, **options)
+            return self._wordlists[key]
+
+    def _check_length(self, length: int) -> None:
+        assert isinstance(length, int), "length must be an integer."
+        assert 0 <= length <= self._max_length, f"length must be between 0 and {self._max_length}."
+
+    def _check_count(self, count: int) -> None:
+        assert isinstance(count, int), "count must be an integer."
+        assert 0 <= count <= self._max_count, f"count must be between 0 and {self._max_count}."
+
+
+def _without_command(request: dict[str, Any]) -> dict[str, Any]:
+    return {k: v for k, v in request.items() if k != "command"}
@@ -1,8 +1,9 @@
+import importlib
+from collections import deque
 from collections.abc import Iterable, Iterator, Sequence
-from functools import reduce
-from typing import Generic, NoReturn, TypeVar, overload
-
-import click
+from functools import cache, reduce
+from itertools import islice
+from typing import IO, Any, Generic, NoReturn, TypeVar, overload
 
 
 def digits_to_value(base: int, digits: Iterable[int]) -> int:
@@ -19,6 +20,26 @@ def digits_to_value(base: int, digits: Iterable[int]) -> int:
     return reduce(lambda acc, r: base * acc + r, digits, 0)
 
 
+def mixed_radix_to_value(bases: Iterable[int], digits: Iterable[int]) -> int:
+    """Compute the integer with the given digits in a mixed radix system.
+
+    The ``i``-th digit is from ``[0, bases[i])``. The first digit is the most significant
+    one (like in ``digits_to_value``).
+
+    Example:
+    -------
+    >>> mixed_radix_to_value([10, 6, 20], [1, 2, 3])  # (1 * 6 + 2) * 20 + 3
+    163
+
+    """
+    value = 0
+    for base, digit in zip(bases, digits, strict=True):
+        assert base > 1
+        assert 0 <= digit < base
+        value = base * value + digit
+    return value
+
+
 def rolls_to_value(num_sides: int, rolls: Iterable[int]) -> int:
     """Compute the integer corresponding to the given dice rolls.
 
@@ -58,9 +79,74 @@ def value_to_digits(value: int, *, base: int, length: int | None = None) -> list
     return result
 
 
+@cache
+def import_numpy() -> Any | None:
+    """Return the ``numpy`` module or ``None`` if it is not installed.
+
+    NumPy is an optional dependency used to speed up bulk operations.
+    """
+    try:
+        return importlib.import_module("numpy")
+    except ImportError:
+        return None
+
+
+def bytes_to_digits_numpy(np: Any, data: bytes, *, num_bytes: int, base: int, length: int) -> Any:
+    """Decode many integers from raw bytes into their digits in one vectorized step.
+
+    The ``data`` is a concatenation of big-endian integers with ``num_bytes`` bytes each.
+
+    :param np: The ``numpy`` module.
+    :return: An integer array of shape ``(num_values, length)``. Row ``i`` contains the
+        digits of the ``i``-th integer like ``value_to_digits`` would return them.
+    """
+    assert 1 < base < 2**32, "Base must fit into 32 bits."
+    assert num_bytes > 0 and len(data) % num_bytes == 0
+
+    # Represent each integer by big-endian 32-bit words (zero-padded on the left):
+    num_words = (num_bytes + 3) // 4
+    padding = 4 * num_words - num_bytes
+    raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, num_bytes)
+    padded = np.zeros((raw.shape[0], 4 * num_words), dtype=np.uint8)
+    padded[:, padding:] = raw
+    words = padded.view(">u4").astype(np.uint64)
+
+    digits = np.empty((raw.shape[0], length), dtype=np.intp)
+    for position in range(length - 1, -1, -1):
+        # Schoolbook long division of all integers by base (word by word). Since
+        # carry < base < 2**32 the intermediate values fit into 64 bits.
+        carry = np.zeros(raw.shape[0], dtype=np.uint64)
+        for column in range(num_words):
+            current = (carry << np.uint64(32)) | words[:, column]
+            words[:, column] = current // np.uint64(base)
+            carry = current % np.uint64(base)
+        digits[:, position] = carry
+
+    assert not words.any(), "Some values have more digits than length."
+    return digits
+
+
+def _echo(message: str) -> None:
+    """Like ``click.echo`` but do not import ``click`` before it is needed.
+
+    Importing ``click`` is comparatively slow and the library does not need it otherwise.
+    """
+    import click
+
+    click.echo(message)
+
+
 class QueryUserForDice:
     """Asks the user to roll some dice."""
 
+    def __init__(self, *, show_sides: bool = False):
+        """Create the query.
+
+        :param show_sides: Name the kind of dice in the prompt (like ``Roll 3 d20:``). Use
+            this if dice with different numbers of sides are involved.
+        """
+        self._show_sides = show_sides
+
     def __call__(self, *, num_sides: int, required_num_rolls: int) -> list[int]:
         """Ask user for desired number of dice rolls.
 
@@ -70,10 +156,12 @@ class QueryUserForDice:
         while len(rolls) < required_num_rolls:
             remaining_num_rolls = required_num_rolls - len(rolls)
 
+            dice = f"d{num_sides}" if self._show_sides else "dice"
+
             if not rolls:
-                user_input = input(f"Roll {remaining_num_rolls} dice: ")
+                user_input = input(f"Roll {remaining_num_rolls} {dice}: ")
             else:
-                user_input = input(f"Roll remaining {remaining_num_rolls} dice: ")
+                user_input = input(f"Roll remaining {remaining_num_rolls} {dice}: ")
 
             rolls += self._parse_input(
                 user_input, num_sides=num_sides, required_num_rolls=required_num_rolls
@@ -86,7 +174,7 @@ class QueryUserForDice:
 
         Does nothing else.
         """
-        click.echo("Rejected. Please try again.")
+        _echo("Rejected. Please try again.")
 
     @staticmethod
     def _parse_input(user_input: str, *, num_sides: int, required_num_rolls: int) -> list[int]:
@@ -113,18 +201,132 @@ class QueryUserForDice:
         try:
             rolls = [int(r) for r in user_input.split()]
         except ValueError:
-            click.echo("Invalid. Require a space-separated list of integers (like: 1 3 2).")
+            _echo("Invalid. Require a space-separated list of integers (like: 1 3 2).")
             return []
 
         if not all(1 <= r <= num_sides for r in rolls):
-            click.echo(f"Some rolls are not between 1 and {num_sides}.")
+            _echo(f"Some rolls are not between 1 and {num_sides}.")
             return []
 
         return rolls
 
 
+MAX_DICE_LINE_LENGTH = 65536
+"""Maximal length of a line read by ``FileDiceSource``."""
+
+
+class FileDiceSource:
+    r"""Reads dice rolls from a file, a pipe or a FIFO (instead of asking the user).
+
+    The rolls are integers separated by whitespace. Anything after a ``#`` is a comment.
+    Each query takes exactly the requested number of rolls, the rest of a line is kept for
+    the next query. Lines are only read when needed, hence one transcript of rolls can be
+    used for many passphrases and a pipe is not read further than necessary.
+
+    Since the input cannot be corrected, invalid rolls raise an ``AssertionError``.
+
+    Example
+    -------
+    >>> import io
+    >>> source = FileDiceSource(io.StringIO("1 2 3  # first row\n4 5\n"))
+    >>> source(num_sides=6, required_num_rolls=4)
+    [1, 2, 3, 4]
+    >>> source.num_consumed, source.count_unused()
+    (4, 1)
+
+    """
+
+    def __init__(self, stream: IO[str], *, max_line_length: int = MAX_DICE_LINE_LENGTH):
+        """Create the source.
+
+        :param stream: The text stream to read the rolls from.
+        :param max_line_length: Longer lines are rejected (instead of reading an arbitrary
+            amount of data at once).
+        """
+        assert max_line_length > 0, "max_line_length must be positive."
+
+        self._stream = stream
+        self._max_line_length = max_line_length
+        self._line_number = 0
+        self._pending: deque[tuple[int, str]] = deque()  # (line number, roll)
+
+        self.num_consumed = 0
+        """The number of rolls taken so far."""
+
+    def __call__(self, *, num_sides: int, required_num_rolls: int) -> list[int]:
+        """Take the next ``required_num_rolls`` rolls."""
+        rolls: list[int] = []
+        while len(rolls) < required_num_rolls:
+            while not self._pending:
+                if not self._read_line():
+                    raise AssertionError(
+                        f"Not enough dice rolls: The input ended after {self.num_consumed} rolls."
+                    )
+
+            line_number, roll = self._pending.popleft()
+            assert roll.isdecimal() and 1 <= int(roll) <= num_sides, (
+                f"Invalid dice roll `{roll}` in line {line_number}. Require an integer"
+                f" between 1 and {num_sides}."
+            )
+            rolls.append(int(roll))
+            self.num_consumed += 1
+
+        return rolls
+
+    def notify_rejection(self) -> None:
+        """Do nothing (the next rolls are simply read from the input)."""
+
+    def count_unused(self) -> int:
+        """Read the remaining input and return the number of rolls which were not taken.
+
+        Use this to detect a transcript which is longer than expected.
+        """
+        while self._read_line():
+            pass
+
+        num_unused = len(self._pending)
+        self._pending.clear()
+        return num_unused
+
+    def _read_line(self) -> bool:
+        """Queue the rolls of the next line. Return ``False`` at the end of the input."""
+        line = self._stream.readline(self._max_line_length + 1)
+        if not line:
+            return False
+
+        self._line_number += 1
+        assert len(line) <= self._max_line_length or line.endswith("\n"), (
+            f"Line {self._line_number} of the dice rolls is longer than"
+            f" {self._max_line_length} characters."
+        )
+
+        rolls = line.partition("#")[0].split()
+        self._pending.extend((self._line_number, roll) for roll in rolls)
+        return True
+
+
 T = TypeVar("T")
 
+NUMPY_MIN_BATCH_SIZE = 64
+"""Below this number of indices ``PowerSequence.get_many`` does not bother to use NumPy."""
+
+
+def batched(iterable: Iterable[T], size: int) -> Iterator[list[T]]:
+    """Split an iterable into lists of ``size`` items (the last one might be shorter).
+
+    Like ``itertools.batched`` which is not available before Python 3.12.
+
+    Example:
+    -------
+    >>> list(batched(range(5), 2))
+    [[0, 1], [2, 3], [4]]
+
+    """
+    assert size > 0
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
 
 class PowerSequence(Generic[T]):
     """A sequence representing a cartesian power product.
@@ -153,6 +355,7 @@ class PowerSequence(Generic[T]):
         self._sequence = sequence
         self._power = power
         self._base_length = len(sequence)
+        self._size: int = self._base_length**power
 
     @property
     def size(self) -> int:
@@ -160,8 +363,7 @@ class PowerSequence(Generic[T]):
 
         NOTE: This replaces __len__. See class docstring for the reason.
         """
-        result: int = self._base_length**self._power
-        return result
+        return self._size
 
     def __bool__(self) -> bool:
         """Return ``True`` iff the sequence is non-empty."""
@@ -179,12 +381,51 @@ class PowerSequence(Generic[T]):
         if isinstance(index, slice):
             raise NotImplementedError("Indexing by slices not supported.")
 
-        if index < 0 or index >= self.size:
+        if index < 0 or index >= self._size:
             raise IndexError("Index out of range")
 
         indices = value_to_digits(index, base=self._base_length, length=self._power)
         return tuple(self._sequence[i] for i in indices)
 
+    def get_many(self, indices: Sequence[int], *, use_numpy: bool = True) -> list[tuple[T, ...]]:
+        """Get the items at all the given indices.
+
+        This is equivalent to ``[self[i] for i in indices]`` but faster for many indices if
+        NumPy is installed: All indices are decoded into a 2-D array of digits in one
+        vectorized step. Only the items of these digits are looked up (the base sequence
+        might be huge or lazy, like a memory-mapped word list). Without NumPy (or for few
+        indices) it falls back to pure Python.
+
+        :param use_numpy: Set to ``False`` to force the pure Python implementation.
+
+        Example:
+        -------
+        >>> ps = PowerSequence("abc", 3)
+        >>> ps.get_many([0, 5, 26])
+        [('a', 'a', 'a'), ('a', 'b', 'c'), ('c', 'c', 'c')]
+
+        """
+        if not indices:
+            return []
+
+        if min(indices) < 0 or max(indices) >= self._size:
+            raise IndexError("Index out of range")
+
+        np = import_numpy() if use_numpy and len(indices) >= NUMPY_MIN_BATCH_SIZE else None
+        if np is None or not 1 < self._base_length < 2**32 or self._power == 0:
+            return [self[i] for i in indices]
+
+        num_bytes = ((self._size - 1).bit_length() + 7) // 8
+        data = b"".join(i.to_bytes(num_bytes, "big") for i in indices)
+        digits = bytes_to_digits_numpy(
+            np, data, num_bytes=num_bytes, base=self._base_length, length=self._power
+        )
+
+        sequence = self._sequence
+        items = iter([sequence[d] for d in digits.ravel().tolist()])
+        # Regroup the flat items into tuples of ``power`` items (one per index):
+        return list(zip(*[items] * self._power, strict=True))
+
     def __iter__(self) -> Iterator[tuple[T, ...]]:
         """Iterate over the entire power sequence."""
         for i in range(self.size):
@@ -1,10 +1,17 @@
+import bisect
+import heapq
+import itertools
 import math
 import re
-from collections.abc import Iterable, Sequence
+from collections.abc import Iterable, Iterator, Sequence
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, overload
 
+from .binary_wordlist import MappedWords, is_binary_wordlist_file, write_binary_wordlist
+from .compact_words import FrontCodedWords
+from .length_index import LengthFilteredWords, LengthIndex
+
 
 @dataclass
 class FrequencyEntry:
@@ -21,12 +28,8 @@ class FrequencyEntry:
 
         The line number is only required for error messages.
         """
-        assert cls.pattern.match(
-            line
-        ), f"Line {line_number} `{line}` does not match pattern {cls.pattern}."
-        entries = line.split("\t")
-
-        return FrequencyEntry(word=entries[1], frequency=int(entries[2]))
+        word, frequency = _parse_frequency_line(line, line_number)
+        return FrequencyEntry(word=word, frequency=frequency)
 
 
 class WordList(Sequence[str]):
@@ -65,16 +68,14 @@ class WordList(Sequence[str]):
         if remove_leading_digits:
             words = _remove_leading_digits(words)
 
-        words = sorted(set(words))
-        self._words: list[str] = words
+        self._words: Sequence[str] = sorted(set(words))
+        self._characters: frozenset[str] | None = None
+        self._uniquely_decodable: dict[str, bool] = {}
+        self._length_index: LengthIndex | None = None
 
-        assert min_word_size > 0, "--min-word-size must be at least 1."
-        assert (
-            max_word_size is None or max_word_size >= min_word_size
-        ), "--max-word-size must be greater or equal to --min-word-size"
+        _check_word_size_options(min_word_size, max_word_size)
 
-        self._filter_min_word_size(min_word_size)
-        self._filter_max_word_size(max_word_size)
+        self._filter_word_sizes(min_word_size, max_word_size)
 
     @overload
     def __getitem__(self, index: int) -> str: ...
@@ -85,8 +86,12 @@ class WordList(Sequence[str]):
         """Get a word at an index or a new word list from a slice."""
         if isinstance(index, int):
             return self._words[index]
-        else:
-            return WordList(self._words[index])
+
+        words = self._words[index]
+        if index.step is not None and index.step < 0:
+            words = words[::-1]
+        # The words of a slice are sorted and unique already.
+        return WordList._from_sorted(words)
 
     def __len__(self) -> int:
         """Return the number of words."""
@@ -96,7 +101,9 @@ class WordList(Sequence[str]):
         """Two word lists are equal if they contain the same words."""
         if not isinstance(other, WordList):
             return False
-        return self._words == other._words
+        if isinstance(self._words, list) and isinstance(other._words, list):
+            return self._words == other._words
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other, strict=True))
 
     @overload
     def __add__(self, other: "WordList") -> "WordList": ...
@@ -110,34 +117,213 @@ class WordList(Sequence[str]):
         to a word list first.
         """
         if isinstance(other, WordList):
-            return WordList(self._words + other._words)
+            return WordList.union(self, other)
         elif isinstance(other, list):
-            return WordList(self._words + other)
+            return WordList.union(self, WordList(other))
         raise ValueError(f"Unsupported type {type(other)}")
 
+    @staticmethod
+    def union(*wordlists: "WordList") -> "WordList":
+        """Combine word lists to a new word list made of the union of their words.
+
+        Since all word lists are sorted already they are merged in a single pass (without
+        sorting again).
+
+        Example
+        -------
+        >>> WordList.union(WordList(["b", "d"]), WordList(["a", "d"]), WordList(["c"]))
+        WordList(['a', 'b', 'c', 'd'])
+
+        """
+        merged = heapq.merge(*(wordlist._words for wordlist in wordlists))
+        return WordList._from_sorted([word for word, _ in itertools.groupby(merged)])
+
     def __repr__(self) -> str:
         """Exact representation of wordlist."""
-        return f"{WordList.__name__}({self._words})"
+        return f"{WordList.__name__}({list(self._words)})"
+
+    @property
+    def characters(self) -> frozenset[str]:
+        """All characters occurring in the words.
+
+        Computed once (on first access) or read from the binary format. Hence checks like
+        ``delimiter in wordlist.characters`` are cheap.
+
+        Example
+        -------
+        >>> sorted(WordList(["foo", "bar"]).characters)
+        ['a', 'b', 'f', 'o', 'r']
+
+        """
+        if self._characters is None:
+            self._characters = frozenset().union(*self._words)
+        return self._characters
+
+    def count_prefix(self, prefix: str) -> int:
+        """Return the number of words starting with ``prefix`` (in logarithmic time).
+
+        Example
+        -------
+        >>> WordList(["bar", "foo", "foobar", "fox"]).count_prefix("foo")
+        2
+
+        """
+        lo, hi = self._prefix_range(prefix)
+        return hi - lo
+
+    def with_prefix(self, prefix: str) -> "WordList":
+        """Return the word list of all words starting with ``prefix``.
+
+        Example
+        -------
+        >>> WordList(["bar", "foo", "foobar", "fox"]).with_prefix("fo")
+        WordList(['foo', 'foobar', 'fox'])
+
+        """
+        lo, hi = self._prefix_range(prefix)
+        return WordList._from_sorted(self._words[lo:hi])
+
+    def compact(self) -> "WordList":
+        """Return an equal word list whose words are stored compactly.
+
+        Words sharing prefixes with their predecessors (as usual for large dictionaries)
+        take much less memory. In exchange accessing a word by index takes a little longer.
+        See ``papass.compact_words``.
+
+        Example
+        -------
+        >>> wordlist = WordList(["house", "houseboat", "household"])
+        >>> wordlist.compact() == wordlist
+        True
+
+        """
+        wordlist = WordList._from_sorted(FrontCodedWords(self._words))
+        wordlist._characters = self._characters
+        wordlist._uniquely_decodable = self._uniquely_decodable
+        return wordlist
+
+    def is_uniquely_decodable(self, delimiter: str = "") -> bool:
+        """Return ``True`` if passphrases (joined by ``delimiter``) can be split uniquely.
+
+        I.e. no two different word sequences result in the same passphrase. The result is
+        computed once per delimiter (see ``papass.analysis.is_uniquely_decodable``).
+
+        Example
+        -------
+        >>> WordList(["foo", "bar", "foobar", "barfoo"]).is_uniquely_decodable()
+        False
+        >>> WordList(["foo", "bar", "foobar", "barfoo"]).is_uniquely_decodable("-")
+        True
+
+        """
+        if delimiter not in self._uniquely_decodable:
+            from .analysis import is_uniquely_decodable
+
+            self._uniquely_decodable[delimiter] = is_uniquely_decodable(self._words, delimiter)
+        return self._uniquely_decodable[delimiter]
+
+    def prefix_free(self) -> "WordList":
+        """Return the largest prefix-free word list contained in this one.
+
+        I.e. all words which are a prefix of another word are removed. Then passphrases
+        can be split into words uniquely even without delimiter (and no larger subset of
+        the words has this property, since each removed word is replaced by at least one
+        of the words it is a prefix of).
+
+        Example
+        -------
+        >>> WordList(["foo", "bar", "foobar", "barfoo"]).prefix_free()
+        WordList(['barfoo', 'foobar'])
+
+        """
+        # In sorted order a word is a prefix of another word iff it is a prefix of the next.
+        words = [a for a, b in itertools.pairwise(self._words) if not b.startswith(a)]
+        if len(self._words) > 0:
+            words.append(self._words[-1])
+
+        return WordList._from_sorted(words)
 
     def to_file(self, file_path: Path | str) -> None:
         """Write this wordlist to a file (overwrites if file exists)."""
         with open(file_path, mode="w") as fout:
             fout.write("\n".join(self))
 
+    def to_binary_file(self, file_path: Path | str) -> None:
+        """Write this wordlist to a file in the binary format (overwrites if file exists).
+
+        Such a file can be opened via ``from_file`` or ``from_binary_file`` much faster
+        than a text file since it is memory-mapped and not parsed at all. Whether the
+        words are uniquely decodable without delimiter is computed once here and stored in
+        the file.
+        """
+        write_binary_wordlist(
+            self._words,
+            file_path,
+            characters=self.characters,
+            uniquely_decodable=self.is_uniquely_decodable(""),
+        )
+
     @staticmethod
     def from_file(file_path: Path | str, **options: Any) -> "WordList":
         """Create a wordlist from a file of words (newline separated).
 
-        The ``options`` are the same as those for ``__init__``.
+        The ``options`` are the same as those for ``__init__``. Files in the binary format
+        (see ``to_binary_file``) are detected and opened via ``from_binary_file``.
         """
         if isinstance(file_path, str):
             file_path = Path(file_path)
         assert file_path.exists(), f"Wordfile does not exist: {file_path}"
 
+        if is_binary_wordlist_file(file_path):
+            return WordList.from_binary_file(file_path, **options)
+
         with open(file_path) as fin:
             words = [w.strip("\n") for w in fin.readlines()]
             return WordList(words, **options)
 
+    @staticmethod
+    def from_binary_file(
+        file_path: Path | str,
+        *,
+        min_word_size: int = 1,
+        max_word_size: int | None = None,
+        remove_leading_digits: bool = False,
+    ) -> "WordList":
+        """Open a wordlist file in the binary format (see ``to_binary_file``).
+
+        The file is memory-mapped. Words are only read from it on access. Unless the
+        options actually remove words, no copy of the words is made.
+
+        The options are the same as those for ``__init__``.
+        """
+        if isinstance(file_path, str):
+            file_path = Path(file_path)
+        assert file_path.exists(), f"Wordfile does not exist: {file_path}"
+
+        _check_word_size_options(min_word_size, max_word_size)
+        words = MappedWords(file_path)
+
+        if remove_leading_digits:
+            return WordList(
+                words,
+                min_word_size=min_word_size,
+                max_word_size=max_word_size,
+                remove_leading_digits=remove_leading_digits,
+            )
+
+        wordlist = WordList._from_sorted(words)
+        wordlist._characters = words.characters
+        if words.uniquely_decodable is not None:
+            wordlist._uniquely_decodable[""] = words.uniquely_decodable
+
+        # The header tells whether filtering can remove words at all (without indexing).
+        if min_word_size > words.min_word_size or (
+            max_word_size is not None and max_word_size < words.max_word_size
+        ):
+            wordlist._filter_word_sizes(min_word_size, max_word_size)
+
+        return wordlist
+
     @staticmethod
     def from_frequency_file(
         file_path: Path | str,
@@ -172,27 +358,87 @@ class WordList(Sequence[str]):
         assert file_path.exists(), f"Frequency file does not exist: {file_path}"
 
         with open(file_path) as fin:
-            lines = [w.strip("\n") for w in fin.readlines()]
+            # The file is streamed. Only the words passing the filter are kept in memory.
+            words = _iter_frequency_file(
+                fin, min_frequency=min_frequency, max_frequency=max_frequency
+            )
+            return WordList(words, **options)
 
-        max_frequency_or_inf = max_frequency if max_frequency is not None else math.inf
+    @staticmethod
+    def _from_sorted(words: Sequence[str]) -> "WordList":
+        """Create a wordlist from words which are already sorted and unique (no copy)."""
+        wordlist = WordList()
+        wordlist._words = words
+        wordlist._length_index = None
+        return wordlist
+
+    def _prefix_range(self, prefix: str) -> tuple[int, int]:
+        """Return ``lo, hi`` such that ``words[lo:hi]`` are the words starting with ``prefix``."""
+        lo = bisect.bisect_left(self._words, prefix)
+        # After ``lo`` all words starting with ``prefix`` come first.
+        hi = bisect.bisect_left(
+            self._words, True, lo=lo, key=lambda word: not word.startswith(prefix)
+        )
+        return lo, hi
+
+    def _filter_word_sizes(self, min_word_size: int, max_word_size: int | None) -> None:
+        """Keep only the words of length in ``[min_word_size, max_word_size]``.
+
+        The words are not copied. Instead a view (sharing the words and their length index
+        with other views) is used. If no word is removed nothing changes.
+        """
+        if isinstance(self._words, LengthFilteredWords):
+            words = self._words.filtered(min_word_size, max_word_size)
+        else:
+            if self._length_index is None:
+                self._length_index = LengthIndex(self._words)
+            words = LengthFilteredWords(
+                self._words, self._length_index, min_word_size, max_word_size
+            )
+
+        if len(words) != len(self._words):
+            self._set_filtered(words)
+
+    def _set_filtered(self, words: Sequence[str]) -> None:
+        self._words = words
+        self._characters = None  # Some characters might be gone.
+        # Fewer words cannot make a uniquely decodable word list ambiguous:
+        self._uniquely_decodable = {d: True for d, ud in self._uniquely_decodable.items() if ud}
 
-        def filter_fn(entry: FrequencyEntry) -> bool:
-            return min_frequency <= entry.frequency <= max_frequency_or_inf
 
-        entries = [FrequencyEntry.from_line(w, i) for i, w in enumerate(lines)]
-        entries = [e for e in entries if filter_fn(e)]
+def _check_word_size_options(min_word_size: int, max_word_size: int | None) -> None:
+    assert min_word_size > 0, "--min-word-size must be at least 1."
+    assert (
+        max_word_size is None or max_word_size >= min_word_size
+    ), "--max-word-size must be greater or equal to --min-word-size"
 
-        return WordList([e.word for e in entries], **options)
 
-    def _filter_min_word_size(self, min_word_size: int) -> None:
-        self._words = [w for w in self._words if len(w) >= min_word_size]
+def _iter_frequency_file(
+    lines: Iterable[str], *, min_frequency: int, max_frequency: int | None
+) -> Iterator[str]:
+    """Yield the words of a frequency file whose frequency is in the given range."""
+    max_frequency_or_inf = max_frequency if max_frequency is not None else math.inf
 
-    def _filter_max_word_size(self, max_word_size: int | None) -> None:
-        if max_word_size is None:
-            return
+    for line_number, line in enumerate(lines):
+        word, frequency = _parse_frequency_line(line.strip("\n"), line_number)
+        if min_frequency <= frequency <= max_frequency_or_inf:
+            yield word
+
+
+def _parse_frequency_line(line: str, line_number: int) -> tuple[str, int]:
+    """Parse a line of a frequency file into word and frequency.
+
+    Equivalent to matching ``FrequencyEntry.pattern`` and splitting at the tabs, but
+    faster.
+    """
+    entries = line.split("\t")
+    assert (
+        len(entries) == 3 and entries[0].isdecimal() and entries[1] and entries[2].isdecimal()
+    ), f"Line {line_number} `{line}` does not match pattern {FrequencyEntry.pattern}."
 
-        self._words = [w for w in self._words if len(w) <= max_word_size]
+    return entries[1], int(entries[2])
 
 
-def _remove_leading_digits(words: Iterable[str]) -> list[str]:
-    return [re.sub(r"\d+\s+", "", w) for w in words]
+def _remove_leading_digits(words: Iterable[str]) -> Iterator[str]:
+    pattern = re.compile(r"\d+\s+")
+    return (pattern.sub("", w) for w in words)
@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from .binary_wordlist import VERSION, is_binary_wordlist_file
+from .wordlist import WordList
+
+DEFAULT_MAX_SIZE = 256 * 2**20
+"""Default for the maximal total size (in bytes) of all entries in the cache."""
+
+_ENTRY_SUFFIX = ".ppwl"
+
+
+def default_cache_directory() -> Path:
+    """Return ``$XDG_CACHE_HOME/papass`` (defaults to ``~/.cache/papass``)."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "papass"
+
+
+class WordListCache:
+    """A persistent on-disk cache of word lists read from files.
+
+    The cache stores the finished (filtered, sorted and deduplicated) word lists in the
+    binary format. Hence repeated loading of the same file with the same options skips
+    parsing entirely. Entries are keyed by the file's path, modification time, size and
+    content hash plus the options.
+
+    If the total size of all entries exceeds ``max_size`` the least recently used entries
+    are removed.
+
+    Example
+    -------
+    >>> cache = WordListCache("/tmp/papass-doctest-cache")
+    >>> WordList(["foo", "bar"]).to_file("/tmp/papass-doctest-wordlist.txt")
+    >>> cache.from_file("/tmp/papass-doctest-wordlist.txt", min_word_size=1)
+    WordList(['bar', 'foo'])
+
+    """
+
+    def __init__(self, directory: Path | str | None = None, *, max_size: int = DEFAULT_MAX_SIZE):
+        """Create a cache (the directory is created lazily).
+
+        :param directory: Where to store the entries. ``None`` means
+            ``default_cache_directory()``.
+        :param max_size: Maximal total size (in bytes) of all entries.
+        """
+        self._directory = Path(directory) if directory is not None else default_cache_directory()
+        self._max_size = max_size
+
+    def from_file(self, file_path: Path | str, **options: Any) -> WordList:
+        """Like ``WordList.from_file`` but use the cache.
+
+        If the cache cannot be written (e.g. due to missing permissions) the word list is
+        still returned.
+        """
+        file_path = Path(file_path)
+        assert file_path.exists(), f"Wordfile does not exist: {file_path}"
+
+        if is_binary_wordlist_file(file_path):
+            # Nothing to gain from caching.
+            return WordList.from_file(file_path, **options)
+
+        entry = self._directory / f"{self._key(file_path, options)}{_ENTRY_SUFFIX}"
+
+        if entry.exists():
+            try:
+                wordlist = WordList.from_binary_file(entry)
+                os.utime(entry)  # Mark as recently used.
+                return wordlist
+            except (AssertionError, OSError, ValueError):
+                # Damaged or vanished entry. Just recreate it.
+                pass
+
+        wordlist = WordList.from_file(file_path, **options)
+
+        try:
+            self._store(entry, wordlist)
+            self._evict(keep=entry)
+        except OSError:
+            pass
+
+        return wordlist
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        for entry in self._entries():
+            entry.unlink(missing_ok=True)
+
+    def _key(self, file_path: Path, options: dict[str, Any]) -> str:
+        stat = file_path.stat()
+
+        content_hash = hashlib.blake2b()
+        with open(file_path, "rb") as fin:
+            while chunk := fin.read(2**20):
+                content_hash.update(chunk)
+
+        key = json.dumps(
+            dict(
+                path=str(file_path.resolve()),
+                mtime=stat.st_mtime_ns,
+                size=stat.st_size,
+                content=content_hash.hexdigest(),
+                options=options,
+                format=VERSION,
+            ),
+            sort_keys=True,
+        )
+        return hashlib.blake2b(key.encode(), digest_size=20).hexdigest()
+
+    def _store(self, entry: Path, wordlist: WordList) -> None:
+        """Write the entry atomically (concurrent readers never see partial files)."""
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_name = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+        os.close(fd)
+        try:
+            wordlist.to_binary_file(tmp_name)
+            os.replace(tmp_name, entry)
+        finally:
+            Path(tmp_name).unlink(missing_ok=True)
+
+    def _evict(self, *, keep: Path) -> None:
+        """Remove least recently used entries until the cache is small enough."""
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total_size <= self._max_size:
+                break
+            if entry == keep:
+                continue
+            try:
+                entry.unlink()
+                total_size -= size
+            except OSError:
+                pass
+
+    def _entries(self) -> list[Path]:
+        if not self._directory.exists():
+            return []
+        return list(self._directory.glob(f"*{_ENTRY_SUFFIX}"))
@@ -0,0 +1,34 @@
+from papass import PassphraseGenerator, PasswordGenerator, SystemRng, WordList
+from papass.alphabet import alphabet_from_options
+
+from .conftest import synthetic_words
+
+DICEWARE_SIZE = 6**5
+
+
+def test_passphrase_generate(benchmark):
+    wordlist = WordList(synthetic_words(DICEWARE_SIZE))
+    generator = PassphraseGenerator(wordlist=wordlist, rng=SystemRng())
+
+    benchmark(generator.generate, 6)
+
+
+def test_passphrase_generate_many(benchmark):
+    wordlist = WordList(synthetic_words(DICEWARE_SIZE))
+    generator = PassphraseGenerator(wordlist=wordlist, rng=SystemRng())
+
+    benchmark(lambda: list(generator.generate_many(6, 1000)))
+
+
+def test_password_generate(benchmark):
+    alphabet = alphabet_from_options(preset="letters,digits")
+    generator = PasswordGenerator(alphabet=alphabet, rng=SystemRng())
+
+    benchmark(generator.generate, 20)
+
+
+def test_password_generate_many(benchmark):
+    alphabet = alphabet_from_options(preset="letters,digits")
+    generator = PasswordGenerator(alphabet=alphabet, rng=SystemRng())
+
+    benchmark(lambda: list(generator.generate_many(20, 1000)))
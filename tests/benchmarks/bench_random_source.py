@@ -0,0 +1,47 @@
+import pytest
+from papass import BufferedSystemRng, SystemRng
+from papass.random_source.dice import compute_dice_frame, plan_dice_rolls
+
+
+@pytest.mark.parametrize("upper", [6**5, 2**64, 7776**10, 7776**20, 10**300])
+@pytest.mark.parametrize("cached", [False, True])
+def test_compute_dice_frame(benchmark, upper, cached):
+    # ``__wrapped__`` bypasses the cache.
+    compute = compute_dice_frame if cached else compute_dice_frame.__wrapped__
+    benchmark(compute, num_sides=6, upper=upper, required_success_probability=0.99)
+
+
+@pytest.mark.parametrize("upper", [6**5, 7776**4, 7776**10, 7776**20, 7776**100])
+@pytest.mark.parametrize("pool_size", [1, 1234])
+def test_plan_dice_rolls(benchmark, upper, pool_size):
+    dice_bag = (6, 8, 10, 12, 20)
+    # ``__wrapped__`` bypasses the cache.
+    plan = benchmark(
+        plan_dice_rolls.__wrapped__,
+        dice_bag=dice_bag,
+        upper=upper,
+        required_success_probability=0.999,
+        pool_size=pool_size,
+    )
+    # Planning must not be noticeable before the user is asked to roll (no stats if the
+    # benchmarks are disabled):
+    if benchmark.stats:
+        assert benchmark.stats.stats.max < 0.1
+
+    single_die = plan_dice_rolls(dice_bag=(6,), upper=upper, required_success_probability=0.999)
+    benchmark.extra_info["expected_num_rolls"] = plan.expected_num_rolls(upper)
+    benchmark.extra_info["expected_num_rolls_d6"] = single_die.expected_num_rolls(upper)
+
+
+@pytest.mark.parametrize("rng_class", [SystemRng, BufferedSystemRng])
+def test_randbelow(benchmark, rng_class):
+    rng = rng_class()
+
+    benchmark(rng.randbelow, 6**5)
+
+
+@pytest.mark.parametrize("rng_class", [SystemRng, BufferedSystemRng])
+def test_randbelow_many(benchmark, rng_class):
+    rng = rng_class()
+
+    benchmark(lambda: list(rng.randbelow_many(6**5, 1000)))
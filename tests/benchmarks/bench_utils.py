@@ -0,0 +1,19 @@
+import pytest
+from papass.utils import PowerSequence
+
+
+@pytest.mark.parametrize("power", [6, 100, 1000])
+def test_power_sequence_getitem(benchmark, power):
+    ps = PowerSequence(range(6**5), power)
+    index = ps.size * 2 // 3
+
+    benchmark(ps.__getitem__, index)
+
+
+@pytest.mark.parametrize("power", [6, 100])
+def test_power_sequence_get_many(benchmark, power):
+    ps = PowerSequence(range(6**5), power)
+    step = ps.size // 1000
+    indices = [i * step for i in range(1000)]
+
+    benchmark(ps.get_many, indices)
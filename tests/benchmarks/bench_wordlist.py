@@ -0,0 +1,32 @@
+import pytest
+from papass import WordList
+
+from .conftest import WORDLIST_SIZES
+
+
+@pytest.mark.parametrize("count", WORDLIST_SIZES)
+def test_from_file(benchmark, wordlist_file, count):
+    file_path = wordlist_file(count)
+
+    wordlist = benchmark.pedantic(WordList.from_file, args=(file_path,), rounds=3)
+
+    assert len(wordlist) == count
+
+
+@pytest.mark.parametrize("count", WORDLIST_SIZES)
+def test_from_frequency_file(benchmark, frequency_file, count):
+    file_path = frequency_file(count)
+
+    wordlist = benchmark.pedantic(WordList.from_frequency_file, args=(file_path,), rounds=3)
+
+    assert len(wordlist) == count
+
+
+@pytest.mark.parametrize("count", WORDLIST_SIZES)
+def test_from_binary_file(benchmark, wordlist_file, tmp_path, count):
+    binary_path = tmp_path / "words.ppwl"
+    WordList.from_file(wordlist_file(count)).to_binary_file(binary_path)
+
+    wordlist = benchmark.pedantic(WordList.from_binary_file, args=(binary_path,), rounds=3)
+
+    assert len(wordlist) == count
@@ -0,0 +1,82 @@
+"""Benchmarks (via pytest-benchmark).
+
+The files are named ``bench_*.py`` so that they are not collected by a plain ``pytest``.
+Run them explicitly, e.g.::
+
+    $ pytest tests/benchmarks/bench_*.py --benchmark-json=benchmark.json
+
+Set ``PAPASS_BENCHMARK_LARGE=1`` to include the largest inputs (10M words).
+"""
+
+import os
+import string
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+BENCHMARK_TIMEOUT = 600.0
+
+WORDLIST_SIZES = [
+    10_000,
+    1_000_000,
+    pytest.param(
+        10_000_000,
+        marks=pytest.mark.skipif(
+            not os.environ.get("PAPASS_BENCHMARK_LARGE"), reason="Set PAPASS_BENCHMARK_LARGE=1"
+        ),
+    ),
+]
+
+
+def pytest_collection_modifyitems(items):
+    # Large inputs take much longer than the timeout for the regular tests.
+    for item in items:
+        if Path(item.path).name.startswith("bench_"):
+            item.add_marker(pytest.mark.timeout(BENCHMARK_TIMEOUT))
+
+
+def synthetic_words(count: int) -> Iterator[str]:
+    """Yield ``count`` distinct lowercase words of length 6 (in random looking order)."""
+    letters = string.ascii_lowercase
+    # A multiplier coprime to 26**6 permutes the indices.
+    modulus = len(letters) ** 6
+    for i in range(count):
+        n = (i * 7_654_321) % modulus
+        word = []
+        for _ in range(6):
+            n, digit = divmod(n, len(letters))
+            word.append(letters[digit])
+        yield "".join(word)
+
+
+@pytest.fixture(scope="session")
+def wordlist_file(tmp_path_factory):
+    """Return a factory creating (and reusing) a word list file with ``count`` words."""
+    directory: Path = tmp_path_factory.mktemp("wordlists")
+
+    def make(count: int) -> Path:
+        file_path = directory / f"words-{count}.txt"
+        if not file_path.exists():
+            with open(file_path, "w") as fout:
+                fout.writelines(f"{w}\n" for w in synthetic_words(count))
+        return file_path
+
+    return make
+
+
+@pytest.fixture(scope="session")
+def frequency_file(tmp_path_factory):
+    """Return a factory creating (and reusing) a frequency file with ``count`` words."""
+    directory: Path = tmp_path_factory.mktemp("frequency_files")
+
+    def make(count: int) -> Path:
+        file_path = directory / f"frequencies-{count}.txt"
+        if not file_path.exists():
+            with open(file_path, "w") as fout:
+                fout.writelines(
+                    f"{i + 1}\t{w}\t{count - i}\n" for i, w in enumerate(synthetic_words(count))
+                )
+        return file_path
+
+    return make
@@ -1,6 +1,15 @@
+import pytest
 from hypothesis import settings
 
 base = settings(print_blob=True)
 
 settings.register_profile("dev", parent=base, max_examples=10)
 settings.register_profile("ci", parent=base, max_examples=1000)
+
+
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path_factory, monkeypatch):
+    """Never let tests write into the real cache directory of the user."""
+    cache_home = tmp_path_factory.mktemp("cache_home")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    return cache_home
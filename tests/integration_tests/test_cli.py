@@ -18,3 +18,22 @@ def test_help(opt_help):
 
     assert result.exit_code == 0
     assert "Usage" in result.output
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        [],
+        ["--port", "1234", "--socket", "/tmp/x.sock"],
+        ["--port", "1", "-r", "dice"],
+        ["--port", "1", "-w", "foo"],
+        ["--port", "1", "-w", "foo=/does/not/exist"],
+        ["--port", "1", "-w", "foo=/"],
+    ],
+)
+def test_serve_invalid_options(options):
+    runner = CliRunner()
+    result = runner.invoke(cli, ["serve"] + options)
+
+    assert result.exit_code == 0
+    assert result.output.startswith("ERROR:")
@@ -1,5 +1,7 @@
+import importlib.metadata
 import re
 
+import papass.random_source.registry
 import pytest
 from click.testing import CliRunner
 from papass.__main__ import cli
@@ -138,3 +140,354 @@ def test_remove_leading_digits(tmp_path, opt_remove):
 
         assert result.exit_code == 0
         assert output_pattern.match(result.output)
+
+
+@pytest.mark.parametrize("opt_count", ["-c", "--count"])
+@pytest.mark.parametrize("count", [0, 2, 17])
+def test_count(tmp_path, opt_count, count):
+    runner = CliRunner()
+    wordlist_content = "foo\nbar"
+    length = 3
+    passphrase_pattern = re.compile(r"^(foo|bar)( foo| bar){2}$")
+
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        with open(WORDLIST_NAME, "w") as f:
+            f.write(wordlist_content)
+
+        result = runner.invoke(
+            cli, ["pp", "-l", str(length), "-w", WORDLIST_NAME, opt_count, str(count)]
+        )
+
+        assert result.exit_code == 0
+        passphrases = [line for line in result.output.splitlines() if not line.startswith("Ent")]
+        assert len(passphrases) == count
+        assert all(passphrase_pattern.match(p) for p in passphrases)
+
+
+@pytest.mark.parametrize("randomness_source", ["system", "system-buffered"])
+def test_workers(tmp_path, randomness_source):
+    runner = CliRunner()
+    passphrase_pattern = re.compile(r"^(foo|bar)(-foo|-bar){2}$")
+
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        with open(WORDLIST_NAME, "w") as f:
+            f.write("foo\nbar")
+
+        result = runner.invoke(
+            cli,
+            ["pp", "-l", "3", "-w", WORDLIST_NAME, "-d", "-", "-c", "50", "--workers", "2"]
+            + ["-r", randomness_source],
+        )
+
+        assert result.exit_code == 0
+        passphrases = [line for line in result.output.splitlines() if not line.startswith("Ent")]
+        assert len(passphrases) == 50
+        assert all(passphrase_pattern.match(p) for p in passphrases)
+
+
+@pytest.mark.parametrize(
+    "options,error",
+    [
+        (["--workers", "0"], "--workers must be positive."),
+        (["--workers", "2", "-r", "dice"], "Random source `dice` cannot be used by several"),
+    ],
+)
+def test_workers_invalid(tmp_path, options, error):
+    runner = CliRunner()
+
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        with open(WORDLIST_NAME, "w") as f:
+            f.write("foo\nbar")
+
+        result = runner.invoke(cli, ["pp", "-l", "3", "-w", WORDLIST_NAME, "-c", "5"] + options)
+
+        assert result.exit_code == 0
+        assert result.output.startswith(f"ERROR: {error}")
+
+
+@pytest.mark.parametrize(
+    "output_format,expected_pattern",
+    [
+        (None, r"^((foo|bar)-(foo|bar)\n){4}$"),
+        ("plain", r"^((foo|bar)-(foo|bar)\n){4}$"),
+        ("nul", r"^((foo|bar)-(foo|bar)\0){4}$"),
+        (
+            "csv",
+            r"^passphrase,entropy,entropy_is_guaranteed\n((foo|bar)-(foo|bar),2\.0,True\n){4}$",
+        ),
+        (
+            "jsonl",
+            r'^(\{"passphrase": "(foo|bar)-(foo|bar)", "entropy": 2\.0,'
+            r' "entropy_is_guaranteed": true\}\n){4}$',
+        ),
+    ],
+)
+def test_format_and_output(tmp_path, output_format, expected_pattern):
+    runner = CliRunner()
+    opt_format = ["--format", output_format] if output_format else []
+
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        with open(WORDLIST_NAME, "w") as f:
+            f.write("foo\nbar")
+
+        result = runner.invoke(
+            cli,
+            ["pp", "-l", "2", "-w", WORDLIST_NAME, "-d", "-", "-c", "4", "-o", "out.txt"]
+            + opt_format,
+        )
+
+        assert result.exit_code == 0
+        assert result.output == "Entropy: 2.0\n"
+        with open("out.txt", newline="") as f:
+            assert re.match(expected_pattern, f.read())
+
+
+def test_format_implies_many(tmp_path):
+    runner = CliRunner()
+
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        with open(WORDLIST_NAME, "w") as f:
+            f.write("foo\nbar")
+
+        result = runner.invoke(cli, ["pp", "-l", "1", "-w", WORDLIST_NAME, "-f", "jsonl"])
+
+        assert result.exit_code == 0
+        assert re.match(r'^\{"passphrase": "(foo|bar)", "entropy": 1\.0,', result.output)
+
+
+def test_unknown_format(tmp_path):
+    runner = CliRunner()
+
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        with open(WORDLIST_NAME, "w") as f:
+            f.write("foo\nbar")
+
+        result = runner.invoke(cli, ["pp", "-l", "1", "-w", WORDLIST_NAME, "-c", "2", "-f", "xml"])
+
+        assert result.exit_code == 0
+        assert result.output.startswith("ERROR: Unknown output format `xml`.")
+
+
+def test_unknown_format_keeps_output_file(tmp_path):
+    runner = CliRunner()
+
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        with open(WORDLIST_NAME, "w") as f:
+            f.write("foo\nbar")
+        with open("existing.txt", "w") as f:
+            f.write("important")
+
+        result = runner.invoke(
+            cli, ["pp", "-l", "1", "-w", WORDLIST_NAME, "-o", "existing.txt", "-f", "xml"]
+        )
+
+        assert result.output.startswith("ERROR: Unknown output format `xml`.")
+        with open("existing.txt") as f:
+            assert f.read() == "important"
+
+
+@pytest.mark.parametrize("no_cache", [False, True])
+def test_cache(tmp_path, cache_home, no_cache):
+    runner = CliRunner()
+    output_pattern = re.compile(r"^Passphrase: (foo|bar)\nEntropy: 1\.0$")
+    opt_no_cache = ["--no-cache"] if no_cache else []
+
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        with open(WORDLIST_NAME, "w") as f:
+            f.write("foo\nbar")
+
+        for _ in range(2):
+            result = runner.invoke(cli, ["pp", "-l", "1", "-w", WORDLIST_NAME] + opt_no_cache)
+
+            assert result.exit_code == 0
+            assert output_pattern.match(result.output)
+
+    cache_entries = list((cache_home / "papass").glob("*.ppwl"))
+    assert len(cache_entries) == (0 if no_cache else 1)
+
+
+def test_exact_entropy(tmp_path):
+    runner = CliRunner()
+    output_pattern = re.compile(r"^Passphrase: (foo|bar)+\nEntropy: 3\.80735\nWARNING: Entropy")
+
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        with open(WORDLIST_NAME, "w") as f:
+            f.write("foo\nbar\nfoobar\nbarfoo")
+
+        result = runner.invoke(
+            cli, ["pp", "-l", "2", "-w", WORDLIST_NAME, "-d", "", "--exact-entropy"]
+        )
+
+        # ``foobarfoo`` is more likely than the other passphrases.
+        assert result.exit_code == 0
+        assert output_pattern.match(result.output)
+
+
+def test_dice_rng_recycle_entropy(monkeypatch, tmp_path):
+    runner = CliRunner()
+    output_pattern = re.compile(r"^Passphrase: \w\w\w \w\w\w \w\w\w\nEntropy: 6\.0$")
+
+    patch_input(monkeypatch, ["6 2 1 6 5 6"])
+
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        with open(WORDLIST_NAME, "w") as f:
+            f.write("muh\nmae\nwau\nnak")
+
+        result = runner.invoke(
+            cli, ["pp", "-l", "3", "-w", WORDLIST_NAME, "-r", "dice", "--recycle-entropy"]
+        )
+
+        assert result.exit_code == 0
+        assert output_pattern.match(result.output)
+
+
+def test_dice_rng_dice_bag(monkeypatch, tmp_path):
+    runner = CliRunner()
+
+    # 20 words are drawn with a single d20 (the 7 selects the 7th word).
+    patch_input(monkeypatch, ["7"])
+
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        with open(WORDLIST_NAME, "w") as f:
+            f.write("\n".join(f"w{i:02}" for i in range(20)))
+
+        result = runner.invoke(
+            cli, ["pp", "-l", "1", "-w", WORDLIST_NAME, "-r", "dice", "--dice-bag", "6,20"]
+        )
+
+        assert result.exit_code == 0
+        assert result.output == "Passphrase: w06\nEntropy: 4.32193\n"
+
+
+def test_invalid_dice_bag(tmp_path):
+    runner = CliRunner()
+
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        with open(WORDLIST_NAME, "w") as f:
+            f.write("foo\nbar")
+
+        result = runner.invoke(
+            cli, ["pp", "-l", "2", "-w", WORDLIST_NAME, "-r", "dice", "--dice-bag", "6,x"]
+        )
+
+        assert result.exit_code == 0
+        assert result.output.startswith(
+            "ERROR: --dice-bag must be a comma-separated list of integers, got `6,x`."
+        )
+
+
+def test_dice_file(tmp_path):
+    runner = CliRunner()
+
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        with open(WORDLIST_NAME, "w") as f:
+            f.write("\n".join(f"w{i}" for i in range(1, 7)))
+        with open("rolls.txt", "w") as f:
+            f.write("# two passphrases\n1 2\n3 4  # second\n")
+
+        result = runner.invoke(
+            cli,
+            ["pp", "-l", "2", "-w", WORDLIST_NAME, "-r", "dice", "--dice-file", "rolls.txt"]
+            + ["-c", "2"],
+        )
+
+        assert result.exit_code == 0
+        passphrases = [line for line in result.output.splitlines() if not line.startswith("Ent")]
+        assert passphrases == ["w1 w2", "w3 w4"]
+
+
+def test_dice_file_from_stdin(tmp_path):
+    runner = CliRunner()
+
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        with open(WORDLIST_NAME, "w") as f:
+            f.write("\n".join(f"w{i}" for i in range(1, 7)))
+
+        result = runner.invoke(
+            cli,
+            ["pp", "-l", "2", "-w", WORDLIST_NAME, "-r", "dice", "--dice-file", "-"],
+            input="6 5 4\n",
+        )
+
+        assert result.exit_code == 0
+        assert "Passphrase: w6 w5\n" in result.output
+        assert "WARNING: 1 dice rolls of --dice-file were not used." in result.output
+
+
+@pytest.mark.parametrize(
+    "rolls, options, error",
+    [
+        ("1 2\n", ["-r", "dice"], "Not enough dice rolls: The input ended after 2 rolls."),
+        ("1 9 2", ["-r", "dice"], "Invalid dice roll `9` in line 1."),
+        ("1 2 3", [], "--dice-file requires -r dice."),
+    ],
+)
+def test_dice_file_errors(tmp_path, rolls, options, error):
+    runner = CliRunner()
+
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        with open(WORDLIST_NAME, "w") as f:
+            f.write("\n".join(f"w{i}" for i in range(1, 7)))
+        with open("rolls.txt", "w") as f:
+            f.write(rolls)
+
+        result = runner.invoke(
+            cli, ["pp", "-l", "3", "-w", WORDLIST_NAME, "--dice-file", "rolls.txt"] + options
+        )
+
+        assert result.exit_code == 0
+        assert result.output.startswith(f"ERROR: {error}")
+
+
+@pytest.fixture
+def constant_rng_plugin(monkeypatch):
+    entry_point = importlib.metadata.EntryPoint(
+        "constant",
+        "tests.papass.random_source.test_registry:ConstantRng",
+        papass.random_source.registry.ENTRY_POINT_GROUP,
+    )
+    monkeypatch.setattr(importlib.metadata, "entry_points", lambda *, group: [entry_point])
+    papass.random_source.registry._plugin_registry.cache_clear()
+    yield
+    papass.random_source.registry._plugin_registry.cache_clear()
+
+
+@pytest.mark.usefixtures("constant_rng_plugin")
+def test_random_source_plugin(tmp_path):
+    runner = CliRunner()
+
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        with open(WORDLIST_NAME, "w") as f:
+            f.write("foo\nbar")
+
+        result = runner.invoke(
+            cli,
+            ["pp", "-l", "2", "-w", WORDLIST_NAME, "-r", "constant", "--rng-option", "value=1"]
+            + ["-c", "2"],
+        )
+
+        assert result.exit_code == 0
+        passphrases = [line for line in result.output.splitlines() if not line.startswith("Ent")]
+        assert passphrases == ["bar foo", "bar foo"]
+
+
+@pytest.mark.usefixtures("constant_rng_plugin")
+@pytest.mark.parametrize(
+    "options, error",
+    [
+        (["-r", "constant", "--rng-option", "value"], "--rng-option must look like KEY=VALUE"),
+        (["-r", "constant", "--rng-option", "foo=1"], "Unknown --rng-option `foo`"),
+        (["--rng-option", "value=1"], "Random source `system` takes no --rng-option."),
+    ],
+)
+def test_random_source_plugin_invalid_options(tmp_path, options, error):
+    runner = CliRunner()
+
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        with open(WORDLIST_NAME, "w") as f:
+            f.write("foo\nbar")
+
+        result = runner.invoke(cli, ["pp", "-l", "2", "-w", WORDLIST_NAME] + options)
+
+        assert result.exit_code == 0
+        assert result.output.startswith(f"ERROR: {error}")
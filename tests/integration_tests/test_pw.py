@@ -58,6 +58,31 @@ def test_dice_rng_simple(monkeypatch, opt_dice_sides):
     assert output_pattern.match(result.output), result.output
 
 
+def test_dice_rng_too_many_rolls(monkeypatch):
+    runner = CliRunner()
+
+    patch_input(monkeypatch, ["1 2 3 4 5 6 1 2 3 4 5 6"])
+
+    result = runner.invoke(cli, ["pw", "-l", "2", "-i", "0123456789", "-r", "dice"])
+
+    assert result.exit_code == 0
+    assert result.output.startswith("ERROR: Require 7 dice rolls, got 12.")
+
+
+def test_dice_file():
+    runner = CliRunner()
+
+    # The alphabet "abcdef" with 6 sided dice: each roll selects one character.
+    result = runner.invoke(
+        cli,
+        ["pw", "-l", "3", "-i", "abcdef", "-r", "dice", "--dice-file", "-"],
+        input="2 6\n1\n",
+    )
+
+    assert result.exit_code == 0
+    assert result.output.startswith("Password: bfa\n"), result.output
+
+
 @pytest.mark.parametrize("opt", ["-e", "--alpha-exclude"])
 def test_alpha_exclude(opt):
     runner = CliRunner()
@@ -93,3 +118,62 @@ def test_alpha_preset(opt, names):
 
     assert result.exit_code == 0
     assert output_pattern.match(result.output)
+
+
+@pytest.mark.parametrize("opt_count", ["-c", "--count"])
+@pytest.mark.parametrize("count", [0, 2, 100])
+def test_count(opt_count, count):
+    runner = CliRunner()
+    password_pattern = re.compile(r"^[A-Za-z0-9]{20}$")
+
+    result = runner.invoke(cli, ["pw", "-l", "20", "-p", "letters,digits", opt_count, str(count)])
+
+    assert result.exit_code == 0
+    passwords = [line for line in result.output.splitlines() if not line.startswith("Entropy")]
+    assert len(passwords) == count
+    assert all(password_pattern.match(p) for p in passwords)
+
+
+def test_workers():
+    runner = CliRunner()
+    password_pattern = re.compile(r"^[0-9]{8}$")
+
+    result = runner.invoke(cli, ["pw", "-l", "8", "-p", "digits", "-c", "30", "--workers", "3"])
+
+    assert result.exit_code == 0
+    passwords = [line for line in result.output.splitlines() if not line.startswith("Entropy")]
+    assert len(passwords) == 30
+    assert all(password_pattern.match(p) for p in passwords)
+
+
+@pytest.mark.parametrize(
+    "output_format,expected_pattern",
+    [
+        ("plain", r"^([ab]{4}\n){3}$"),
+        ("nul", r"^([ab]{4}\0){3}$"),
+        ("csv", r"^password,entropy\n([ab]{4},4\.0\n){3}$"),
+        ("jsonl", r'^(\{"password": "[ab]{4}", "entropy": 4\.0\}\n){3}$'),
+    ],
+)
+def test_format_and_output(tmp_path, output_format, expected_pattern):
+    runner = CliRunner()
+    output_file = tmp_path / "out.txt"
+
+    result = runner.invoke(
+        cli,
+        ["pw", "-l", "4", "-i", "ab", "-c", "3", "-f", output_format, "-o", str(output_file)],
+    )
+
+    assert result.exit_code == 0
+    assert result.output == "Entropy: 4.0\n"
+    assert re.match(expected_pattern, output_file.read_bytes().decode())
+
+
+def test_system_buffered_rng():
+    runner = CliRunner()
+    output_pattern = re.compile(r"^Password: [abcd]{13}\nEntropy: 26\.0$")
+
+    result = runner.invoke(cli, ["pw", "-l", "13", "-i", "abcd", "-r", "system-buffered"])
+
+    assert result.exit_code == 0
+    assert output_pattern.match(result.output)
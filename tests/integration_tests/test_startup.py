@@ -0,0 +1,58 @@
+import subprocess
+import sys
+import time
+
+import pytest
+
+
+def _run_python(*args: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, check=True, timeout=30
+    )
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import papass",
+        "from papass import PassphraseGenerator, WordList, SystemRng",
+    ],
+)
+def test_library_does_not_import_cli(statement):
+    result = _run_python("-c", f"import sys; {statement}; print('click' in sys.modules)")
+
+    assert result.stdout.strip() == "False"
+
+
+@pytest.mark.parametrize(
+    "statement", ["import papass.random_source.registry", "import papass.commands"]
+)
+def test_registry_does_not_import_random_sources(statement):
+    modules = ["papass.random_source.dice", "papass.random_source.system", "papass.utils"]
+    result = _run_python(
+        "-c", f"import sys; {statement}; print(any(m in sys.modules for m in {modules!r}))"
+    )
+
+    assert result.stdout.strip() == "False"
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ("-c", "import papass"),
+        ("-m", "papass", "--help"),
+        ("-m", "papass", "pp", "--help"),
+    ],
+)
+def test_startup_is_fast(args):
+    # Generous budget (the interpreter itself needs a good part of it). Only meant to catch
+    # heavy imports creeping into the startup path.
+    budget = 1.0
+
+    durations = []
+    for _ in range(3):
+        start = time.perf_counter()
+        _run_python(*args)
+        durations.append(time.perf_counter() - start)
+
+    assert min(durations) < budget
@@ -0,0 +1,74 @@
+import re
+
+import pytest
+from click.testing import CliRunner
+from papass.__main__ import cli
+from papass.wordlist import WordList
+
+
+@pytest.mark.parametrize("opt_help", ["--help", "-h"])
+def test_help(opt_help):
+    runner = CliRunner()
+    result = runner.invoke(cli, ["wordlist", "compile", opt_help])
+
+    assert result.exit_code == 0
+    assert "Usage" in result.output
+
+
+def test_compile(tmp_path):
+    runner = CliRunner()
+
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        with open("wordlist.txt", "w") as f:
+            f.write("foo\nbar\nfoo\n11 baz\nlongword")
+
+        result = runner.invoke(
+            cli, ["wordlist", "compile", "wordlist.txt", "wordlist.ppwl", "--rld", "--maxw", "4"]
+        )
+
+        assert result.exit_code == 0
+        assert result.output == "Wrote 3 words to wordlist.ppwl.\n"
+        assert WordList.from_file("wordlist.ppwl") == WordList(["bar", "baz", "foo"])
+
+        result = runner.invoke(cli, ["pp", "-l", "2", "-w", "wordlist.ppwl"])
+
+        assert result.exit_code == 0
+        assert re.match(r"^Passphrase: (bar|baz|foo) (bar|baz|foo)\n", result.output)
+
+
+@pytest.mark.parametrize("text", [False, True])
+def test_make_prefix_free(tmp_path, text):
+    runner = CliRunner()
+
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        with open("wordlist.txt", "w") as f:
+            f.write("foo\nbar\nfoobar\nbarfoo\nbaz")
+
+        result = runner.invoke(
+            cli,
+            ["wordlist", "make-prefix-free", "wordlist.txt", "out"] + (["--text"] if text else []),
+        )
+
+        assert result.exit_code == 0
+        assert result.output == "Removed 2 of 5 words. Entropy per word: 2.32193 -> 1.58496.\n"
+        assert WordList.from_file("out") == WordList(["barfoo", "baz", "foobar"])
+
+        result = runner.invoke(cli, ["pp", "-l", "3", "-w", "out", "-d", ""])
+
+        assert result.exit_code == 0
+        assert "WARNING" not in result.output
+
+
+def test_make_prefix_free_empty(tmp_path):
+    runner = CliRunner()
+
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        with open("wordlist.txt", "w") as f:
+            f.write("foo\nbar")
+
+        result = runner.invoke(
+            cli, ["wordlist", "make-prefix-free", "wordlist.txt", "out", "--minw", "4"]
+        )
+
+        assert result.exit_code == 0
+        assert "ERROR: The wordlist is empty." in result.output
@@ -0,0 +1,64 @@
+import asyncio
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+
+import pytest
+from papass.random_source.async_rng import AsyncRngBase, AsyncRngWrapper
+
+from tests.utils.cycle_rng import CycleRng
+
+
+class AsyncCycleRng(AsyncRngBase):
+    def __init__(self, cycle: Sequence[int]) -> None:
+        self._rng = CycleRng(cycle)
+
+    async def randbelow(self, upper: int) -> int:
+        await asyncio.sleep(0)
+        return self._rng.randbelow(upper)
+
+
+async def _collect(iterator: AsyncIterator[Any]) -> list[Any]:
+    return [i async for i in iterator]
+
+
+def test_randbelow_many_default():
+    rng = AsyncCycleRng([3, 1, 4])
+
+    assert asyncio.run(_collect(rng.randbelow_many(4, 5))) == [3, 1, 0, 3, 1]
+
+
+def test_choice():
+    rng = AsyncCycleRng([2, 0])
+
+    assert asyncio.run(rng.choice("abc")) == "c"
+    assert asyncio.run(rng.choice("abc")) == "a"
+
+
+def test_choice_empty():
+    with pytest.raises(AssertionError, match="Items must not be empty."):
+        asyncio.run(AsyncCycleRng([0]).choice([]))
+
+
+class TestAsyncRngWrapper:
+    def test_randbelow(self):
+        rng = AsyncRngWrapper(CycleRng([5, 7]))
+
+        assert asyncio.run(rng.randbelow(10)) == 5
+        assert asyncio.run(rng.randbelow(3)) == 1
+
+    @pytest.mark.parametrize("count", [0, 1, 4097, 10000])
+    def test_randbelow_many(self, count):
+        cycle = list(range(17))
+        rng = AsyncRngWrapper(CycleRng(cycle))
+
+        integers = asyncio.run(_collect(rng.randbelow_many(100, count)))
+
+        assert integers == [i % 17 for i in range(count)]
+
+    def test_concurrent_calls(self):
+        rng = AsyncRngWrapper(CycleRng(list(range(1000))))
+
+        async def draw_concurrently() -> list[int]:
+            return await asyncio.gather(*(rng.randbelow(1000) for _ in range(1000)))
+
+        assert sorted(asyncio.run(draw_concurrently())) == list(range(1000))
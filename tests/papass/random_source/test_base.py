@@ -19,3 +19,8 @@ class TestRandomNumberGeneratorBase:
         cycle = get_cycle()
 
         assert cycle_rng.choice(items) == items[cycle[i]]
+
+
+def test_randbelow_many_uses_randbelow():
+    rng = CycleRng(get_cycle())
+    assert list(rng.randbelow_many(3, 6)) == [0, 0, 2, 1, 0, 0]
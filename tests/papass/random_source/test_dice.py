@@ -1,12 +1,21 @@
+import itertools
+import math
+from collections import Counter
 from random import Random
 
 import pytest
 from hypothesis import given
 from hypothesis import strategies as st
-from papass.random_source.dice import DiceRng, compute_dice_frame
-from papass.utils import rolls_to_value
+from papass.random_source.dice import (
+    DiceFrame,
+    DicePlan,
+    DiceRng,
+    compute_dice_frame,
+    plan_dice_rolls,
+)
+from papass.utils import QueryUserForDice, rolls_to_value
 
-from tests.utils.mock import MockCallbackQueryForDice, MockIterQueryForDice
+from tests.utils.mock import MockCallbackQueryForDice, MockIterQueryForDice, patch_input
 
 
 @pytest.mark.parametrize(
@@ -91,6 +100,64 @@ def test_compute_frame(num_sides, upper, req_prob_exponent):
     assert success_probability_less < required_success_probability + epsilon
 
 
+def compute_dice_frame_by_search(
+    *, num_sides: int, upper: int, required_success_probability: float
+) -> DiceFrame:
+    """Compute the dice frame by trying one roll after the other (reference)."""
+    required_num_rolls = 1
+    upper_dice = num_sides
+    while (
+        upper_dice < upper
+        or (upper_dice // upper) * upper / upper_dice < required_success_probability
+    ):
+        required_num_rolls += 1
+        upper_dice *= num_sides
+
+    return DiceFrame(
+        upper_multiple=(upper_dice // upper) * upper, required_num_rolls=required_num_rolls
+    )
+
+
+@given(
+    num_sides=st.integers(2, 20),
+    upper=st.integers(1, 10**300) | st.integers(1, 1000),
+    required_success_probability=st.sampled_from([0.0, 0.5, 0.99, 0.999, 0.999999]),
+)
+def test_compute_frame_same_as_search(num_sides, upper, required_success_probability):
+    options = dict(
+        num_sides=num_sides,
+        upper=upper,
+        required_success_probability=required_success_probability,
+    )
+    assert compute_dice_frame(**options) == compute_dice_frame_by_search(**options)
+
+
+@pytest.mark.parametrize("num_sides", [2, 6, 10])
+@pytest.mark.parametrize("exponent", [1, 2, 5, 20, 300])
+def test_compute_frame_powers(num_sides, exponent):
+    frame = compute_dice_frame(
+        num_sides=num_sides, upper=num_sides**exponent, required_success_probability=0.999
+    )
+    assert frame == DiceFrame(upper_multiple=num_sides**exponent, required_num_rolls=exponent)
+
+
+def test_compute_frame_is_cached():
+    options = dict(num_sides=6, upper=7776**10, required_success_probability=0.99)
+    assert compute_dice_frame(**options) is compute_dice_frame(**options)
+
+
+def test_randbelow_uses_cached_frame():
+    upper = 7776**3 + 1
+    rng = DiceRng(query_for_dice=MockCallbackQueryForDice(lambda n: [1] * n))
+    rng.randbelow(upper)
+    misses = compute_dice_frame.cache_info().misses
+
+    for _ in range(3):
+        rng.randbelow(upper)
+
+    assert compute_dice_frame.cache_info().misses == misses
+
+
 class TestUniformity:
     """Test that randbelow has a uniform distribution on [0, upper)."""
 
@@ -156,3 +223,198 @@ class TestUniformity:
 
         obtained_values = [dice_rng.randbelow(upper) for _ in range(num_calls)]
         assert set(obtained_values) == set(range(upper)), "Heuristic surjectivity check."
+
+
+class TestRecycleEntropy:
+    """Test ``DiceRng(recycle_entropy=True)``."""
+
+    class RollsExhausted(Exception):
+        pass
+
+    @classmethod
+    def outputs(cls, rolls: tuple[int, ...], num_sides, upper, probability, num_calls):
+        """Return the outputs of ``num_calls`` calls (``None`` if the rolls do not suffice)."""
+        iterator = iter(rolls)
+
+        def rolls_callback(required_num_rolls: int) -> list[int]:
+            taken = list(itertools.islice(iterator, required_num_rolls))
+            if len(taken) < required_num_rolls:
+                raise cls.RollsExhausted()
+            return taken
+
+        dice_rng = DiceRng(
+            query_for_dice=MockCallbackQueryForDice(rolls_callback),
+            num_sides=num_sides,
+            required_success_probability=probability,
+            recycle_entropy=True,
+        )
+        try:
+            return tuple(dice_rng.randbelow(upper) for _ in range(num_calls))
+        except cls.RollsExhausted:
+            return None
+
+    @pytest.mark.parametrize(
+        "num_sides, upper, probability, num_rolls",
+        [
+            (2, 3, 0.0, 10),
+            (3, 5, 0.5, 8),
+            (6, 5, 0.9, 5),
+            (6, 7, 0.99, 5),
+        ],
+    )
+    def test_exactly_uniform(self, num_sides, upper, probability, num_rolls):
+        """Two consecutive outputs are exactly uniform and independent.
+
+        All sequences of ``num_rolls`` rolls are equally likely. Whether they suffice for two
+        outputs does not depend on the outputs, hence each pair of outputs must occur
+        equally often.
+        """
+        counts = Counter(
+            self.outputs(rolls, num_sides, upper, probability, num_calls=2)
+            for rolls in itertools.product(range(1, num_sides + 1), repeat=num_rolls)
+        )
+        del counts[None]
+
+        assert set(counts) == set(itertools.product(range(upper), repeat=2))
+        assert len(set(counts.values())) == 1
+
+    @pytest.mark.parametrize("num_sides, upper", [(6, 1000), (6, 7776**2), (2, 3), (20, 7)])
+    def test_number_of_rolls(self, num_sides, upper):
+        rand_rng = Random(num_sides * upper)
+        num_rolls = 0
+
+        def rolls_callback(required_num_rolls: int) -> list[int]:
+            nonlocal num_rolls
+            num_rolls += required_num_rolls
+            return [rand_rng.randint(1, num_sides) for _ in range(required_num_rolls)]
+
+        dice_rng = DiceRng(
+            query_for_dice=MockCallbackQueryForDice(rolls_callback),
+            num_sides=num_sides,
+            recycle_entropy=True,
+        )
+        num_calls = 1000
+        values = [dice_rng.randbelow(upper) for _ in range(num_calls)]
+
+        assert all(0 <= v < upper for v in values)
+        minimal_num_rolls = num_calls * math.log(upper) / math.log(num_sides)
+        assert num_rolls < 1.02 * minimal_num_rolls + 10
+
+    @given(rand_seed=st.integers(0, 2**128))
+    def test_chi_squared(self, rand_seed):
+        """The frequencies of the outputs are plausible for a uniform distribution."""
+        num_sides, upper, num_calls = 6, 10, 1000
+        rand_rng = Random(rand_seed)
+
+        dice_rng = DiceRng(
+            query_for_dice=MockCallbackQueryForDice(
+                lambda n: [rand_rng.randint(1, num_sides) for _ in range(n)]
+            ),
+            num_sides=num_sides,
+            recycle_entropy=True,
+        )
+        counts = Counter(dice_rng.randbelow(upper) for _ in range(num_calls))
+
+        expected = num_calls / upper
+        chi_squared = sum((counts[v] - expected) ** 2 / expected for v in range(upper))
+        # Exceeded with probability < 1e-8 (chi-squared distribution, 9 degrees of freedom).
+        assert chi_squared < 60.0
+
+
+class TestDiceBag:
+    """Test ``DiceRng(dice_bag=...)`` and the planner."""
+
+    @pytest.mark.parametrize(
+        "dice_bag, upper, probability",
+        [
+            ((6,), 1000, 0.99),
+            ((6, 20), 100, 0.9),
+            ((6, 8, 10, 12, 20), 7776, 0.999),
+            ((6, 8, 10, 12, 20), 7776**3, 0.999),
+            ((2, 3), 7, 0.0),
+        ],
+    )
+    @pytest.mark.parametrize("pool_size", [1, 5])
+    def test_plan_is_optimal(self, dice_bag, upper, probability, pool_size):
+        plan = plan_dice_rolls(
+            dice_bag=dice_bag,
+            upper=upper,
+            required_success_probability=probability,
+            pool_size=pool_size,
+        )
+        assert plan.upper_dice == pool_size * math.prod(s**c for s, c in plan.rolls)
+        assert plan.upper_dice // upper * upper / plan.upper_dice >= probability
+
+        # Compare with all combinations of a few more rolls:
+        for num_rolls in range(plan.num_rolls + 3):
+            for combination in itertools.combinations_with_replacement(dice_bag, num_rolls):
+                upper_dice = pool_size * math.prod(combination)
+                if upper_dice < upper:
+                    continue
+                other = DicePlan(rolls=tuple((s, 1) for s in combination), upper_dice=upper_dice)
+                if upper_dice // upper * upper / upper_dice >= probability:
+                    assert other.expected_num_rolls(upper) >= plan.expected_num_rolls(upper)
+
+    def test_plan_single_die_same_as_frame(self):
+        plan = plan_dice_rolls(
+            dice_bag=(6,), upper=1000, required_success_probability=0.99, min_num_rolls=1
+        )
+        frame = compute_dice_frame(num_sides=6, upper=1000, required_success_probability=0.99)
+
+        assert plan.rolls == ((6, frame.required_num_rolls),)
+        assert plan.upper_dice // 1000 * 1000 == frame.upper_multiple
+
+    def test_fewer_rolls_than_single_die(self):
+        plan = plan_dice_rolls(
+            dice_bag=(6, 8, 10, 12, 20), upper=7776**4, required_success_probability=0.999
+        )
+        frame = compute_dice_frame(num_sides=6, upper=7776**4, required_success_probability=0.999)
+
+        assert plan.num_rolls < frame.required_num_rolls
+
+    def test_randbelow(self):
+        # The plan for 120 is one d20 and one d6: 6 * (20 - 1) + (5 - 1) = 118
+        query = MockIterQueryForDice([[20], [5]])
+        rng = DiceRng(query_for_dice=query, dice_bag=[20, 6], required_success_probability=0.9)
+
+        assert rng.randbelow(120) == 118
+
+    @pytest.mark.parametrize("recycle_entropy", [False, True])
+    def test_exactly_uniform(self, recycle_entropy):
+        """All outcomes of the first attempt of a plan map uniformly to the outputs."""
+        dice_bag, upper = (3, 4), 10
+        plan = plan_dice_rolls(dice_bag=dice_bag, upper=upper, required_success_probability=0.5)
+        dice = [s for s, c in plan.rolls for _ in range(c)]
+
+        counts: Counter[int | None] = Counter()
+        for outcome in itertools.product(*(range(1, s + 1) for s in dice)):
+            rolls = iter(outcome)
+            query = MockIterQueryForDice([[next(rolls) for _ in range(c)] for _, c in plan.rolls])
+            rng = DiceRng(
+                query_for_dice=query,
+                dice_bag=dice_bag,
+                required_success_probability=0.5,
+                recycle_entropy=recycle_entropy,
+            )
+            try:
+                counts[rng.randbelow(upper)] += 1
+            except StopIteration:
+                counts[None] += 1  # Rejected (the mock has no more rolls)
+
+        del counts[None]
+        assert set(counts) == set(range(upper))
+        assert len(set(counts.values())) == 1
+
+    @pytest.mark.parametrize("dice_bag", [[], [6, 1]])
+    def test_invalid_dice_bag(self, dice_bag):
+        with pytest.raises(AssertionError, match="dice_bag"):
+            DiceRng(dice_bag=dice_bag)
+
+
+def test_too_many_rolls(monkeypatch):
+    # The user enters more rolls than asked for (QueryUserForDice accepts that):
+    patch_input(monkeypatch, ["1 2 3 4 5 6 1 2 3 4 5 6"])
+    rng = DiceRng(query_for_dice=QueryUserForDice())
+
+    with pytest.raises(AssertionError, match="Require 7 dice rolls, got 12."):
+        rng.randbelow(100)
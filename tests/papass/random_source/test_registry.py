@@ -1,6 +1,10 @@
+import importlib.metadata
+
 import papass.random_source.registry
 import pytest
+from papass.random_source.base import RngBase
 from papass.random_source.registry import (
+    ENTRY_POINT_GROUP,
     available_random_sources,
     default_randomness_source,
     get_rng,
@@ -29,3 +33,101 @@ def test_get_rng(monkeypatch, random_source, options):
 
     assert isinstance(rng, CycleRng)
     assert [rng.randbelow(2) for _ in range(2)] == [0, 1]
+
+
+@pytest.mark.parametrize("random_source", list(papass.random_source.registry._rng_registry))
+def test_registry_entries_resolve(random_source):
+    ctor, _ = papass.random_source.registry._rng_registry[random_source]
+
+    assert issubclass(papass.random_source.registry._resolve(ctor), papass.random_source.RngBase)
+
+
+def test_get_rng_missing_option_takes_default():
+    rng = get_rng("dice", dice_sides=20)
+
+    assert isinstance(rng, papass.random_source.DiceRng)
+    assert rng._num_sides == 20
+    assert not rng._recycle_entropy
+
+
+class ConstantRng(RngBase):
+    """A plugin for the tests below."""
+
+    cli_options = {"value": "value", "offset": "offset"}
+
+    def __init__(self, value: str = "0", offset: str = "0"):
+        self.value = int(value) + int(offset)
+
+    def randbelow(self, upper: int) -> int:
+        return self.value % upper
+
+
+@pytest.fixture
+def plugins(monkeypatch):
+    """Pretend that some packages provide random source plugins."""
+    entry_points = [
+        importlib.metadata.EntryPoint(name, value, ENTRY_POINT_GROUP)
+        for name, value in [
+            ("constant", f"{__name__}:ConstantRng"),
+            ("missing", "papass_no_such_plugin:Rng"),
+            ("not-an-rng", f"{__name__}:plugins"),
+            ("system", f"{__name__}:ConstantRng"),
+        ]
+    ]
+
+    def fake_entry_points(*, group):
+        return [ep for ep in entry_points if ep.group == group]
+
+    monkeypatch.setattr(importlib.metadata, "entry_points", fake_entry_points)
+    papass.random_source.registry._plugin_registry.cache_clear()
+    yield
+    papass.random_source.registry._plugin_registry.cache_clear()
+
+
+@pytest.mark.usefixtures("plugins")
+class TestPlugins:
+    def test_available_random_sources(self):
+        # Listing the plugins does not import them (`missing` would fail).
+        assert available_random_sources() == [
+            "system",
+            "system-buffered",
+            "dice",
+            "constant",
+            "missing",
+            "not-an-rng",
+        ]
+
+    def test_get_rng(self):
+        rng = get_rng("constant", dice_sides=6, rng_options={"value": "3", "offset": "4"})
+
+        assert isinstance(rng, ConstantRng)
+        assert rng.randbelow(10) == 7
+
+    def test_get_rng_missing_option_takes_default(self):
+        rng = get_rng("constant")
+
+        assert isinstance(rng, ConstantRng)
+        assert rng.value == 0
+
+    def test_plugin_cannot_replace_builtin(self):
+        assert isinstance(get_rng("system"), papass.random_source.SystemRng)
+
+    def test_unknown_rng_option(self):
+        with pytest.raises(AssertionError, match="Unknown --rng-option `foo`.*value, offset"):
+            get_rng("constant", rng_options={"foo": "1"})
+
+    def test_builtin_takes_no_rng_option(self):
+        with pytest.raises(AssertionError, match="`system` takes no --rng-option"):
+            get_rng("system", rng_options={"value": "1"})
+
+    def test_cannot_load(self):
+        with pytest.raises(AssertionError, match="Cannot load random source `missing`"):
+            get_rng("missing")
+
+    def test_not_an_rng(self):
+        with pytest.raises(AssertionError, match="`not-an-rng` .* is not a subclass of RngBase"):
+            get_rng("not-an-rng")
+
+    def test_unknown_random_source(self):
+        with pytest.raises(AssertionError, match="Unknown random source `foo`.*'constant'"):
+            get_rng("foo")
@@ -1,4 +1,5 @@
-from papass.random_source.system import SystemRng
+import pytest
+from papass.random_source.system import BufferedSystemRng, SystemRng
 
 
 def test_system():
@@ -6,3 +7,75 @@ def test_system():
 
     for _ in range(100):
         assert 0 <= rng.randbelow(5) < 5
+
+
+@pytest.mark.parametrize("upper", [1, 2, 5, 256, 257, 10**30])
+@pytest.mark.parametrize("count", [0, 1, 10_000])
+def test_randbelow_many(upper, count):
+    rng = SystemRng()
+    values = list(rng.randbelow_many(upper, count))
+
+    assert len(values) == count
+    assert all(0 <= v < upper for v in values)
+
+
+def test_randbelow_many_covers_range():
+    rng = SystemRng()
+    # Failure probability is about 5 * (4/5)**1000 (negligible):
+    assert set(rng.randbelow_many(5, 1000)) == set(range(5))
+
+
+@pytest.mark.parametrize("upper", [0, -1])
+def test_randbelow_many_invalid_upper(upper):
+    rng = SystemRng()
+
+    with pytest.raises(ValueError):
+        list(rng.randbelow_many(upper, 1))
+
+
+class TestBufferedSystemRng:
+    @pytest.mark.parametrize("upper", [1, 2, 5, 256, 257, 10**30])
+    def test_randbelow(self, upper):
+        rng = BufferedSystemRng(buffer_size=64)
+
+        for _ in range(100):
+            assert 0 <= rng.randbelow(upper) < upper
+
+    @pytest.mark.parametrize("buffer_size", [1, 7, 65536])
+    @pytest.mark.parametrize("upper", [5, 10**30])
+    def test_randbelow_many(self, buffer_size, upper):
+        rng = BufferedSystemRng(buffer_size=buffer_size)
+        values = list(rng.randbelow_many(upper, 1000))
+
+        assert len(values) == 1000
+        assert all(0 <= v < upper for v in values)
+
+    def test_covers_range(self):
+        rng = BufferedSystemRng(buffer_size=16)
+        assert {rng.randbelow(5) for _ in range(1000)} == set(range(5))
+
+    def test_wipes_consumed_bytes(self):
+        rng = BufferedSystemRng(buffer_size=128)
+        rng.randbelow(2**64)
+
+        # Eight bytes have been consumed (at least):
+        consumed = rng._buffer[: rng._position]
+        assert len(consumed) >= 8
+        assert consumed == bytes(len(consumed))
+
+    def test_discards_buffer_after_fork(self, monkeypatch):
+        rng = BufferedSystemRng(buffer_size=128)
+        rng.randbelow(10)
+        old_buffer = rng._buffer
+
+        monkeypatch.setattr("os.getpid", lambda: -1)
+        rng.randbelow(10)
+
+        assert rng._buffer is not old_buffer
+        assert old_buffer == bytes(len(old_buffer)), "Old buffer must be wiped."
+
+    def test_invalid_upper(self):
+        rng = BufferedSystemRng()
+
+        with pytest.raises(ValueError):
+            rng.randbelow(0)
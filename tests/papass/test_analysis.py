@@ -0,0 +1,90 @@
+import itertools
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+from papass import WordList
+from papass.analysis import count_passphrases, is_uniquely_decodable
+
+
+def brute_force_count(words: list[str], length: int, delimiter: str) -> int:
+    return len({delimiter.join(p) for p in itertools.product(words, repeat=length)})
+
+
+@given(
+    words=st.lists(st.text("ab", min_size=1, max_size=4), min_size=1, max_size=8),
+    length=st.integers(0, 4),
+    delimiter=st.sampled_from(["", "a", "-"]),
+)
+def test_same_as_brute_force(words, length, delimiter):
+    wordlist = WordList(words)
+    expected = brute_force_count(list(wordlist), length, delimiter)
+    assert count_passphrases(wordlist, length, delimiter) == expected
+
+
+@pytest.mark.parametrize(
+    ("words", "length", "expected"),
+    [
+        (["a", "aa"], 3, 4),  # a..aaa to aaaaaa, i.e. lengths 3 to 6
+        (["a", "b"], 10, 2**10),
+        (["a", "ab", "ba"], 2, 8),  # aba = a + ba = ab + a
+        ([], 2, 0),
+        ([], 0, 1),
+    ],
+)
+def test_examples(words, length, expected):
+    assert count_passphrases(WordList(words), length) == expected
+
+
+def test_prefix_free_is_fast():
+    words = [f"{i:06}" for i in range(100_000)]
+    assert count_passphrases(WordList(words), 10) == len(words) ** 10
+
+
+def test_max_states():
+    wordlist = WordList(["a", "aa", "aaa", "b", "ba", "bab"])
+    expected = brute_force_count(list(wordlist), 4, "")
+
+    assert count_passphrases(wordlist, 4, max_states=1) is None
+    assert count_passphrases(wordlist, 4, max_states=1000) == expected
+
+
+def test_negative_length():
+    with pytest.raises(AssertionError, match="must not be negative"):
+        count_passphrases(WordList(["foo"]), -1)
+
+
+@given(
+    words=st.lists(st.text("ab", min_size=1, max_size=4), min_size=1, max_size=8),
+    delimiter=st.sampled_from(["", "a", "-"]),
+)
+def test_uniquely_decodable_implies_full_count(words, delimiter):
+    wordlist = WordList(words)
+    if is_uniquely_decodable(wordlist, delimiter):
+        for length in range(4):
+            assert brute_force_count(list(wordlist), length, delimiter) == len(wordlist) ** length
+
+
+@pytest.mark.parametrize(
+    ("words", "delimiter", "expected"),
+    [
+        (["foo", "bar", "foobar", "barfoo"], "", False),
+        (["foo", "bar", "foobar", "barfoo"], " ", True),
+        (["foo", "bar", "foobar", "barfoo"], "o", True),  # The delimiter occurs in words
+        (["a", "ab", "bb"], "", True),  # Not prefix-free but uniquely decodable
+        (["a", "ab", "b"], "", False),
+        (["0", "01", "110"], "", True),
+        (["0", "01", "10"], "", False),  # 010 = 0 + 10 = 01 + 0
+        (["ab", "abba", "babab"], "", False),  # Only ambiguous from 4 words on
+        ([], "", True),
+    ],
+)
+def test_uniquely_decodable_examples(words, delimiter, expected):
+    assert is_uniquely_decodable(words, delimiter) == expected
+
+
+def test_uniquely_decodable_large():
+    # Many words are prefixes of other words, but no word is a suffix of another one.
+    words = [f"{i}x" + "y" * (i % 7) for i in range(100_000)]
+    assert is_uniquely_decodable(words)
+    assert not is_uniquely_decodable([*words, "1x", "y"])
@@ -0,0 +1,147 @@
+import asyncio
+import math
+import re
+import threading
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
+
+import papass.passphrase_generator
+import pytest
+from papass import (
+    AsyncPassphraseGenerator,
+    AsyncPasswordGenerator,
+    AsyncRngBase,
+    AsyncRngWrapper,
+    PassphraseGenerator,
+    PasswordGenerator,
+    WordList,
+)
+
+from tests.utils.cycle_rng import CycleRng
+
+
+class CountingRng(AsyncRngBase):
+    """Counts how many integers were drawn."""
+
+    def __init__(self) -> None:
+        self.num_drawn = 0
+
+    async def randbelow(self, upper: int) -> int:
+        self.num_drawn += 1
+        return 0
+
+
+async def _collect(iterator: AsyncIterator[Any]) -> list[Any]:
+    return [r async for r in iterator]
+
+
+class TestAsyncPassphraseGenerator:
+    @pytest.fixture
+    def wordlist(self):
+        return WordList(["foo", "bar", "baz"])
+
+    @pytest.mark.parametrize("count", [0, 1, 5, 2100])
+    def test_same_as_sync(self, wordlist, count):
+        cycle = [0, 5, 26, 3, 17]
+        ppg = PassphraseGenerator(wordlist=wordlist, rng=CycleRng(cycle), delimiter="-")
+        appg = AsyncPassphraseGenerator(
+            wordlist=wordlist, rng=AsyncRngWrapper(CycleRng(cycle)), delimiter="-"
+        )
+
+        results = asyncio.run(_collect(appg.generate_many(3, count)))
+
+        assert results == list(ppg.generate_many(3, count))
+
+    def test_generate(self, wordlist):
+        appg = AsyncPassphraseGenerator(wordlist=wordlist, rng=AsyncRngWrapper(CycleRng([7])))
+
+        result = asyncio.run(appg.generate(2))
+
+        assert result.passphrase == "foo baz"
+        assert result.entropy == pytest.approx(2 * 1.5849625)
+        assert result.entropy_is_guaranteed
+
+    @pytest.mark.parametrize("binary", [False, True])
+    def test_thread_executor(self, tmp_path, wordlist, binary):
+        if binary:
+            wordlist.to_binary_file(tmp_path / "wordlist.ppwl")
+            wordlist = WordList.from_file(tmp_path / "wordlist.ppwl")
+
+        with ThreadPoolExecutor(2) as executor:
+            appg = AsyncPassphraseGenerator(
+                wordlist=wordlist, rng=AsyncRngWrapper(CycleRng([1, 2])), executor=executor
+            )
+            results = asyncio.run(_collect(appg.generate_many(1, 4, batch_size=3)))
+
+        assert [r.passphrase for r in results] == ["baz", "foo", "baz", "foo"]
+
+    def test_process_executor_is_rejected(self, wordlist):
+        error = "cannot be decoded in a process pool"
+        with ProcessPoolExecutor(1) as executor, pytest.raises(AssertionError, match=error):
+            AsyncPassphraseGenerator(
+                wordlist=wordlist, rng=AsyncRngWrapper(CycleRng([1])), executor=executor
+            )
+
+    def test_exact_entropy_not_on_event_loop(self, monkeypatch):
+        threads = []
+
+        def count_passphrases(*args: Any, **kwargs: Any) -> int:
+            threads.append(threading.current_thread())
+            return 14
+
+        monkeypatch.setattr(papass.passphrase_generator, "count_passphrases", count_passphrases)
+        appg = AsyncPassphraseGenerator(
+            wordlist=WordList(["foo", "bar", "foobar", "barfoo"]),
+            rng=AsyncRngWrapper(CycleRng([0])),
+            delimiter="",
+            exact_entropy=True,
+        )
+
+        result = asyncio.run(appg.generate(2))
+
+        assert result.entropy == pytest.approx(math.log2(14))
+        assert threads and threading.main_thread() not in threads
+
+    def test_backpressure(self, wordlist):
+        rng = CountingRng()
+        appg = AsyncPassphraseGenerator(wordlist=wordlist, rng=rng)
+
+        async def take_one() -> Any:
+            results = appg.generate_many(1, 1000, batch_size=10)
+            return await anext(results)
+
+        asyncio.run(take_one())
+
+        assert rng.num_drawn == 10
+
+    @pytest.mark.parametrize(
+        "count,batch_size,error",
+        [(-1, 1, "--count must not be negative."), (1, 0, "batch_size must be positive.")],
+    )
+    def test_invalid_options(self, wordlist, count, batch_size, error):
+        appg = AsyncPassphraseGenerator(wordlist=wordlist, rng=CountingRng())
+
+        with pytest.raises(AssertionError, match=error):
+            appg.generate_many(1, count, batch_size=batch_size)
+
+
+class TestAsyncPasswordGenerator:
+    @pytest.mark.parametrize("count", [0, 3, 1500])
+    def test_same_as_sync(self, count):
+        cycle = [11, 2, 1000, 7]
+        pwg = PasswordGenerator(alphabet="abcd", rng=CycleRng(cycle))
+        apwg = AsyncPasswordGenerator(alphabet="abcd", rng=AsyncRngWrapper(CycleRng(cycle)))
+
+        results = asyncio.run(_collect(apwg.generate_many(6, count)))
+
+        assert results == list(pwg.generate_many(6, count))
+
+    def test_generate(self):
+        apwg = AsyncPasswordGenerator(alphabet="ab", rng=AsyncRngWrapper(CycleRng([5])))
+
+        result = asyncio.run(apwg.generate(4))
+
+        assert re.match(r"^[ab]{4}$", result.password)
+        assert result.password == "abab"
+        assert result.entropy == pytest.approx(4.0)
@@ -0,0 +1,183 @@
+from array import array
+
+import papass.analysis
+import pytest
+from papass.binary_wordlist import (
+    _HEADER_V1,
+    _HEADER_V2,
+    MAGIC,
+    MappedWords,
+    is_binary_wordlist_file,
+    write_binary_wordlist,
+)
+from papass.wordlist import WordList
+
+
+@pytest.fixture
+def words() -> list[str]:
+    return sorted(["bär", "foo", "a", "zzzzz", "über", "1234"])
+
+
+@pytest.fixture
+def file_path(tmp_path, words):
+    file_path = tmp_path / "wordlist.ppwl"
+    write_binary_wordlist(words, file_path)
+    return file_path
+
+
+class TestMappedWords:
+    def test_sequence(self, file_path, words):
+        mapped = MappedWords(file_path)
+
+        assert len(mapped) == len(words)
+        assert list(mapped) == words
+        assert [mapped[-i] for i in range(1, len(words) + 1)] == words[::-1]
+        assert mapped[1:4] == words[1:4]
+
+    @pytest.mark.parametrize("index", [6, -7])
+    def test_index_error(self, file_path, index):
+        with pytest.raises(IndexError):
+            MappedWords(file_path)[index]
+
+    def test_word_sizes(self, file_path):
+        mapped = MappedWords(file_path)
+
+        assert mapped.min_word_size == 1
+        assert mapped.max_word_size == 5
+
+    def test_characters(self, file_path, words):
+        assert MappedWords(file_path).characters == frozenset("".join(words))
+
+    def test_empty(self, tmp_path):
+        file_path = tmp_path / "empty.ppwl"
+        write_binary_wordlist([], file_path)
+
+        assert list(MappedWords(file_path)) == []
+        assert MappedWords(file_path).characters == frozenset()
+
+    def test_version_1(self, tmp_path, words):
+        """Files without charset can still be read."""
+        file_path = tmp_path / "v1.ppwl"
+        encoded = [w.encode() for w in words]
+        offsets = array("Q", [0])
+        for word in encoded:
+            offsets.append(offsets[-1] + len(word))
+
+        with open(file_path, "wb") as fout:
+            fout.write(_HEADER_V1.pack(MAGIC, 1, len(words), 1, 5))
+            fout.write(offsets.tobytes())
+            fout.writelines(encoded)
+
+        mapped = MappedWords(file_path)
+        assert list(mapped) == words
+        assert mapped.characters is None
+        assert WordList.from_binary_file(file_path).characters == set("".join(words))
+
+    def test_version_2(self, tmp_path, words):
+        """Files without the flag for unique decodability can still be read."""
+        file_path = tmp_path / "v2.ppwl"
+        encoded = [w.encode() for w in words]
+        offsets = array("Q", [0])
+        for word in encoded:
+            offsets.append(offsets[-1] + len(word))
+        charset = "".join(sorted(set("".join(words)))).encode()
+
+        with open(file_path, "wb") as fout:
+            fout.write(_HEADER_V2.pack(MAGIC, 2, len(words), 1, 5, len(charset)))
+            fout.write(offsets.tobytes())
+            fout.writelines(encoded)
+            fout.write(charset)
+
+        mapped = MappedWords(file_path)
+        assert list(mapped) == words
+        assert mapped.characters == frozenset("".join(words))
+        assert mapped.uniquely_decodable is None
+        assert WordList.from_binary_file(file_path).is_uniquely_decodable()
+
+    @pytest.mark.parametrize("uniquely_decodable", [None, False, True])
+    def test_uniquely_decodable(self, tmp_path, words, uniquely_decodable):
+        file_path = tmp_path / "wordlist.ppwl"
+        write_binary_wordlist(words, file_path, uniquely_decodable=uniquely_decodable)
+
+        assert MappedWords(file_path).uniquely_decodable is uniquely_decodable
+
+    def test_unsupported_version(self, tmp_path):
+        file_path = tmp_path / "v99.ppwl"
+        file_path.write_bytes(_HEADER_V1.pack(MAGIC, 99, 0, 0, 0) + bytes(16))
+
+        with pytest.raises(AssertionError, match="Unsupported binary wordlist version 99"):
+            MappedWords(file_path)
+
+    def test_no_binary_wordlist(self, tmp_path):
+        file_path = tmp_path / "wordlist.txt"
+        file_path.write_text("foo\nbar\nbaz\nfoobarbaz")
+
+        assert not is_binary_wordlist_file(file_path)
+        with pytest.raises(AssertionError, match="Not a binary wordlist"):
+            MappedWords(file_path)
+
+
+class TestWordListBinaryFile:
+    def test_roundtrip(self, tmp_path, words):
+        file_path = tmp_path / "wordlist.ppwl"
+        wordlist = WordList(words)
+        wordlist.to_binary_file(file_path)
+
+        assert is_binary_wordlist_file(file_path)
+        assert WordList.from_binary_file(file_path) == wordlist
+        assert WordList.from_file(file_path) == wordlist
+
+    def test_is_not_copied(self, file_path):
+        wordlist = WordList.from_binary_file(file_path, min_word_size=1, max_word_size=10)
+        assert isinstance(wordlist._words, MappedWords)
+
+    def test_characters_are_not_recomputed(self, file_path, words, monkeypatch):
+        wordlist = WordList.from_binary_file(file_path)
+        monkeypatch.setattr(wordlist, "_words", None)  # Scanning the words would fail.
+
+        assert wordlist.characters == set("".join(words))
+
+    def test_characters_after_filtering(self, file_path):
+        wordlist = WordList.from_binary_file(file_path, min_word_size=4)
+
+        assert wordlist.characters == set("1234zzzzzüber")
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            dict(min_word_size=3),
+            dict(max_word_size=3),
+            dict(min_word_size=2, max_word_size=4),
+            dict(remove_leading_digits=True),
+        ],
+    )
+    def test_options(self, file_path, words, options):
+        assert WordList.from_file(file_path, **options) == WordList(words, **options)
+
+    def test_invalid_options(self, file_path):
+        with pytest.raises(AssertionError):
+            WordList.from_binary_file(file_path, min_word_size=0)
+
+    @pytest.mark.parametrize(
+        "words, expected", [(["foo", "bar", "foobar"], False), (["ab", "ba", "abb"], True)]
+    )
+    def test_uniquely_decodable_is_stored(self, tmp_path, monkeypatch, words, expected):
+        file_path = tmp_path / "wordlist.ppwl"
+        WordList(words).to_binary_file(file_path)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("Must not be recomputed.")
+
+        monkeypatch.setattr(papass.analysis, "is_uniquely_decodable", fail)
+        assert WordList.from_binary_file(file_path).is_uniquely_decodable() is expected
+
+    def test_uniquely_decodable_after_filtering(self, tmp_path, monkeypatch):
+        file_path = tmp_path / "wordlist.ppwl"
+        WordList(["ab", "ba", "abb", "babbb"]).to_binary_file(file_path)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("Must not be recomputed.")
+
+        monkeypatch.setattr(papass.analysis, "is_uniquely_decodable", fail)
+        # Fewer words of a uniquely decodable list are still uniquely decodable:
+        assert WordList.from_binary_file(file_path, max_word_size=3).is_uniquely_decodable()
@@ -0,0 +1,31 @@
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+from papass.compact_words import FrontCodedWords
+
+
+@given(
+    words=st.lists(st.text(st.sampled_from("abä€😀"), max_size=6), unique=True).map(sorted),
+    block_size=st.integers(1, 5),
+)
+def test_same_as_list(words, block_size):
+    compact = FrontCodedWords(words, block_size=block_size)
+
+    assert len(compact) == len(words)
+    assert list(compact) == words
+    assert [compact[i] for i in range(len(words))] == words
+    assert [compact[-i] for i in range(1, len(words) + 1)] == [
+        words[-i] for i in range(1, len(words) + 1)
+    ]
+    assert compact[1:-1:2] == words[1:-1:2]
+
+
+@pytest.mark.parametrize("index", [3, -4])
+def test_index_out_of_range(index):
+    with pytest.raises(IndexError):
+        FrontCodedWords(["a", "b", "c"])[index]
+
+
+def test_invalid_block_size():
+    with pytest.raises(AssertionError, match="block_size must be positive"):
+        FrontCodedWords(["a"], block_size=0)
@@ -0,0 +1,70 @@
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+from papass.length_index import LengthFilteredWords, LengthIndex
+from papass.wordlist import WordList
+
+st_words = st.lists(st.text("ab", max_size=5), unique=True).map(sorted)
+st_max_size = st.none() | st.integers(0, 6)
+
+
+@given(words=st_words, min_size=st.integers(0, 6), max_size=st_max_size)
+def test_same_as_filtering(words, min_size, max_size):
+    expected = [w for w in words if min_size <= len(w) <= (max_size if max_size is not None else 9)]
+    index = LengthIndex(words)
+
+    assert index.count(min_size, max_size) == len(expected)
+
+    view = LengthFilteredWords(words, index, min_size, max_size)
+    assert len(view) == len(expected)
+    assert list(view) == expected
+    assert [view[i] for i in range(len(view))] == expected
+    assert list(view) == expected  # Now iterating over the positions
+    assert view[::2] == expected[::2]
+
+
+@given(
+    words=st_words,
+    sizes_1=st.tuples(st.integers(0, 6), st_max_size),
+    sizes_2=st.tuples(st.integers(0, 6), st_max_size),
+)
+def test_filtered_twice(words, sizes_1, sizes_2):
+    view = LengthFilteredWords(words, LengthIndex(words), *sizes_1)
+    twice = view.filtered(*sizes_2)
+    expected = LengthFilteredWords(list(view), LengthIndex(list(view)), *sizes_2)
+
+    assert list(twice) == list(expected)
+    assert len(twice) == len(expected)
+
+
+def test_index_out_of_range():
+    words = ["a", "bb", "cc"]
+    view = LengthFilteredWords(words, LengthIndex(words), 2, None)
+
+    with pytest.raises(IndexError):
+        view[2]
+
+
+class TestWordList:
+    def test_views_share_words(self):
+        base = WordList(["a", "ab", "abc", "b", "bc"])
+        wordlist_1 = WordList._from_sorted(base._words)
+        wordlist_2 = WordList._from_sorted(base._words)
+        wordlist_1._length_index = wordlist_2._length_index = LengthIndex(base._words)
+
+        wordlist_1._filter_word_sizes(2, None)
+        wordlist_2._filter_word_sizes(1, 2)
+        wordlist_2._filter_word_sizes(2, 3)
+
+        assert wordlist_1 == WordList(["ab", "abc", "bc"])
+        assert wordlist_2 == WordList(["ab", "bc"])
+        assert isinstance(wordlist_1._words, LengthFilteredWords)
+        assert isinstance(wordlist_2._words, LengthFilteredWords)
+        assert wordlist_1._words._words is wordlist_2._words._words is base._words
+
+    def test_no_copy_if_nothing_is_removed(self):
+        words = ["a", "ab", "abc"]
+        wordlist = WordList._from_sorted(words)
+        wordlist._filter_word_sizes(1, 3)
+
+        assert wordlist._words is words
@@ -0,0 +1,104 @@
+import csv
+import io
+import json
+from typing import Any
+
+import pytest
+from papass.output import (
+    CHUNK_SIZE,
+    available_output_formats,
+    get_output_writer,
+    open_output,
+)
+from papass.passphrase_generator import PassphraseResult
+from papass.password_generator import PasswordResult
+
+PASSPHRASES = [
+    PassphraseResult(passphrase="foo bar", entropy=2.0, entropy_is_guaranteed=True),
+    PassphraseResult(passphrase="bar,foo", entropy=2.0, entropy_is_guaranteed=False),
+]
+PASSWORDS = [PasswordResult(password="ab", entropy=2.0), PasswordResult(password="ba", entropy=2.0)]
+
+
+def _write(output_format: str, results: list[Any]) -> tuple[str, Any]:
+    stream = io.StringIO()
+    last = get_output_writer(output_format, stream).write_all(iter(results))
+    return stream.getvalue(), last
+
+
+def test_available_output_formats():
+    assert available_output_formats() == ["plain", "jsonl", "csv", "nul"]
+
+
+@pytest.mark.parametrize(
+    "results,expected",
+    [(PASSPHRASES, "foo bar\nbar,foo\n"), (PASSWORDS, "ab\nba\n")],
+)
+def test_plain(results, expected):
+    output, last = _write("plain", results)
+
+    assert output == expected
+    assert last == results[-1]
+
+
+def test_nul():
+    output, _ = _write("nul", PASSWORDS)
+
+    assert output == "ab\0ba\0"
+
+
+def test_jsonl():
+    output, _ = _write("jsonl", PASSPHRASES)
+
+    assert [json.loads(line) for line in output.splitlines()] == [
+        dict(passphrase="foo bar", entropy=2.0, entropy_is_guaranteed=True),
+        dict(passphrase="bar,foo", entropy=2.0, entropy_is_guaranteed=False),
+    ]
+
+
+def test_csv():
+    output, _ = _write("csv", PASSPHRASES)
+
+    assert list(csv.reader(io.StringIO(output))) == [
+        ["passphrase", "entropy", "entropy_is_guaranteed"],
+        ["foo bar", "2.0", "True"],
+        ["bar,foo", "2.0", "False"],
+    ]
+
+
+def test_csv_header_once():
+    results = [PasswordResult(password=str(i), entropy=1.0) for i in range(2 * CHUNK_SIZE + 1)]
+
+    output, _ = _write("csv", results)
+
+    rows = list(csv.reader(io.StringIO(output)))
+    assert rows[0] == ["password", "entropy"]
+    assert len(rows) == len(results) + 1
+    assert [r[0] for r in rows[1:]] == [r.password for r in results]
+
+
+@pytest.mark.parametrize("output_format", ["plain", "jsonl", "csv", "nul"])
+def test_no_results(output_format):
+    assert _write(output_format, []) == ("", None)
+
+
+def test_unknown_format():
+    with pytest.raises(AssertionError, match="Unknown output format `xml`"):
+        get_output_writer("xml", io.StringIO())
+
+
+def test_open_output_file(tmp_path):
+    file_path = tmp_path / "out.txt"
+
+    with open_output(file_path) as stream:
+        get_output_writer("plain", stream).write_all(PASSWORDS)
+
+    assert file_path.read_bytes() == b"ab\nba\n"
+
+
+@pytest.mark.parametrize("file_path", [None, "-"])
+def test_open_output_stdout(capsys, file_path):
+    with open_output(file_path) as stream:
+        get_output_writer("plain", stream).write_all(PASSWORDS)
+
+    assert capsys.readouterr().out == "ab\nba\n"
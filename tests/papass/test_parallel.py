@@ -0,0 +1,110 @@
+import math
+import re
+
+import papass.passphrase_generator
+import pytest
+from papass import ParallelPassphraseGenerator, ParallelPasswordGenerator, WordList
+from papass.parallel import _generate_chunk, _init_passphrase_worker
+
+
+@pytest.fixture
+def wordlist():
+    return WordList(["foo", "bar", "baz"])
+
+
+class TestParallelPassphraseGenerator:
+    def test_exact_entropy(self):
+        wordlist = WordList(["foo", "bar", "foobar", "barfoo"])
+        ppg = ParallelPassphraseGenerator(
+            wordlist=wordlist, workers=2, delimiter="", exact_entropy=True, chunk_size=2
+        )
+
+        results = list(ppg.generate_many(2, 5))
+
+        assert [r.entropy for r in results] == pytest.approx([math.log2(14)] * 5)
+        assert not any(r.entropy_is_guaranteed for r in results)
+
+    def test_worker_does_not_count_passphrases(self, tmp_path, monkeypatch):
+        wordlist_file = tmp_path / "wordlist.ppwl"
+        WordList(["a", "aa"]).to_binary_file(wordlist_file)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("Must not count in the worker.")
+
+        monkeypatch.setattr(papass.passphrase_generator, "count_passphrases", fail)
+        _init_passphrase_worker(wordlist_file, "system", {}, "", {3: (2.0, True)})
+
+        results = _generate_chunk(3, 2)
+
+        assert [(r.entropy, r.entropy_is_guaranteed) for r in results] == [(2.0, True)] * 2
+
+    @pytest.mark.parametrize("ordered", [True, False])
+    @pytest.mark.parametrize("count", [0, 1, 7, 50])
+    def test_generate_many(self, wordlist, ordered, count):
+        ppg = ParallelPassphraseGenerator(wordlist=wordlist, workers=2, delimiter="-", chunk_size=4)
+
+        results = list(ppg.generate_many(3, count, ordered=ordered))
+
+        assert len(results) == count
+        for result in results:
+            assert re.match(r"^(foo|bar|baz)(-foo|-bar|-baz){2}$", result.passphrase)
+            assert result.entropy == pytest.approx(3 * 1.5849625)
+            assert result.entropy_is_guaranteed
+
+    def test_workers_draw_independently(self, wordlist):
+        ppg = ParallelPassphraseGenerator(wordlist=wordlist, workers=4, chunk_size=100)
+
+        passphrases = [r.passphrase for r in ppg.generate_many(20, 400)]
+
+        # 3**20 possibilities: Duplicates would mean that workers share a random stream.
+        assert len(set(passphrases)) == 400
+
+    def test_stop_early(self, wordlist):
+        ppg = ParallelPassphraseGenerator(wordlist=wordlist, workers=2, chunk_size=10)
+        results = ppg.generate_many(2, 10**9)
+
+        assert len([next(results) for _ in range(25)]) == 25
+        del results  # Closes the generator. Must not generate the remaining passphrases.
+
+    def test_system_buffered(self, wordlist):
+        ppg = ParallelPassphraseGenerator(
+            wordlist=wordlist, workers=2, random_source="system-buffered", chunk_size=5
+        )
+
+        assert len(list(ppg.generate_many(4, 20))) == 20
+
+    @pytest.mark.parametrize(
+        "options,error",
+        [
+            (dict(workers=0), "--workers must be positive."),
+            (dict(chunk_size=0), "chunk_size must be positive."),
+            (dict(random_source="dice", dice_sides=6), "Random source `dice` cannot be used"),
+            (dict(delimiter="ab"), "--delimiter must be single character or empty."),
+        ],
+    )
+    def test_invalid_options(self, wordlist, options, error):
+        with pytest.raises(AssertionError, match=re.escape(error)):
+            ParallelPassphraseGenerator(wordlist=wordlist, **options)
+
+    def test_negative_count(self, wordlist):
+        ppg = ParallelPassphraseGenerator(wordlist=wordlist, workers=1)
+
+        with pytest.raises(AssertionError, match="--count must not be negative."):
+            ppg.generate_many(3, -1)
+
+
+class TestParallelPasswordGenerator:
+    @pytest.mark.parametrize("ordered", [True, False])
+    def test_generate_many(self, ordered):
+        pwg = ParallelPasswordGenerator(alphabet="abcd", workers=3, chunk_size=3)
+
+        results = list(pwg.generate_many(10, 20, ordered=ordered))
+
+        assert len(results) == 20
+        for result in results:
+            assert re.match(r"^[abcd]{10}$", result.password)
+            assert result.entropy == pytest.approx(20.0)
+
+    def test_empty_alphabet(self):
+        with pytest.raises(AssertionError, match="Alphabet must not be empty."):
+            ParallelPasswordGenerator(alphabet="")
@@ -1,5 +1,8 @@
+import itertools
+import math
 import string
 
+import papass.passphrase_generator
 import pytest
 from hypothesis import HealthCheck, given, settings
 from hypothesis import strategies as st
@@ -79,6 +82,35 @@ class TestPassphraseGenerator:
         assert ppg.generate(3).passphrase == delimiter.join("aaa")
 
 
+class TestGenerateMany:
+    @pytest.fixture
+    def wordlist(self):
+        return WordList(list("abcdefgh"))
+
+    @pytest.mark.parametrize("count", [0, 1, 5])
+    def test_same_as_generate(self, wordlist, count):
+        cycle = [3, 141, 592, 653, 589]
+        ppg_many = PassphraseGenerator(wordlist=wordlist, rng=CycleRng(cycle))
+        ppg_single = PassphraseGenerator(wordlist=wordlist, rng=CycleRng(cycle))
+
+        results = list(ppg_many.generate_many(4, count))
+
+        assert len(results) == count
+        assert results == [ppg_single.generate(4) for _ in range(count)]
+
+    def test_is_lazy(self, wordlist):
+        ppg = PassphraseGenerator(wordlist=wordlist, rng=CycleRng([0]))
+        results = ppg.generate_many(3, 10**18)
+
+        assert next(results).passphrase == "a a a"
+
+    def test_negative_count(self, wordlist):
+        ppg = PassphraseGenerator(wordlist=wordlist, rng=CycleRng([0]))
+
+        with pytest.raises(AssertionError):
+            ppg.generate_many(3, -1)
+
+
 class TestEntropyGuarantee:
     """Test correctness of entropy guarantee.
 
@@ -136,3 +168,42 @@ class TestEntropyGuarantee:
 
         assert result_1.entropy_is_guaranteed
         assert not result_2.entropy_is_guaranteed
+
+    @pytest.mark.parametrize("delimiter", ["", "a", "b", " "])
+    def test_exact_entropy(self, wordlist, delimiter):
+        ppg = PassphraseGenerator(
+            wordlist=wordlist, delimiter=delimiter, rng=CycleRng([0]), exact_entropy=True
+        )
+        passphrases = {delimiter.join(words) for words in itertools.product(wordlist, repeat=3)}
+
+        result = ppg.generate(3)
+
+        # Ambiguous passphrases are more likely than others, the count is an upper bound then.
+        assert result.entropy_is_guaranteed == (len(passphrases) == len(wordlist) ** 3)
+        assert result.entropy == pytest.approx(math.log2(len(passphrases)))
+
+    def test_exact_entropy_only_longer_passphrases_ambiguous(self):
+        # Only passphrases of three or more words are ambiguous (e.g. ``a, b, a = ab, a``).
+        wordlist = WordList(["a", "b", "ab"])
+        ppg = PassphraseGenerator(
+            wordlist=wordlist, delimiter="", rng=CycleRng([0]), exact_entropy=True
+        )
+
+        result_2 = ppg.generate(2)
+        result_3 = ppg.generate(3)
+
+        assert (result_2.entropy, result_2.entropy_is_guaranteed) == (math.log2(9), True)
+        assert result_3.entropy == pytest.approx(math.log2(26))
+        assert not result_3.entropy_is_guaranteed
+
+    def test_exact_entropy_too_expensive(self, wordlist, monkeypatch):
+        monkeypatch.setattr(papass.passphrase_generator, "MAX_STATES", 1)
+        ppg = PassphraseGenerator(
+            wordlist=wordlist, delimiter="", rng=CycleRng([0]), exact_entropy=True
+        )
+
+        result = ppg.generate(3)
+
+        # Counting gives up, hence the usual estimate is kept.
+        assert result.entropy == pytest.approx(3 * math.log2(len(wordlist)))
+        assert not result.entropy_is_guaranteed
@@ -103,3 +103,22 @@ def test_valid_alphabets(alphabet):
 def test_invalid_alphabets(alphabet):
     with pytest.raises(AssertionError):
         PasswordGenerator(alphabet=alphabet, rng=CycleRng(range(4)))
+
+
+@pytest.mark.parametrize("count", [0, 1, 5])
+def test_generate_many(alphabet, count):
+    cycle = [27, 1828, 1828, 459045]
+    pwg_many = PasswordGenerator(alphabet=alphabet, rng=CycleRng(cycle))
+    pwg_single = PasswordGenerator(alphabet=alphabet, rng=CycleRng(cycle))
+
+    results = list(pwg_many.generate_many(7, count))
+
+    assert len(results) == count
+    assert results == [pwg_single.generate(7) for _ in range(count)]
+
+
+def test_generate_many_negative_count(alphabet):
+    pwg = PasswordGenerator(alphabet=alphabet, rng=CycleRng([0]))
+
+    with pytest.raises(AssertionError):
+        pwg.generate_many(7, -1)
@@ -0,0 +1,151 @@
+import asyncio
+import json
+import re
+from pathlib import Path
+from typing import Any
+
+import pytest
+from papass.server import PapassServer
+from papass.wordlist_cache import WordListCache
+
+
+@pytest.fixture
+def wordlist_file(tmp_path):
+    file_path = tmp_path / "wordlist.txt"
+    file_path.write_text("foo\nbar\n")
+    return str(file_path)
+
+
+@pytest.fixture
+def server(wordlist_file):
+    return PapassServer(wordlists={"foobar": wordlist_file}, max_count=100, max_length=50)
+
+
+class TestHandleRequest:
+    def test_pp(self, server, wordlist_file):
+        response = server.handle_request(
+            dict(command="pp", length=3, wordlist="foobar", delimiter="-", count=5)
+        )
+
+        results = response["results"]
+        assert len(results) == 5
+        for result in results:
+            assert re.match(r"^(foo|bar)(-foo|-bar){2}$", result["passphrase"])
+            assert result["entropy"] == pytest.approx(3.0)
+            assert result["entropy_is_guaranteed"]
+
+    def test_pw(self, server):
+        response = server.handle_request(dict(command="pw", length=10, alpha_include="ab"))
+
+        (result,) = response["results"]
+        assert re.match(r"^[ab]{10}$", result["password"])
+        assert result["entropy"] == pytest.approx(10.0)
+
+    def test_wordlist_is_loaded_once(self, server, monkeypatch):
+        request = dict(command="pp", length=1, wordlist="foobar")
+        server.handle_request(request)
+
+        monkeypatch.setattr("papass.wordlist.WordList.from_file", None)
+        assert "results" in server.handle_request(request)
+
+    def test_wordlist_is_reloaded_on_change(self, server, wordlist_file):
+        request = dict(command="pp", length=1, wordlist="foobar")
+        server.handle_request(request)
+
+        with open(wordlist_file, "w") as f:
+            f.write("changedword")
+
+        (result,) = server.handle_request(request)["results"]
+        assert result["passphrase"] == "changedword"
+
+    def test_wordlist_cache(self, tmp_path, wordlist_file):
+        cache = WordListCache(tmp_path / "cache")
+        server = PapassServer(wordlists={"foobar": wordlist_file}, wordlist_cache=cache)
+        server.handle_request(dict(command="pp", length=1, wordlist="foobar"))
+
+        assert len(cache._entries()) == 1
+
+    def test_wordlists_are_loaded_at_startup(self, wordlist_file, monkeypatch):
+        server = PapassServer(wordlists={"foobar": wordlist_file})
+
+        monkeypatch.setattr("papass.wordlist.WordList.from_file", None)
+        assert "results" in server.handle_request(dict(command="pp", length=1, wordlist="foobar"))
+
+    def test_missing_wordlist_at_startup(self, tmp_path):
+        with pytest.raises(AssertionError, match="Wordfile of `foo` does not exist"):
+            PapassServer(wordlists={"foo": tmp_path / "foo.txt"})
+
+    def test_deleted_wordlist(self, server, wordlist_file):
+        Path(wordlist_file).unlink()
+
+        response = server.handle_request(dict(command="pp", length=1, wordlist="foobar"))
+        assert "No such file" in response["error"]
+
+    @pytest.mark.parametrize(
+        "request_, error",
+        [
+            ([], "must be a JSON object"),
+            (dict(command="foo"), "Unknown command"),
+            (dict(command="pp", length=2), "wordlist"),
+            (dict(command="pp", length=2, wordlist="/etc/passwd"), "Unknown wordlist"),
+            (dict(command="pp", length=2, wordlist_file="/etc/passwd"), "wordlist_file"),
+            (dict(command="pp", length=10**9, wordlist="foobar"), "length must be"),
+            (dict(command="pw", length=51, alpha_include="a"), "length must be"),
+            (dict(command="pw", length="2", alpha_include="a"), "length must be"),
+            (dict(command="pw", length=2), "No alphabet given"),
+            (dict(command="pw", length=2, alpha_include="a", count=101), "count must be"),
+            (dict(command="pw", length=2, alpha_include="a", foo=1), "foo"),
+        ],
+    )
+    def test_errors(self, server, request_, error):
+        response = server.handle_request(request_)
+        assert error in response["error"]
+
+    def test_dice_not_supported(self):
+        with pytest.raises(AssertionError, match="cannot be used by a server"):
+            PapassServer(random_source="dice")
+
+
+def test_handle_line(server):
+    response = json.loads(
+        server.handle_line(b'{"command": "pw", "length": 4, "alpha_include": "x"}')
+    )
+    assert response == {"results": [{"password": "xxxx", "entropy": 0.0}]}
+
+    response = json.loads(server.handle_line(b"{not json"))
+    assert response["error"].startswith("Invalid JSON")
+
+
+def test_unix_socket_concurrent_clients(tmp_path, server, wordlist_file):
+    socket_path = str(tmp_path / "papass.sock")
+
+    async def client(request: dict[str, Any]) -> list[dict[str, Any]]:
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+        responses = []
+        for _ in range(3):
+            writer.write(json.dumps(request).encode() + b"\n")
+            await writer.drain()
+            responses.append(json.loads(await reader.readline()))
+        writer.close()
+        await writer.wait_closed()
+        return responses
+
+    async def main() -> list[list[dict[str, Any]]]:
+        serving = asyncio.create_task(server.serve_unix(socket_path))
+        while not (tmp_path / "papass.sock").exists():
+            await asyncio.sleep(0.01)
+
+        try:
+            return list(
+                await asyncio.gather(
+                    client(dict(command="pp", length=2, wordlist="foobar", count=10)),
+                    client(dict(command="pw", length=8, alpha_include="01")),
+                )
+            )
+        finally:
+            serving.cancel()
+
+    pp_responses, pw_responses = asyncio.run(main())
+
+    assert all(len(r["results"]) == 10 for r in pp_responses)
+    assert all(re.match(r"^[01]{8}$", r["results"][0]["password"]) for r in pw_responses)
@@ -1,8 +1,18 @@
+import io
+import random
+import re
+
 import pytest
+from papass.random_source import DiceRng
 from papass.utils import (
+    FileDiceSource,
     PowerSequence,
     QueryUserForDice,
+    batched,
+    bytes_to_digits_numpy,
     digits_to_value,
+    import_numpy,
+    mixed_radix_to_value,
     rolls_to_value,
     value_to_digits,
 )
@@ -35,6 +45,19 @@ def test_rolls_to_value(num_sides, rolls):
     assert expected == rolls_to_value(num_sides, rolls)
 
 
+@pytest.mark.parametrize(
+    "bases, digits, expected",
+    [
+        ([10, 10, 10], [9, 2, 3], 923),
+        ([6, 20], [5, 19], 5 * 20 + 19),
+        ([2, 3, 4], [1, 2, 3], (1 * 3 + 2) * 4 + 3),
+        ([], [], 0),
+    ],
+)
+def test_mixed_radix_to_value(bases, digits, expected):
+    assert expected == mixed_radix_to_value(bases, digits)
+
+
 @pytest.mark.parametrize(
     "value, base, length, expected",
     [
@@ -68,6 +91,20 @@ class TestQueryUserForDice:
         result = query_user(num_sides=6, required_num_rolls=3)
         assert result == expected
 
+    @pytest.mark.parametrize("show_sides, expected", [(False, "dice"), (True, "d20")])
+    def test_prompt(self, monkeypatch, show_sides, expected):
+        prompts = []
+        answers = iter(["20", "1 2"])
+
+        def fake_input(prompt):
+            prompts.append(prompt)
+            return next(answers)
+
+        monkeypatch.setattr("builtins.input", fake_input)
+        QueryUserForDice(show_sides=show_sides)(num_sides=20, required_num_rolls=3)
+
+        assert prompts == [f"Roll 3 {expected}: ", f"Roll remaining 2 {expected}: "]
+
     @pytest.mark.parametrize("user_input", [(["1 2 a"]), (["1 2"]), (["1 2", "foo"])])
     def test_invalid(self, monkeypatch, user_input):
         query_user = QueryUserForDice()
@@ -145,3 +182,125 @@ class TestPowerSequence:
     def test_big_examples(self, index, expected):
         ps = PowerSequence(range(10000), 10)
         assert expected == ps[index]
+
+    @pytest.mark.parametrize("use_numpy", [False, True])
+    @pytest.mark.parametrize(
+        "sequence, power",
+        [
+            ("ab", 1),
+            ("abcdefgh", 4),
+            (range(7776), 10),
+            (range(2**31 + 7), 3),
+            ("a", 5),
+            ("ab", 0),
+        ],
+    )
+    def test_get_many(self, use_numpy, sequence, power):
+        ps = PowerSequence(sequence, power)
+        rand = random.Random(42)
+        indices = [0, ps.size - 1] + [rand.randrange(ps.size) for _ in range(200)]
+
+        assert ps.get_many(indices, use_numpy=use_numpy) == [ps[i] for i in indices]
+
+    @pytest.mark.parametrize("use_numpy", [False, True])
+    @pytest.mark.parametrize("index", [-1, 8**3])
+    def test_get_many_out_of_range(self, use_numpy, index):
+        ps = PowerSequence("abcdefgh", 3)
+
+        with pytest.raises(IndexError):
+            ps.get_many([0] * 100 + [index], use_numpy=use_numpy)
+
+    def test_get_many_empty(self):
+        assert PowerSequence("ab", 3).get_many([]) == []
+
+
+def test_bytes_to_digits_numpy():
+    np = import_numpy()
+    if np is None:
+        pytest.skip("numpy not installed")
+
+    values = [0, 123, 4567, 9999]
+    data = b"".join(v.to_bytes(2, "big") for v in values)
+
+    digits = bytes_to_digits_numpy(np, data, num_bytes=2, base=10, length=4)
+
+    assert digits.shape == (4, 4)
+    assert digits.tolist() == [value_to_digits(v, base=10, length=4) for v in values]
+
+
+@pytest.mark.parametrize(
+    "iterable, size, expected",
+    [
+        (range(5), 2, [[0, 1], [2, 3], [4]]),
+        (range(4), 2, [[0, 1], [2, 3]]),
+        ([], 3, []),
+    ],
+)
+def test_batched(iterable, size, expected):
+    assert list(batched(iterable, size)) == expected
+
+
+class TestFileDiceSource:
+    def test_takes_exactly_the_required_rolls(self):
+        source = FileDiceSource(io.StringIO("1 2 3\n4 5 6\n\n2\n"))
+
+        assert source(num_sides=6, required_num_rolls=2) == [1, 2]
+        assert source(num_sides=6, required_num_rolls=3) == [3, 4, 5]
+        assert source(num_sides=6, required_num_rolls=2) == [6, 2]
+        assert source.num_consumed == 7
+        assert source.count_unused() == 0
+
+    def test_reads_lazily(self):
+        stream = io.StringIO("1 2\n3 4\n5 6\n")
+        source = FileDiceSource(stream)
+
+        source(num_sides=6, required_num_rolls=3)
+
+        assert stream.readline() == "5 6\n"
+
+    def test_comments(self):
+        source = FileDiceSource(io.StringIO("# Ceremony 2024\n1 2 # first\n#3\n4\n"))
+
+        assert source(num_sides=6, required_num_rolls=3) == [1, 2, 4]
+
+    def test_count_unused(self):
+        source = FileDiceSource(io.StringIO("1 2 3\n4 5\n"))
+        source(num_sides=6, required_num_rolls=2)
+
+        assert source.count_unused() == 3
+
+    def test_not_enough_rolls(self):
+        source = FileDiceSource(io.StringIO("1 2\n"))
+
+        with pytest.raises(AssertionError, match="The input ended after 2 rolls"):
+            source(num_sides=6, required_num_rolls=3)
+
+    @pytest.mark.parametrize("roll", ["7", "0", "-1", "x", "2.0"])
+    def test_invalid_roll(self, roll):
+        source = FileDiceSource(io.StringIO(f"1\n2 {roll}\n"))
+
+        with pytest.raises(
+            AssertionError, match=f"Invalid dice roll `{re.escape(roll)}` in line 2"
+        ):
+            source(num_sides=6, required_num_rolls=3)
+
+    def test_sides_are_checked_per_query(self):
+        source = FileDiceSource(io.StringIO("20 6"))
+
+        assert source(num_sides=20, required_num_rolls=1) == [20]
+        assert source(num_sides=6, required_num_rolls=1) == [6]
+
+    def test_line_too_long(self):
+        source = FileDiceSource(io.StringIO("1 2\n" + "3 " * 100), max_line_length=50)
+
+        assert source(num_sides=6, required_num_rolls=2) == [1, 2]
+        with pytest.raises(AssertionError, match="Line 2 of the dice rolls is longer than 50"):
+            source(num_sides=6, required_num_rolls=1)
+
+    def test_with_dice_rng(self):
+        # 1000 < 6**4: Rejects the first four rolls (value 1295 >= 1000)
+        source = FileDiceSource(io.StringIO("6 6 6 6\n1 1 1 2\n"))
+        rng = DiceRng(query_for_dice=source, required_success_probability=0.7)
+
+        assert rng.randbelow(1000) == 1
+        assert source.count_unused() == 0
@@ -1,6 +1,8 @@
 from types import SimpleNamespace
 
 import pytest
+from hypothesis import given
+from hypothesis import strategies as st
 from papass.wordlist import WordList
 
 
@@ -66,6 +68,22 @@ class TestInterface:
     def test_add(self, wordlist, other, result):
         assert wordlist + other == result
 
+    @pytest.mark.parametrize("step", [None, 1, 2, -1, -2])
+    def test_getitem_slice_step(self, wordlist, words, step):
+        assert list(wordlist[::step]) == sorted(sorted(words)[::step])
+
+    @given(
+        wordlists=st.lists(st.lists(st.text("abc", max_size=3)).map(WordList), max_size=4),
+        other=st.lists(st.text("abc", max_size=3)),
+    )
+    def test_union(self, wordlists, other):
+        expected = WordList([w for wordlist in wordlists for w in wordlist])
+        union = WordList.union(*wordlists)
+
+        assert union == expected
+        assert list(union) == list(expected)
+        assert list(union + other) == list(WordList([*expected, *other]))
+
     @pytest.mark.parametrize("other", ["a", 1])
     def test_add_value_error(self, wordlist, other):
         with pytest.raises(ValueError, match="Unsupported type"):
@@ -104,6 +122,39 @@ class TestInterface:
 
         assert wordlist_from_file == wordlist_ref
 
+    @pytest.mark.parametrize(
+        "line",
+        [
+            "1\tder",
+            "1\tder\t1000\t5",
+            "x\tder\t1000",
+            "1\t\t1000",
+            "1\tder\t10x",
+            "1 der 1000",
+        ],
+    )
+    def test_from_frequency_file_invalid_line(self, tmp_path, line):
+        file_path = tmp_path / "test.frequencylist.txt"
+
+        with open(file_path, "w") as fin:
+            fin.write(f"1\tfoo\t1\n{line}\n")
+
+        with pytest.raises(AssertionError, match="Line 1 .* does not match pattern"):
+            WordList.from_frequency_file(file_path)
+
+    def test_from_frequency_file_with_options(self, tmp_path):
+        file_path = tmp_path / "test.frequencylist.txt"
+
+        with open(file_path, "w") as fin:
+            for i, word in enumerate(["b", "foo bar", "123 abc", "ab", "abc", "a"]):
+                fin.write(f"{i}\t{word}\t{10 * i}\n")
+
+        wordlist_from_file = WordList.from_frequency_file(
+            file_path, min_frequency=10, min_word_size=2, remove_leading_digits=True
+        )
+
+        assert wordlist_from_file == WordList(["foo bar", "abc", "ab"])
+
     def test_to_file(self, tmp_path, words, wordlist):
         file_path = tmp_path / "test.wordlist"
 
@@ -175,3 +226,96 @@ class TestRemoveLeadingDigits:
         wl_no_trim = WordList(words.original, remove_leading_digits=False)
         assert wl_no_trim == WordList(words.original)
         assert wl_no_trim != WordList(words.trimmed)
+
+
+@pytest.mark.parametrize(
+    "words,options,expected",
+    [
+        ([], {}, ""),
+        (["foo", "bar"], {}, "abfor"),
+        (["foo", "bar", "a b"], dict(min_word_size=3), "abfor "),
+        (["foo", "bar", "a-b"], dict(max_word_size=2), ""),
+        (["1 foo", "2 bar"], dict(remove_leading_digits=True), "abfor"),
+    ],
+)
+def test_characters(words, options, expected):
+    assert WordList(words, **options).characters == set(expected)
+
+
+class TestIsUniquelyDecodable:
+    def test_simple(self):
+        wordlist = WordList(["foo", "bar", "foobar", "barfoo"])
+        assert not wordlist.is_uniquely_decodable()
+        assert wordlist.is_uniquely_decodable("-")
+
+    def test_is_cached(self, monkeypatch):
+        wordlist = WordList(["foo", "bar", "foobaz"])
+        assert wordlist.is_uniquely_decodable()
+
+        monkeypatch.setattr("papass.analysis.is_uniquely_decodable", None)
+        assert wordlist.is_uniquely_decodable()
+
+    def test_filtering_resets_cache(self):
+        wordlist = WordList(["a", "ab", "b"])
+        assert not wordlist.is_uniquely_decodable()
+
+        wordlist._filter_word_sizes(2, None)
+        assert wordlist.is_uniquely_decodable()
+
+
+class TestPrefixFree:
+    @pytest.mark.parametrize(
+        ("words", "expected"),
+        [
+            ([], []),
+            (["a"], ["a"]),
+            (["a", "ab", "abc", "abd", "b"], ["abc", "abd", "b"]),
+            (["ab", "b", "ba"], ["ab", "ba"]),
+        ],
+    )
+    def test_simple(self, words, expected):
+        assert WordList(words).prefix_free() == WordList(expected)
+
+    def test_is_uniquely_decodable(self):
+        wordlist = WordList(["a", "ab", "b", "ba", "bab"]).prefix_free()
+        assert wordlist.is_uniquely_decodable()
+
+
+class TestPrefixQueries:
+    @pytest.fixture(params=[False, True], ids=["list", "compact"])
+    def wordlist(self, request):
+        wordlist = WordList(["a", "ab", "abc", "abd", "b", "ba", "c"])
+        return wordlist.compact() if request.param else wordlist
+
+    @pytest.mark.parametrize(
+        ("prefix", "expected"),
+        [
+            ("", ["a", "ab", "abc", "abd", "b", "ba", "c"]),
+            ("a", ["a", "ab", "abc", "abd"]),
+            ("ab", ["ab", "abc", "abd"]),
+            ("abc", ["abc"]),
+            ("abcd", []),
+            ("b", ["b", "ba"]),
+            ("bb", []),
+            ("d", []),
+        ],
+    )
+    def test_with_prefix(self, wordlist, prefix, expected):
+        assert wordlist.with_prefix(prefix) == WordList(expected)
+        assert wordlist.count_prefix(prefix) == len(expected)
+
+
+class TestCompact:
+    def test_equal(self):
+        wordlist = WordList(["house", "houseboat", "household", "mouse"])
+        compact = wordlist.compact()
+
+        assert compact == wordlist
+        assert list(compact) == list(wordlist)
+        assert compact.characters == wordlist.characters
+
+    def test_binary_file(self, tmp_path):
+        wordlist = WordList(["house", "houseboat", "household", "mouse"]).compact()
+        wordlist.to_binary_file(tmp_path / "wordlist.ppwl")
+
+        assert WordList.from_binary_file(tmp_path / "wordlist.ppwl") == wordlist
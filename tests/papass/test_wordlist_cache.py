@@ -0,0 +1,112 @@
+import os
+
+import papass.analysis
+import pytest
+from papass.binary_wordlist import MappedWords
+from papass.wordlist import WordList
+from papass.wordlist_cache import WordListCache, default_cache_directory
+
+
+@pytest.fixture
+def file_path(tmp_path):
+    file_path = tmp_path / "wordlist.txt"
+    file_path.write_text("foo\nbar\nbaz\nfoo\nlongword\n")
+    return file_path
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return WordListCache(tmp_path / "cache")
+
+
+def num_entries(cache) -> int:
+    return len(cache._entries())
+
+
+def test_default_cache_directory(cache_home):
+    assert default_cache_directory() == cache_home / "papass"
+
+
+def test_cache_hit(cache, file_path):
+    options = dict(min_word_size=1, max_word_size=4)
+
+    wordlist_1 = cache.from_file(file_path, **options)
+    wordlist_2 = cache.from_file(file_path, **options)
+
+    assert wordlist_1 == wordlist_2 == WordList.from_file(file_path, **options)
+    assert num_entries(cache) == 1
+    assert isinstance(wordlist_2._words, MappedWords), "Must be loaded from the cache."
+
+
+def test_options_are_part_of_key(cache, file_path):
+    assert cache.from_file(file_path) == WordList.from_file(file_path)
+    assert cache.from_file(file_path, max_word_size=3) == WordList(["bar", "baz", "foo"])
+    assert num_entries(cache) == 2
+
+
+def test_modification_invalidates(cache, file_path):
+    cache.from_file(file_path)
+
+    file_path.write_text("other\nwords\n")
+
+    assert cache.from_file(file_path) == WordList(["other", "words"])
+
+
+def test_damaged_entry_is_recreated(cache, file_path):
+    cache.from_file(file_path)
+    (entry,) = cache._entries()
+    entry.write_bytes(b"garbage")
+
+    assert cache.from_file(file_path) == WordList.from_file(file_path)
+    assert isinstance(cache.from_file(file_path)._words, MappedWords)
+
+
+def test_lru_eviction(tmp_path):
+    file_paths = []
+    for i in range(4):
+        file_path = tmp_path / f"wordlist_{i}.txt"
+        file_path.write_text("\n".join(f"word{i}{j}" for j in range(100)))
+        file_paths.append(file_path)
+
+    cache = WordListCache(tmp_path / "cache", max_size=2**40)
+    cache.from_file(file_paths[0])
+    (entry_size,) = (e.stat().st_size for e in cache._entries())
+
+    # Room for two entries only:
+    cache = WordListCache(tmp_path / "cache", max_size=2 * entry_size)
+
+    for file_path in file_paths[1:]:
+        cache.from_file(file_path)
+        # Make the order of usage unambiguous:
+        for j, entry in enumerate(sorted(cache._entries(), key=lambda e: e.stat().st_mtime_ns)):
+            os.utime(entry, ns=(j, j))
+        cache.from_file(file_paths[0])
+
+    assert num_entries(cache) == 2
+    assert isinstance(cache.from_file(file_paths[0])._words, MappedWords)
+    assert isinstance(cache.from_file(file_paths[3])._words, MappedWords)
+
+
+def test_clear(cache, file_path):
+    cache.from_file(file_path)
+    cache.clear()
+
+    assert num_entries(cache) == 0
+
+
+def test_unwritable_cache(tmp_path, file_path):
+    not_a_directory = tmp_path / "file"
+    not_a_directory.write_text("")
+    cache = WordListCache(not_a_directory)
+
+    assert cache.from_file(file_path) == WordList.from_file(file_path)
+
+
+def test_uniquely_decodable_is_cached(cache, file_path, monkeypatch):
+    expected = cache.from_file(file_path).is_uniquely_decodable()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Must not be recomputed.")
+
+    monkeypatch.setattr(papass.analysis, "is_uniquely_decodable", fail)
+    assert cache.from_file(file_path).is_uniquely_decodable() is expected